@@ -6,26 +6,140 @@
     
     console.log('🚀 Auto-synchronisation LinguaRomana démarrée...');
     
-    // Vérifier si une synchronisation récente existe déjà
-    const lastSync = localStorage.getItem('linguaromana_last_sync');
-    const now = Date.now();
-    const oneHour = 60 * 60 * 1000; // 1 heure en millisecondes
-    
-    // Ne pas re-synchroniser si la dernière sync a eu lieu il y a moins d'une heure
-    if (lastSync && (now - parseInt(lastSync)) < oneHour) {
-        console.log('⏰ Synchronisation récente détectée, utilisation des données existantes');
+    // Appliquer un delta (articles/mots modifiés ou supprimés) au localStorage
+    function applyDelta(delta) {
+        const articles = JSON.parse(localStorage.getItem('linguaromana_custom_articles') || '[]');
+        const words = JSON.parse(localStorage.getItem('linguaromana_custom_words') || '{}');
+
+        // Les suppressions d'abord, puis les ajouts/modifications
+        const replacedIds = new Set(delta.deleted_articles);
+        delta.linguaromana_custom_articles.forEach(article => replacedIds.add(article.id));
+        const patchedArticles = articles
+            .filter(article => !replacedIds.has(String(article.id)))
+            .concat(delta.linguaromana_custom_articles)
+            .sort((a, b) => (a.date < b.date ? 1 : a.date > b.date ? -1 : 0));
+
+        delta.deleted_words.forEach(word => delete words[word]);
+        Object.assign(words, delta.linguaromana_custom_words);
+
+        localStorage.setItem('linguaromana_custom_articles', JSON.stringify(patchedArticles));
+        localStorage.setItem('linguaromana_custom_words', JSON.stringify(words));
+        localStorage.setItem('linguaromana_sync_token', delta.sync_token);
+
+        console.log(`✅ Delta appliqué: ${delta.total_articles} article(s), ${delta.total_words} mot(s), ` +
+            `${delta.deleted_articles.length + delta.deleted_words.length} suppression(s)`);
+    }
+
+    // Télécharger uniquement les fragments de la langue (et du niveau) de l'utilisateur
+    // dont le hash a changé depuis le dernier chargement
+    function loadShards(manifest) {
+        const language = window.USER_DATA?.profile?.preferredLanguage || 'es';
+        const level = localStorage.getItem('linguaromana_level');
+        const hashes = JSON.parse(localStorage.getItem('linguaromana_shard_hashes') || '{}');
+
+        const staleKeys = Object.keys(manifest.shards).filter(key => {
+            const [kind, shardLanguage, shardLevel] = key.split('/');
+            const wanted = shardLanguage === language && (kind === 'words' || !level || shardLevel === level);
+            return wanted && hashes[key] !== manifest.shards[key].sha256;
+        });
+
+        return Promise.all(staleKeys.map(key => {
+            const shard = manifest.shards[key];
+            return fetch(`./sync/${shard.file}?v=${shard.sha256.slice(0, 16)}`)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`HTTP error! status: ${response.status}`);
+                    }
+                    return response.json();
+                })
+                // Vocabulaire compact: décodé par vocab-decoder.js
+                .then(data => (shard.format === 'columnar' ? window.LinguaRomanaVocab.decode(data) : data))
+                .then(data => ({ key, data }));
+        })).then(results => {
+            let articles = JSON.parse(localStorage.getItem('linguaromana_custom_articles') || '[]');
+            const words = JSON.parse(localStorage.getItem('linguaromana_custom_words') || '{}');
+
+            results.forEach(({ key, data }) => {
+                const [kind, shardLanguage, shardLevel] = key.split('/');
+                if (kind === 'articles') {
+                    articles = articles
+                        .filter(article => article.language !== shardLanguage || article.level !== shardLevel)
+                        .concat(data);
+                } else {
+                    Object.keys(words)
+                        .filter(word => words[word].primary_language === shardLanguage)
+                        .forEach(word => delete words[word]);
+                    Object.assign(words, data);
+                }
+                hashes[key] = manifest.shards[key].sha256;
+            });
+
+            articles.sort((a, b) => (a.date < b.date ? 1 : a.date > b.date ? -1 : 0));
+            localStorage.setItem('linguaromana_custom_articles', JSON.stringify(articles));
+            localStorage.setItem('linguaromana_custom_words', JSON.stringify(words));
+            localStorage.setItem('linguaromana_shard_hashes', JSON.stringify(hashes));
+            localStorage.setItem('linguaromana_sync_token', manifest.sync_token);
+
+            console.log(`✅ ${results.length} fragment(s) mis à jour sur ${Object.keys(manifest.shards).length}`);
+        });
+    }
+
+    // Synchronisation incrémentale si un jeton est disponible
+    const syncToken = localStorage.getItem('linguaromana_sync_token');
+    if (syncToken) {
+        fetch(`/api/sync/delta/?since=${encodeURIComponent(syncToken)}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(applyDelta)
+            .catch(error => {
+                console.warn('⚠️ Delta indisponible, synchronisation complète au prochain chargement:', error);
+                localStorage.removeItem('linguaromana_sync_token');
+                localStorage.removeItem('linguaromana_last_sync');
+            });
         return;
     }
+
+    // Revalider à chaque chargement: grâce aux ETags, des données inchangées
+    // ne coûtent qu'une réponse 304 sans contenu
+    const now = Date.now();
+    let scriptEtag = null;
     
     // Charger le script de synchronisation dynamiquement
-    fetch('./sync_articles.js')
+    // (les fragments avec manifest sont préférés s'ils ont été générés)
+    fetch('./sync/manifest.json', { cache: 'no-cache' })
+        .then(response => (response.ok ? response.json() : null))
+        .catch(() => null)
+        .then(manifest => {
+            if (manifest) {
+                return loadShards(manifest).then(() => {
+                    localStorage.setItem('linguaromana_last_sync', now.toString());
+                    return null;
+                });
+            }
+            return fetch('./sync_articles.js', { cache: 'no-cache' });
+        })
         .then(response => {
+            if (response === null) {
+                return null;
+            }
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
+            scriptEtag = response.headers.get('ETag');
+            if (scriptEtag && scriptEtag === localStorage.getItem('linguaromana_sync_etag')) {
+                console.log('⏰ Données inchangées depuis la dernière synchronisation');
+                return null;
+            }
             return response.text();
         })
         .then(scriptContent => {
+            if (scriptContent === null) {
+                return;
+            }
             console.log('📥 Script de synchronisation chargé');
             
             // Exécuter le script de synchronisation
@@ -37,6 +151,9 @@
                 
                 // Marquer la synchronisation comme effectuée
                 localStorage.setItem('linguaromana_last_sync', now.toString());
+                if (scriptEtag) {
+                    localStorage.setItem('linguaromana_sync_etag', scriptEtag);
+                }
                 
                 console.log('✅ Auto-synchronisation terminée avec succès');
                 
@@ -1,8 +1,15 @@
+from datetime import date
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
+from django.db.models import Q, Sum
+from django.db.models.expressions import RawSQL
 
+from .annotation import annotate_articles
+from .articles import sync_article_words
 from .models import (
+    ArchiveMonth,
     Article,
     Badge,
     QuizQuestion,
@@ -10,7 +17,12 @@ from .models import (
     UserBadge,
     UserProfile,
     UserQuizResult,
+    Word,
+    WordForm,
+    search_key,
 )
+from .search import matching_article_ids
+from .text import prefix_lookup
 
 
 class UserProfileInline(admin.StackedInline):
@@ -38,13 +50,102 @@ class UserProfileAdmin(admin.ModelAdmin):
     readonly_fields = ["created_at", "updated_at"]
 
 
+class PublicationMonthFilter(admin.SimpleListFilter):
+    """
+    Publication month filter listing the months of the ``ArchiveMonth``
+    rollup, instead of the distinct-date aggregation of ``date_hierarchy``
+    """
+
+    title = "publication month"
+    parameter_name = "month"
+
+    def lookups(self, request, model_admin):
+        months = (
+            ArchiveMonth.objects.order_by("-year", "-month")
+            .values_list("year", "month")
+            .annotate(count=Sum("article_count"))
+        )
+        return [
+            (f"{year}-{month:02d}", f"{year}-{month:02d} ({count})")
+            for year, month, count in months
+        ]
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        try:
+            year, month = (int(part) for part in self.value().split("-"))
+            start = date(year, month, 1)
+        except ValueError:
+            return queryset.none()
+        end = date(year + month // 12, month % 12 + 1, 1)
+        return queryset.filter(publication_date__gte=start, publication_date__lt=end)
+
+
+def key_search_results(queryset, field, search_term):
+    """
+    Admin search on a search key column: rows where one of the words of
+    ``field`` starts with the folded term, accents and case ignored
+    ("humanitaria" finds "Crisis humanitária"). A term starting the value
+    is read from the index of ``field``, later words need a ``LIKE`` scan.
+    """
+    key = search_key(search_term)
+    if not key:
+        return queryset, False
+    return (
+        queryset.filter(
+            Q(**prefix_lookup(field, key)) | Q(**{f"{field}__contains": f" {key}"})
+        ),
+        False,
+    )
+
+
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     list_display = ["title", "language", "level", "publication_date", "is_active"]
-    list_filter = ["language", "level", "is_active", "publication_date"]
-    search_fields = ["title", "content"]
-    date_hierarchy = "publication_date"
+    list_filter = ["language", "level", "is_active", PublicationMonthFilter]
+    search_fields = ["title"]
+    readonly_fields = ["created_at"]
+
+    def save_model(self, request, obj, form, change):
+        # Key vocabulary is written as [word] in the content; the article
+        # signals resync it when the content of an existing article changes
+        obj._words_created_by = request.user
+        super().save_model(request, obj, form, change)
+        if not change:
+            sync_article_words(obj, created_by=request.user)
+            annotate_articles([obj])
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of LIKE scans when it is available
+        matching = matching_article_ids(search_term)
+        if matching is None:
+            # Without FTS5, titles starting with the term, whatever the accents
+            return key_search_results(queryset, "title_key", search_term)
+        return queryset.filter(pk__in=RawSQL(*matching)), False
+
+
+class WordFormInline(admin.TabularInline):
+    """Irregular forms added by editors; generated forms are not listed"""
+
+    model = WordForm
+    fields = ["form"]
+    extra = 1
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(is_generated=False)
+
+
+@admin.register(Word)
+class WordAdmin(admin.ModelAdmin):
+    list_display = ["word", "primary_language", "created_at"]
+    list_filter = ["primary_language", "is_verb"]
+    search_fields = ["word"]
     readonly_fields = ["created_at"]
+    inlines = [WordFormInline]
+
+    def get_search_results(self, request, queryset, search_term):
+        return key_search_results(queryset, "word_key", search_term)
 
 
 class QuizQuestionInline(admin.TabularInline):
@@ -0,0 +1,392 @@
+"""
+Automatic vocabulary annotation of articles.
+
+Editors bracket the key vocabulary of an article; every other known word
+appearing in it is linked by the annotator as an ``ArticleWord`` that is
+not key vocabulary. An Aho-Corasick automaton over every ``Word.word``
+and its ``WordForm`` forms finds all of them in one pass over the text,
+whatever the size of the vocabulary, and only keeps the matches that begin
+and end on token boundaries: "aide" is found in "l'aide", "hablar" in
+"hablarlo" and "lanzamiento" in "lanzamientos".
+
+The automaton is built once per process and kept in sync with the Word
+table the way delta syncs are: words whose ``updated_at`` moved since the
+last sync are (re)inserted with their forms and words with a
+``SyncTombstone`` are removed.
+Changes only touch their own trie nodes; the failure links are then
+recomputed in one breadth-first walk of the trie, without reading the
+whole table again. Regenerating the forms of every word leaves a "forms"
+tombstone instead, and the automaton is rebuilt.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_generations
+from .export import article_shard_keys, queue_shard_exports
+from .models import (
+    LOOKUP_CHUNK_SIZE,
+    Article,
+    ArticleWord,
+    SyncTombstone,
+    Word,
+    WordForm,
+)
+from .text import fold, sentence_index_at
+from .tokenizer import tokenize
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def lowercase(text):
+    """Lowercase ``text`` character by character, keeping its offsets"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters lowercase to two ("İ")
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def surface_span(tokens, position, length):
+    """
+    Span of the text linked at ``position`` to a word ``length`` long,
+    stretched or shrunk to token boundaries since the text may be another
+    form of the word ("lanzamientos" for "lanzamiento"). ``tokens`` are
+    the tokens of the text.
+    """
+    last = position + max(length, 1) - 1
+    index = bisect_left(tokens, last, key=lambda token: token.end - 1)
+    if index < len(tokens) and tokens[index].start <= last:
+        return position, tokens[index].end
+    if index and tokens[index - 1].end > position:
+        return position, tokens[index - 1].end
+    return position, position + length
+
+
+class VocabularyAutomaton:
+    """
+    Aho-Corasick automaton over lowercased word texts.
+
+    Nodes are indexes into parallel lists: ``_goto`` holds the trie edges,
+    ``_fail`` the failure links, ``_output`` the nearest node on the
+    failure chain ending a word and ``_words`` the ``{word id: (language,
+    rank)}`` of the words ending at a node, the rank being 0 for the word
+    itself and 1 for its other forms. ``_infinitives`` counts the folded
+    verbs of each language, the clitic hosts of ``tokenize``.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [0]
+        self._depth = [0]
+        self._words = [None]
+        self._texts = {}
+        self._keys = {}
+        self._ids = {}
+        self._verbs = {}
+        self._infinitives = Counter()
+        self._dirty = False
+        self.synced_at = None
+
+    def __len__(self):
+        return len(self._texts)
+
+    def add(self, word_id, text, language, forms=(), is_verb=False):
+        """Insert or move a word and its other ``forms``"""
+        if word_id in self._texts:
+            self._remove(word_id)
+        # Texts are unique: a recreated word replaces its deleted namesake
+        self.discard(text)
+        keys = {}
+        for rank, key in enumerate([text, *forms]):
+            key = lowercase(key)
+            if key:
+                keys.setdefault(key, min(rank, 1))
+        for key, rank in keys.items():
+            node = 0
+            for char in key:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(0)
+                    self._depth.append(self._depth[node] + 1)
+                    self._words.append(None)
+                node = child
+            if self._words[node] is None:
+                self._words[node] = {}
+            self._words[node][word_id] = (language, rank)
+        self._texts[word_id] = text
+        self._keys[word_id] = list(keys)
+        self._ids[text] = word_id
+        if is_verb:
+            self._verbs[word_id] = (language, fold(text))
+            self._infinitives[self._verbs[word_id]] += 1
+        self._dirty = True
+
+    def discard(self, text):
+        """Remove the word spelled ``text``, if any"""
+        word_id = self._ids.get(text)
+        if word_id is not None:
+            self._remove(word_id)
+
+    def _remove(self, word_id):
+        text = self._texts.pop(word_id)
+        del self._ids[text]
+        verb = self._verbs.pop(word_id, None)
+        if verb is not None:
+            self._infinitives[verb] -= 1
+        for key in self._keys.pop(word_id):
+            node = 0
+            for char in key:
+                node = self._goto[node][char]
+            del self._words[node][word_id]
+            if not self._words[node]:
+                self._words[node] = None
+        self._dirty = True
+
+    def _link(self):
+        goto, fail, output, words = self._goto, self._fail, self._output, self._words
+        queue = deque(goto[0].values())
+        for child in queue:
+            fail[child] = output[child] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                suffix = fail[node]
+                while suffix and char not in goto[suffix]:
+                    suffix = fail[suffix]
+                suffix = goto[suffix].get(char, 0)
+                fail[child] = suffix
+                output[child] = suffix if words[suffix] else output[suffix]
+                queue.append(child)
+        self._dirty = False
+
+    def is_host(self, language):
+        """
+        ``is_host`` for ``tokenize``: whether an infinitive is a
+        ``language`` verb of the automaton. Other words are not hosts:
+        "primer" does not make "primeros" a verb with a clitic.
+        """
+        return lambda host: self._infinitives[language, fold(host)] > 0
+
+    def matches(self, text, language):
+        """
+        Yield every ``(start, end, word id)`` of a word of ``language``
+        found in ``text`` starting and ending at token boundaries (see
+        ``tokenize``), overlapping matches included. A form shared by
+        several words is given to the word spelled that way, if any.
+        """
+        if self._dirty:
+            self._link()
+        starts = set()
+        ends = set()
+        for token in tokenize(text, language, self.is_host(language)):
+            starts.add(token.start)
+            ends.add(token.end)
+        goto, fail, output, depth, words = (
+            self._goto,
+            self._fail,
+            self._output,
+            self._depth,
+            self._words,
+        )
+        node = 0
+        for end, char in enumerate(lowercase(text), 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if words[node] else output[node]
+            while match:
+                start = end - depth[match]
+                ids = [
+                    (rank, i)
+                    for i, (lang, rank) in words[match].items()
+                    if lang == language
+                ]
+                if ids and start in starts and end in ends:
+                    yield start, end, min(ids)[1]
+                match = output[match]
+
+    def annotate(self, text, language, taken=()):
+        """
+        Leftmost-longest words of ``text`` that do not overlap each other
+        or the ``(start, end)`` spans already ``taken``.
+        """
+        taken = sorted(taken)
+        found = sorted(self.matches(text, language), key=lambda m: (m[0], -m[1]))
+        spans = []
+        covered = 0
+        blocker = 0
+        for start, end, word_id in found:
+            if start < covered:
+                continue
+            while blocker < len(taken) and taken[blocker][1] <= start:
+                blocker += 1
+            if blocker < len(taken) and taken[blocker][0] < end:
+                continue
+            spans.append((start, end, word_id))
+            covered = end
+        return spans
+
+    def forms_rebuilt(self):
+        """Whether the forms of every word were regenerated since the last sync"""
+        return (
+            self.synced_at is not None
+            and SyncTombstone.objects.filter(
+                kind="forms", deleted_at__gte=self.synced_at
+            ).exists()
+        )
+
+    def sync(self):
+        """
+        Apply the word changes made since the last sync.
+
+        Returns:
+            int: Number of words inserted, moved or removed
+        """
+        since = self.synced_at
+        self.synced_at = timezone.now()
+        words = Word.objects.order_by()
+        forms = WordForm.objects.order_by()
+        changes = 0
+        if since is not None:
+            words = words.filter(updated_at__gte=since)
+            forms = forms.filter(word__updated_at__gte=since)
+            for text in (
+                SyncTombstone.objects.filter(kind="word", deleted_at__gte=since)
+                .order_by()
+                .values_list("key", flat=True)
+            ):
+                self.discard(text)
+                changes += 1
+        word_forms = defaultdict(list)
+        for word_id, form in forms.values_list("word_id", "form").iterator():
+            word_forms[word_id].append(form)
+        for word_id, text, language, is_verb in words.values_list(
+            "id", "word", "primary_language", "is_verb"
+        ).iterator():
+            self.add(word_id, text, language, word_forms[word_id], is_verb)
+            changes += 1
+        return changes
+
+
+_automaton = None
+_automaton_lock = threading.Lock()
+
+
+def reset_automaton():
+    """Drop the automaton of this process; the next use rebuilds it"""
+    global _automaton
+    with _automaton_lock:
+        _automaton = None
+
+
+def annotate_articles(articles):
+    """
+    Link the known words found in ``articles`` that are not linked yet.
+
+    Occurrences are inserted in bulk, so the signal work is done here once
+    for the whole list: keyword watermarks, export shards and caches.
+
+    Returns:
+        int: Number of occurrences created
+    """
+    global _automaton
+    articles = list(articles)
+    if not articles:
+        return 0
+
+    linked = list(
+        ArticleWord.objects.filter(
+            article__in=[article.pk for article in articles]
+        ).values_list("article_id", "position_in_text", "word__word")
+    )
+
+    occurrences = []
+    with _automaton_lock:
+        if _automaton is None or _automaton.forms_rebuilt():
+            _automaton = VocabularyAutomaton()
+        _automaton.sync()
+        tokens = {
+            article.pk: list(
+                tokenize(
+                    article.plain_text,
+                    article.language,
+                    _automaton.is_host(article.language),
+                )
+            )
+            for article in articles
+        }
+        taken = {article.pk: [] for article in articles}
+        for article_id, position, text in linked:
+            taken[article_id].append(
+                surface_span(tokens[article_id], position, len(text))
+            )
+        for article in articles:
+            for start, _, word_id in _automaton.annotate(
+                article.plain_text, article.language, taken[article.pk]
+            ):
+                occurrences.append(
+                    ArticleWord(
+                        article=article,
+                        word_id=word_id,
+                        position_in_text=start,
+                        sentence_index=sentence_index_at(
+                            article.sentence_offsets, start
+                        ),
+                        is_key_vocabulary=False,
+                    )
+                )
+
+    with transaction.atomic():
+        # A word deleted since the sync has no tombstone to be seen yet
+        word_ids = list({occurrence.word_id for occurrence in occurrences})
+        existing = set()
+        for start in range(0, len(word_ids), LOOKUP_CHUNK_SIZE):
+            chunk = word_ids[start : start + LOOKUP_CHUNK_SIZE]
+            existing.update(
+                Word.objects.filter(pk__in=chunk)
+                .order_by()
+                .values_list("pk", flat=True)
+            )
+        occurrences = [o for o in occurrences if o.word_id in existing]
+        if not occurrences:
+            return 0
+
+        annotated = Article.objects.filter(
+            pk__in={occurrence.article_id for occurrence in occurrences}
+        ).order_by()
+        ArticleWord.objects.bulk_create(occurrences, ignore_conflicts=True)
+        annotated.update(updated_at=timezone.now())
+        queue_shard_exports(article_shard_keys(annotated))
+    bump_generations({article.language for article in articles})
+    return len(occurrences)
+
+
+def annotate_all_articles(articles=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Annotate ``articles`` (all of them by default) in batches.
+
+    Yields:
+        tuple: Running numbers of articles scanned and occurrences created
+    """
+    if articles is None:
+        articles = Article.objects.all()
+    articles = articles.order_by("pk").only(
+        "id", "content", "language", "sentence_offsets"
+    )
+    scanned = created = 0
+    last_pk = 0
+    while batch := list(articles.filter(pk__gt=last_pk)[:batch_size]):
+        created += annotate_articles(batch)
+        scanned += len(batch)
+        last_pk = batch[-1].pk
+        yield scanned, created
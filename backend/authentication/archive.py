@@ -0,0 +1,168 @@
+"""
+Archive facets: article counts by language, level and publication month.
+
+Counts are read from ``ArchiveMonth`` rollup rows, one per (language,
+level, year, month), which article signals and imports adjust by the
+difference between the previous and the new state of the saved or deleted
+articles. Rendering the facets reads a few rows per month of archive
+instead of grouping every article.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from .models import Article, ArchiveMonth
+
+
+def archive_state(article):
+    """The fields of an article counted by the rollups"""
+    # The instance holds whatever was assigned, "2024-01-05" included
+    publication_date = Article._meta.get_field("publication_date").to_python(
+        article.publication_date
+    )
+    return {
+        "language": article.language,
+        "level": article.level,
+        "publication_date": publication_date,
+        "is_active": article.is_active,
+    }
+
+
+def archive_bucket(state):
+    """Rollup key of an article values dict"""
+    publication_date = state["publication_date"]
+    return (
+        state["language"],
+        state["level"],
+        publication_date.year,
+        publication_date.month,
+    )
+
+
+def article_deltas(previous, current):
+    """
+    Count changes moving an article from ``previous`` to ``current``
+    state, either of which is None for a created or deleted article.
+
+    Returns:
+        dict: ``(article_count, active_count)`` deltas by rollup key
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+        delta = deltas[archive_bucket(state)]
+        delta[0] += sign
+        if state["is_active"]:
+            delta[1] += sign
+    return {key: tuple(delta) for key, delta in deltas.items() if any(delta)}
+
+
+def apply_archive_deltas(deltas):
+    """
+    Add ``article_deltas`` to the rollup rows, dropping emptied months.
+
+    Missing rows are created with a single insert ignoring conflicts, then
+    every row is incremented in place with ``F()``: concurrent writers add
+    to the stored counts instead of overwriting them with what they read.
+    """
+    if not deltas:
+        return
+    months = Q()
+    for language, level, year, month in deltas:
+        months |= Q(language=language, level=level, year=year, month=month)
+    with transaction.atomic():
+        ArchiveMonth.objects.bulk_create(
+            [
+                ArchiveMonth(language=language, level=level, year=year, month=month)
+                for language, level, year, month in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        for (language, level, year, month), (total, active) in deltas.items():
+            ArchiveMonth.objects.filter(
+                language=language, level=level, year=year, month=month
+            ).update(
+                article_count=F("article_count") + total,
+                active_count=F("active_count") + active,
+            )
+        ArchiveMonth.objects.filter(months, article_count__lte=0).delete()
+
+
+def rebuild_archive_months(article_model=Article, archive_model=ArchiveMonth):
+    """
+    Recompute every rollup row from the articles, after writes that bypass
+    signals (``bulk_create``, ``update``, raw SQL).
+
+    Returns:
+        int: Number of rollup rows
+    """
+    rows = (
+        article_model.objects.order_by()
+        .values(
+            "language",
+            "level",
+            year=ExtractYear("publication_date"),
+            month=ExtractMonth("publication_date"),
+        )
+        .annotate(
+            article_count=Count("id"),
+            active_count=Count("id", filter=Q(is_active=True)),
+        )
+    )
+    archive_model.objects.all().delete()
+    created = archive_model.objects.bulk_create(archive_model(**row) for row in rows)
+    return len(created)
+
+
+def archive_facets(filters):
+    """
+    Facet counts for the archive, from ``parse_article_filters`` lookups.
+
+    Each facet applies every filter but its own, so the language facet
+    lists the counts each language would show with the current level.
+
+    Returns:
+        dict: ``total`` and the ``languages``, ``levels`` and ``months``
+        facets, months newest first as ``{"year", "month", "count"}``
+    """
+    is_active = filters.get("is_active")
+    rows = ArchiveMonth.objects.order_by().values_list(
+        "language", "level", "year", "month", "article_count", "active_count"
+    )
+
+    total = 0
+    languages = Counter()
+    levels = Counter()
+    months = Counter()
+    for language, level, year, month, article_count, active_count in rows:
+        if is_active is None:
+            count = article_count
+        elif is_active:
+            count = active_count
+        else:
+            count = article_count - active_count
+        if not count:
+            continue
+        language_match = filters.get("language") in (None, language)
+        level_match = filters.get("level") in (None, level)
+        if level_match:
+            languages[language] += count
+        if language_match:
+            levels[level] += count
+        if language_match and level_match:
+            months[year, month] += count
+            total += count
+
+    return {
+        "total": total,
+        "languages": dict(sorted(languages.items())),
+        "levels": dict(sorted(levels.items())),
+        "months": [
+            {"year": year, "month": month, "count": count}
+            for (year, month), count in sorted(months.items(), reverse=True)
+        ],
+    }
@@ -0,0 +1,403 @@
+"""
+Read API helpers for articles.
+
+Article lists use keyset pagination: a page ends with a cursor holding the
+``(publication_date, id)`` of its last article and the next page starts
+strictly after it. Each page is a single indexed range scan, so deep archive
+pages cost the same as the first one, unlike ``OFFSET`` which reads and
+discards every skipped row.
+
+An article bundle holds everything needed to render one article: the
+article, its vocabulary with translations and definitions, and its quiz
+without the answers. It is built with a fixed number of queries.
+
+Pages, details and bundles are cached per language by ``cache``.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date
+
+from django.db.models import Prefetch, Q
+
+from .cache import ALL_LANGUAGES, article_language, cached_response
+from .export import LANGUAGES, LEVELS
+from .inflection import lookup_words
+from .models import (
+    Article,
+    ArticleWord,
+    LatestArticle,
+    QuizQuestion,
+    Word,
+    WordTranslation,
+)
+
+DEFAULT_PAGE_SIZE = 20
+
+MAX_PAGE_SIZE = 100
+
+SORTS = ("newest", "oldest")
+
+ARTICLE_LIST_FIELDS = ("id", "title", "language", "level", "publication_date")
+
+
+class ArticleQueryError(ValueError):
+    """Invalid article list parameters, reported to the client as a 400"""
+
+
+def encode_cursor(publication_date, article_id):
+    raw = json.dumps([publication_date.isoformat(), article_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Raises:
+        ArticleQueryError: If the cursor was not produced by ``encode_cursor``
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        publication_date, article_id = json.loads(raw)
+        return date.fromisoformat(publication_date), int(article_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ArticleQueryError("Invalid cursor") from e
+
+
+def parse_article_filters(params, include_inactive=False):
+    """
+    Validate the ``language``, ``level`` and ``is_active`` query parameters.
+
+    ``is_active`` defaults to ``true``; other values are only accepted when
+    ``include_inactive`` (staff users), since inactive articles are drafts.
+
+    Returns:
+        dict: Field lookups for ``Article.objects.filter``
+    """
+    filters = {}
+
+    language = params.get("language")
+    if language:
+        if language not in LANGUAGES:
+            raise ArticleQueryError(f"Unknown language: {language}")
+        filters["language"] = language
+
+    level = params.get("level")
+    if level:
+        if level not in LEVELS:
+            raise ArticleQueryError(f"Unknown level: {level}")
+        filters["level"] = level
+
+    is_active = params.get("is_active", "true").lower()
+    if is_active not in ("true", "false", "all"):
+        raise ArticleQueryError("is_active must be true, false or all")
+    if is_active != "true" and not include_inactive:
+        raise ArticleQueryError("Only staff can list inactive articles")
+    if is_active != "all":
+        filters["is_active"] = is_active == "true"
+
+    return filters
+
+
+def parse_page_size(value):
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        page_size = int(value)
+    except ValueError:
+        raise ArticleQueryError("page_size must be an integer")
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def article_summary(row):
+    """List representation of an article values row"""
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "language": row["language"],
+        "level": row["level"],
+        "date": row["publication_date"].isoformat(),
+        "summary": f"Article {row['level']} en {row['language']}",
+    }
+
+
+def latest_article_summary(article):
+    """
+    Summary of an article for the home page: its list representation and
+    its first sentence
+    """
+    summary = article_summary(
+        {field: getattr(article, field) for field in ARTICLE_LIST_FIELDS}
+    )
+    if article.sentence_offsets:
+        start, end = article.sentence_offsets[0]
+        summary["excerpt"] = article.plain_text[start:end]
+    else:
+        summary["excerpt"] = ""
+    return summary
+
+
+def refresh_latest_articles(languages=LANGUAGES):
+    """Point each of ``languages`` to its newest active article, if any"""
+    for language in set(languages):
+        article = (
+            Article.objects.filter(is_active=True, language=language)
+            .order_by("-publication_date", "-id")
+            .first()
+        )
+        if article is None:
+            LatestArticle.objects.filter(language=language).delete()
+        else:
+            LatestArticle.objects.update_or_create(
+                language=language,
+                defaults={
+                    "article": article,
+                    "summary": latest_article_summary(article),
+                },
+            )
+
+
+def sync_article_words(article, created_by=None):
+    """
+    Replace the word occurrences of a saved article by the ``[word]``
+    markup of its content. A bracketed form is linked to its word
+    ("[lanzamientos]" to "lanzamiento"); missing words are created in the
+    language of the article.
+    """
+    ArticleWord.objects.filter(article=article).delete()
+    markup = article.markup
+    words = {}
+    for span, sentence_index in zip(markup.spans, markup.sentence_indexes):
+        if span.surface not in words:
+            word = Word.objects.filter(word=span.surface).first()
+            if word is None:
+                # Another form of a known word, or a new word
+                lemmas = lookup_words(span.surface, article.language)
+                word = lemmas[0] if lemmas else None
+            if word is None:
+                word, _ = Word.objects.get_or_create(
+                    word=span.surface,
+                    defaults={
+                        "primary_language": article.language,
+                        "created_by": created_by,
+                    },
+                )
+            words[span.surface] = word
+        ArticleWord.objects.create(
+            article=article,
+            word=words[span.surface],
+            position_in_text=span.start,
+            sentence_index=sentence_index,
+        )
+
+
+def latest_article(language=None):
+    """
+    Summary of the newest active article in ``language``, or in any
+    language, or None. Reads at most one row per language.
+    """
+    pointers = LatestArticle.objects.order_by()
+    if language:
+        return (
+            pointers.filter(language=language).values_list("summary", flat=True).first()
+        )
+    summaries = [
+        (summary["date"], summary["id"], summary)
+        for summary in pointers.values_list("summary", flat=True)
+    ]
+    return max(summaries, key=lambda s: s[:2])[2] if summaries else None
+
+
+def article_page(filters, cursor=None, page_size=DEFAULT_PAGE_SIZE, sort="newest"):
+    """
+    One page of articles matching ``filters``, in one query.
+
+    Returns:
+        dict: ``results`` and the ``next`` cursor, None on the last page
+    """
+    if sort not in SORTS:
+        raise ArticleQueryError(f"sort must be one of {', '.join(SORTS)}")
+
+    articles = Article.objects.filter(**filters)
+    if sort == "newest":
+        articles = articles.order_by("-publication_date", "-id")
+        after = "lt"
+    else:
+        articles = articles.order_by("publication_date", "id")
+        after = "gt"
+
+    if cursor:
+        publication_date, article_id = decode_cursor(cursor)
+        # The redundant bound on publication_date lets the index seek to the
+        # cursor instead of scanning the rows of the previous pages
+        articles = articles.filter(
+            Q(**{f"publication_date__{after}e": publication_date}),
+            Q(**{f"publication_date__{after}": publication_date})
+            | Q(**{f"id__{after}": article_id}),
+        )
+
+    # One extra row tells whether another page follows
+    rows = list(articles.values(*ARTICLE_LIST_FIELDS)[: page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1]["publication_date"], rows[-1]["id"])
+
+    return {
+        "results": [article_summary(row) for row in rows],
+        "next": next_cursor,
+    }
+
+
+def get_article_page(filters, cursor=None, page_size=DEFAULT_PAGE_SIZE, sort="newest"):
+    """Cached ``article_page``"""
+    return cached_response(
+        filters.get("language", ALL_LANGUAGES),
+        "page",
+        (sorted(filters.items()), cursor, page_size, sort),
+        lambda: article_page(filters, cursor, page_size, sort),
+    )
+
+
+def serialize_article(article):
+    """Article fields; ``sentences`` are offsets into ``text``"""
+    return {
+        "id": article.id,
+        "title": article.title,
+        "content": article.content,
+        "text": article.plain_text,
+        "language": article.language,
+        "level": article.level,
+        "date": article.publication_date.isoformat(),
+        "sentences": article.sentence_offsets,
+    }
+
+
+def build_article_detail(article_id):
+    """
+    Serialize an active article with its keywords in two queries.
+
+    Raises:
+        Article.DoesNotExist: If there is no active article with this id
+    """
+    article = Article.objects.get(pk=article_id, is_active=True)
+    detail = serialize_article(article)
+    detail["keywords"] = list(
+        ArticleWord.objects.filter(article=article, is_key_vocabulary=True)
+        .order_by("position_in_text", "id")
+        .values_list("word__word", flat=True)
+    )
+    return detail
+
+
+def build_article_bundle(article_id):
+    """
+    Serialize an active article with its vocabulary and quiz in four queries.
+
+    Quiz questions are sent without ``correct_option``: answers are checked
+    by the server, never by the client.
+
+    Raises:
+        Article.DoesNotExist: If there is no active article with this id
+    """
+    article = Article.objects.get(pk=article_id, is_active=True)
+    article_words = (
+        ArticleWord.objects.filter(article=article)
+        .select_related("word", "word__definition")
+        .prefetch_related(
+            Prefetch(
+                "word__translations",
+                queryset=WordTranslation.objects.order_by("language"),
+            )
+        )
+        .order_by("position_in_text", "id")
+    )
+    questions = QuizQuestion.objects.filter(article=article).order_by("id")
+
+    words = {}
+    occurrences = []
+    for article_word in article_words:
+        word = article_word.word
+        occurrences.append(
+            {
+                "word": word.word,
+                "position": article_word.position_in_text,
+                "sentence_index": article_word.sentence_index,
+                "is_key_vocabulary": article_word.is_key_vocabulary,
+            }
+        )
+        if word.word not in words:
+            words[word.word] = serialize_word(word)
+
+    return {
+        "article": serialize_article(article),
+        "occurrences": occurrences,
+        "words": words,
+        "quiz": [
+            {
+                "id": question.id,
+                "question": question.question_text,
+                "options": {
+                    "A": question.option_a,
+                    "B": question.option_b,
+                    "C": question.option_c,
+                    "D": question.option_d,
+                },
+                "points": question.points,
+            }
+            for question in questions
+        ],
+    }
+
+
+def serialize_word(word):
+    """Word with its prefetched translations and joined definition"""
+    try:
+        definition = word.definition
+    except Word.definition.RelatedObjectDoesNotExist:
+        definition = None
+    else:
+        definition = {
+            "grammar_note": definition.grammar_note,
+            "usage_example": definition.usage_example,
+            "difficulty_level": definition.difficulty_level,
+            "etymology": definition.etymology,
+        }
+
+    return {
+        "primary_language": word.primary_language,
+        "translations": {
+            translation.language: {
+                "translation": translation.translation,
+                "part_of_speech": translation.part_of_speech,
+            }
+            for translation in word.translations.all()
+        },
+        "definition": definition,
+    }
+
+
+def _cached_article(kind, build, article_id):
+    """
+    Cached ``build(article_id)``, or None if there is no active article with
+    this id. Misses are cached too, so unknown ids do not reach the database
+    on every request.
+    """
+
+    def build_or_none():
+        try:
+            return build(article_id)
+        except Article.DoesNotExist:
+            return None
+
+    return cached_response(
+        article_language(article_id), kind, article_id, build_or_none
+    )
+
+
+def get_article_detail(article_id):
+    return _cached_article("detail", build_article_detail, article_id)
+
+
+def get_article_bundle(article_id):
+    return _cached_article("bundle", build_article_bundle, article_id)
@@ -0,0 +1,185 @@
+"""
+Response cache for the article read API.
+
+Cached article list pages, details and bundles are namespaced by language,
+and each entry records the generation of its language it was built under. A
+write bumps the generation of the languages it touches, which invalidates
+all of their cached entries at once without looking them up. Lists not
+filtered by language live in the ``ALL_LANGUAGES`` namespace, bumped along
+with every language.
+
+Entries are refilled by a single worker at a time: a hot key that expires
+or is invalidated (a new article going live in the morning) is rebuilt
+once, while concurrent requests are served the previous value, or wait for
+the rebuild when there is none. Entries are also refreshed early, with a
+probability growing as their expiry approaches and with their build time
+("XFetch"), so that keys filled together do not all expire together.
+
+Details and bundles are requested by id: the language of an article is kept
+in the cache too, so their key is built without a query.
+
+The ``WORDS`` namespace guards the word caches of ``words`` the same way:
+any vocabulary write bumps it.
+
+Generations are stored in the cache like the entries they guard. With a
+cache shared by every worker (file-based, memcached, redis) a bump is seen
+by all of them; the default locmem cache is private to each process.
+"""
+
+import hashlib
+import math
+import random
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from .models import Article
+
+ARTICLE_CACHE_TIMEOUT = 60 * 60
+
+# Expired or invalidated entries stay in the cache this long, to be served
+# while another worker rebuilds them
+STALE_TIMEOUT = 5 * 60
+
+# Longest expected build; a crashed worker's lock is released after this
+FILL_LOCK_TIMEOUT = 30
+
+# How long a request without any value to serve waits for another worker's
+# rebuild before building the response itself
+FILL_WAIT = 2.0
+
+FILL_POLL_INTERVAL = 0.05
+
+# Above 1 favours earlier refreshes, below 1 later ones
+EARLY_REFRESH_BETA = 1.0
+
+ALL_LANGUAGES = "all"
+
+WORDS = "words"
+
+CacheEntry = namedtuple("CacheEntry", "generation expires_at build_seconds value")
+
+
+def generation_key(namespace):
+    return f"articles:generation:{namespace}"
+
+
+def _new_generation():
+    # Seeded from the clock rather than 1: a generation evicted from the
+    # cache must not restart at a value that older entries were cached under
+    return time.time_ns() // 1000
+
+
+def generation(namespace):
+    """Current generation of ``namespace``, created on first use"""
+    key = generation_key(namespace)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, _new_generation(), timeout=None)
+        value = cache.get(key)
+    return value
+
+
+def bump_generation(namespace):
+    """Invalidate everything cached under ``namespace``"""
+    try:
+        cache.incr(generation_key(namespace))
+    except ValueError:
+        # Never used or evicted: nothing is reachable under it anyway
+        cache.add(generation_key(namespace), _new_generation(), timeout=None)
+
+
+def bump_generations(languages):
+    """Invalidate every cached response of ``languages`` and unfiltered lists"""
+    for namespace in {*filter(None, languages), ALL_LANGUAGES}:
+        bump_generation(namespace)
+
+
+def article_language_key(article_id):
+    return f"articles:language:{article_id}"
+
+
+def article_language(article_id):
+    """Language of an article, or an empty string if it does not exist"""
+    key = article_language_key(article_id)
+    language = cache.get(key)
+    if language is None:
+        language = (
+            Article.objects.filter(pk=article_id)
+            .values_list("language", flat=True)
+            .first()
+        ) or ""
+        cache.set(key, language, ARTICLE_CACHE_TIMEOUT)
+    return language
+
+
+def remember_article_language(article_id, language):
+    cache.set(article_language_key(article_id), language, ARTICLE_CACHE_TIMEOUT)
+
+
+def response_key(namespace, kind, params):
+    digest = hashlib.md5(repr(params).encode(), usedforsecurity=False).hexdigest()
+    return f"articles:{namespace}:{kind}:{digest}"
+
+
+def cached_response(namespace, kind, params, build, timeout=ARTICLE_CACHE_TIMEOUT):
+    """
+    Result of ``build()``, cached until the generation of ``namespace``
+    moves or ``timeout`` expires. ``kind`` and ``params`` identify the
+    response in the namespace.
+
+    Exceptions raised by ``build`` are not cached.
+    """
+    key = response_key(namespace, kind, params)
+    current = generation(namespace)
+    entry = cache.get(key)
+    if entry is not None and entry.generation == current and not _refresh_early(entry):
+        return entry.value
+
+    lock_key = f"{key}:lock"
+    locked = cache.add(lock_key, True, FILL_LOCK_TIMEOUT)
+    if not locked:
+        # Another worker is rebuilding this key
+        if entry is not None:
+            return entry.value
+        entry = _wait_for_fill(key, lock_key, current)
+        if entry is not None:
+            return entry.value
+
+    try:
+        started = time.monotonic()
+        value = build()
+        entry = CacheEntry(
+            current, time.time() + timeout, time.monotonic() - started, value
+        )
+        cache.set(key, entry, timeout + STALE_TIMEOUT)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
+
+
+def _refresh_early(entry):
+    """
+    Whether a still valid entry should be rebuilt now. The probability is
+    negligible until the last few build times before expiry, then rises to
+    1 at expiry.
+    """
+    # 1 - random() is in (0, 1], so the log is finite and <= 0
+    jitter = -entry.build_seconds * EARLY_REFRESH_BETA * math.log(1 - random.random())
+    return time.time() + jitter >= entry.expires_at
+
+
+def _wait_for_fill(key, lock_key, current):
+    """Entry of ``key`` built by another worker, or None after ``FILL_WAIT``"""
+    deadline = time.monotonic() + FILL_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(FILL_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry.generation == current:
+            return entry
+        if cache.get(lock_key) is None:
+            # The other worker failed: build the response here
+            return None
+    return None
@@ -0,0 +1,305 @@
+"""
+Type-ahead suggestions over the vocabulary.
+
+Every ``Word.word`` and ``WordTranslation.translation`` is inserted in a
+trie of its language under its folded spelling (see ``text.fold``), so
+"lanz" and "LANZ" both suggest "lanzamiento" and "cancon" suggests
+"cançó". Suggestions are ranked by corpus frequency: the number of
+occurrences of the word in articles.
+
+Each trie node caches the best suggestions of its subtree. A change only
+clears the caches of the nodes on the path of the changed spelling, and a
+cleared cache is rebuilt from the caches of the node's children, so a
+query walks the prefix and reads a list, whatever the size of the
+vocabulary.
+
+The index is built once per process and kept in sync with the database
+the way the annotation automaton is (see ``annotation``): words whose
+``updated_at``, translations or articles moved since the last sync are
+reloaded and words with a ``SyncTombstone`` are removed. A sync only runs
+when the ``WORDS`` cache generation moved, or every
+``FREQUENCY_REFRESH_SECONDS`` for the frequencies, so most queries do not
+reach the database.
+"""
+
+import heapq
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .cache import WORDS, generation
+from .export import LANGUAGES
+from .models import (
+    LOOKUP_CHUNK_SIZE,
+    ArticleWord,
+    SyncTombstone,
+    Word,
+    WordTranslation,
+)
+from .text import fold
+
+DEFAULT_LIMIT = 10
+
+MAX_LIMIT = 20
+
+# Frequencies drift as articles are annotated; reload the changes this often
+FREQUENCY_REFRESH_SECONDS = 5 * 60
+
+# Ordered best first: most frequent word, then shortest and alphabetical text
+Suggestion = namedtuple("Suggestion", "rank text word language")
+
+
+def suggestion(text, word, language, frequency):
+    return Suggestion((-frequency, len(text), fold(text), text), text, word, language)
+
+
+class _Node:
+    __slots__ = ("children", "suggestions", "best")
+
+    def __init__(self):
+        self.children = {}
+        self.suggestions = set()
+        # Best ``MAX_LIMIT`` suggestions of the subtree, None when stale
+        self.best = None
+
+
+class PrefixTrie:
+    """Trie of suggestions keyed by folded spelling"""
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add(self, item):
+        node = self._root
+        node.best = None
+        for char in fold(item.text):
+            node = node.children.setdefault(char, _Node())
+            node.best = None
+        node.suggestions.add(item)
+
+    def remove(self, item):
+        path = [self._root]
+        for char in fold(item.text):
+            path.append(path[-1].children[char])
+        path[-1].suggestions.discard(item)
+        for node in path:
+            node.best = None
+        # Drop the branch left empty
+        for char, parent, node in zip(
+            reversed(fold(item.text)), reversed(path[:-1]), reversed(path[1:])
+        ):
+            if node.suggestions or node.children:
+                break
+            del parent.children[char]
+
+    def complete(self, prefix):
+        """Best ``MAX_LIMIT`` suggestions starting with the folded ``prefix``"""
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return self._best(node)
+
+    def _best(self, node):
+        if node.best is None:
+            candidates = list(node.suggestions)
+            for child in node.children.values():
+                candidates.extend(self._best(child))
+            node.best = heapq.nsmallest(MAX_LIMIT, candidates)
+        return node.best
+
+
+class VocabularyIndex(ABC):
+    """
+    Words and translations of the vocabulary as suggestions, kept in sync
+    with the database. Subclasses store them with ``_insert`` and
+    ``_delete``.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._ids = {}
+        self.synced_at = None
+        self.refreshed_at = 0.0
+        self.generation = None
+
+    def __len__(self):
+        return len(self._items)
+
+    @abstractmethod
+    def _insert(self, item):
+        """Store a ``Suggestion``"""
+
+    @abstractmethod
+    def _delete(self, item):
+        """Forget a stored ``Suggestion``"""
+
+    def add(self, word_id, word, language, translations=(), frequency=0):
+        """
+        Insert or replace a word with its ``(language, translation)`` pairs
+        """
+        self.discard(word)
+        if word_id in self._items:
+            self._remove(word_id)
+        items = {
+            suggestion(text, word, text_language, frequency)
+            for text_language, text in [(language, word), *translations]
+            if text_language in LANGUAGES and fold(text)
+        }
+        for item in items:
+            self._insert(item)
+        self._items[word_id] = (word, items)
+        self._ids[word] = word_id
+
+    def discard(self, word):
+        """Remove the word spelled ``word``, if any"""
+        word_id = self._ids.get(word)
+        if word_id is not None:
+            self._remove(word_id)
+
+    def _remove(self, word_id):
+        word, items = self._items.pop(word_id)
+        del self._ids[word]
+        for item in items:
+            self._delete(item)
+
+    def refresh(self, current):
+        """
+        Sync if the ``WORDS`` generation moved to ``current`` or the
+        frequencies are older than ``FREQUENCY_REFRESH_SECONDS``
+        """
+        if (
+            self.generation != current
+            or time.monotonic() - self.refreshed_at > FREQUENCY_REFRESH_SECONDS
+        ):
+            self.generation = current
+            self.sync()
+
+    def sync(self):
+        """
+        Reload the words changed since the last sync, with their
+        translations and frequencies.
+
+        Returns:
+            int: Number of words inserted, reloaded or removed
+        """
+        since = self.synced_at
+        self.synced_at = timezone.now()
+        self.refreshed_at = time.monotonic()
+        words = Word.objects.order_by()
+        changes = 0
+        if since is not None:
+            translated = WordTranslation.objects.filter(updated_at__gte=since)
+            occurring = ArticleWord.objects.filter(article__updated_at__gte=since)
+            words = words.filter(
+                Q(updated_at__gte=since)
+                | Q(pk__in=translated.values("word_id"))
+                | Q(pk__in=occurring.values("word_id"))
+            )
+            for text in (
+                SyncTombstone.objects.filter(kind="word", deleted_at__gte=since)
+                .order_by()
+                .values_list("key", flat=True)
+            ):
+                self.discard(text)
+                changes += 1
+
+        rows = list(words.values_list("id", "word", "primary_language"))
+        translations = {}
+        frequencies = {}
+        for lookup in self._chunks([row[0] for row in rows], since is None):
+            for word_id, language, text in (
+                WordTranslation.objects.filter(**lookup)
+                .order_by()
+                .values_list("word_id", "language", "translation")
+            ):
+                translations.setdefault(word_id, []).append((language, text))
+            frequencies.update(
+                ArticleWord.objects.filter(**lookup)
+                .order_by()
+                .values_list("word_id")
+                .annotate(count=Count("id"))
+            )
+
+        for word_id, word, language in rows:
+            self.add(
+                word_id,
+                word,
+                language,
+                translations.get(word_id, ()),
+                frequencies.get(word_id, 0),
+            )
+            changes += 1
+        return changes
+
+    @staticmethod
+    def _chunks(word_ids, everything):
+        """Lookups selecting ``word_ids``, or every row at once"""
+        if everything:
+            return [{}]
+        return [
+            {"word_id__in": word_ids[start : start + LOOKUP_CHUNK_SIZE]}
+            for start in range(0, len(word_ids), LOOKUP_CHUNK_SIZE)
+        ]
+
+
+class CompletionIndex(VocabularyIndex):
+    """Per-language prefix tries over words and translations"""
+
+    def __init__(self):
+        super().__init__()
+        self._tries = {language: PrefixTrie() for language in LANGUAGES}
+
+    def _insert(self, item):
+        self._tries[item.language].add(item)
+
+    def _delete(self, item):
+        self._tries[item.language].remove(item)
+
+    def complete(self, prefix, language=None, limit=DEFAULT_LIMIT):
+        """
+        Best suggestions for ``prefix`` (accents and case ignored), in
+        ``language`` or in any language
+        """
+        key = fold(prefix)
+        if not key:
+            return []
+        languages = [language] if language else LANGUAGES
+        return heapq.nsmallest(
+            limit,
+            (item for lang in languages for item in self._tries[lang].complete(key)),
+        )
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def reset_completion_index():
+    """Drop the index of this process; the next use rebuilds it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def complete_words(prefix, language=None, limit=DEFAULT_LIMIT):
+    """
+    Suggestions for ``prefix`` as ``{"text", "word", "language"}`` dicts,
+    most frequent words first
+    """
+    global _index
+    current = generation(WORDS)
+    with _index_lock:
+        if _index is None:
+            _index = CompletionIndex()
+        _index.refresh(current)
+        suggestions = _index.complete(prefix, language, limit)
+    return [
+        {"text": item.text, "word": item.word, "language": item.language}
+        for item in suggestions
+    ]
@@ -0,0 +1,779 @@
+"""
+Streaming export of articles and vocabulary to the frontend localStorage format.
+
+The export runs a fixed number of queries whatever the size of the catalog:
+each table is read once with ``QuerySet.iterator()`` and related rows are
+merge-joined in Python on a shared ordering. Rows are encoded and written as
+they are read, so peak memory does not grow with the corpus.
+
+Every export carries a sync token. Passing it back to ``delta_payload``
+returns only the rows changed or deleted since that export.
+
+``export_shards`` splits the catalog into one article shard per
+``(language, level)`` and one vocabulary shard per primary language, and
+describes them in a manifest holding the SHA-256 of each shard so clients
+only download what they need and what changed. ``export_shards_parallel``
+exports each language in its own process. Vocabulary shards can use the
+compact columnar layout of ``vocabulary_format``.
+
+``compress_artifact`` writes ``.gz`` and ``.br`` variants next to an exported
+file so they can be served without compressing on every request.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import chain, groupby
+from operator import itemgetter
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are written without it
+    brotli = None
+
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from . import export_workers
+from .models import (
+    Article,
+    ArticleWord,
+    PendingShardExport,
+    SyncTombstone,
+    Word,
+    WordTranslation,
+)
+from .vocabulary_format import VOCABULARY_FORMAT, dumps_vocabulary, encode_vocabulary
+
+LANGUAGES = ("es", "it", "pt", "ca", "fr")
+
+LEVELS = ("beginner", "intermediate", "advanced")
+
+MANIFEST_NAME = "manifest.json"
+
+MANIFEST_VERSION = 1
+
+DEFAULT_CHUNK_SIZE = 2000
+
+COMPRESSION_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+_COPY_BUFFER_SIZE = 64 * 1024
+
+# Longest expected write transaction (see ``new_sync_token``)
+SYNC_TOKEN_LAG = timedelta(seconds=60)
+
+
+class StreamedList:
+    """Iterable written lazily as a JSON array by ``iter_json``"""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items):
+        self.items = items
+
+
+class StreamedDict:
+    """Iterable of ``(key, value)`` pairs written lazily as a JSON object"""
+
+    __slots__ = ("pairs",)
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+
+
+def _newline(indent, depth):
+    if indent is None:
+        return ""
+    return "\n" + " " * (indent * depth)
+
+
+def _dumps(value, indent, depth):
+    encoded = json.dumps(value, ensure_ascii=False, indent=indent)
+    if indent is None or depth == 0:
+        return encoded
+    # json.dumps escapes newlines inside strings, so every raw newline is
+    # structural and only needs the indentation of the enclosing container.
+    return encoded.replace("\n", _newline(indent, depth))
+
+
+def _item_separator(indent):
+    return "," if indent is not None else ", "
+
+
+def iter_json(value, indent=None, depth=0):
+    """
+    Encode ``value`` as JSON, yielding string chunks.
+
+    ``StreamedList`` and ``StreamedDict`` values are consumed one element at a
+    time; anything else is encoded in a single ``json.dumps`` call. With the
+    same ``indent`` the output is byte-identical to ``json.dump``.
+    """
+    if isinstance(value, StreamedDict):
+        opening, closing, elements = "{", "}", value.pairs
+    elif isinstance(value, StreamedList):
+        opening, closing, elements = "[", "]", value.items
+    else:
+        yield _dumps(value, indent, depth)
+        return
+
+    empty = True
+    for element in elements:
+        yield (opening if empty else _item_separator(indent)) + _newline(
+            indent, depth + 1
+        )
+        empty = False
+        if closing == "}":
+            key, element = element
+            yield json.dumps(str(key), ensure_ascii=False) + ": "
+        yield from iter_json(element, indent, depth + 1)
+
+    yield opening + closing if empty else _newline(indent, depth) + closing
+
+
+def json_sink(write, kind="array", indent=None, depth=0):
+    """
+    Coroutine writing every value sent to it as an element of a JSON container.
+
+    ``kind`` is ``"array"`` or ``"object"``; objects expect ``(key, value)``
+    pairs. Closing the coroutine writes the closing bracket. This is the push
+    counterpart of ``iter_json``, used to mirror one stream into a second file
+    without reading the database twice.
+    """
+    opening, closing = ("{", "}") if kind == "object" else ("[", "]")
+    empty = True
+    try:
+        while True:
+            element = yield
+            write(
+                (opening if empty else _item_separator(indent))
+                + _newline(indent, depth + 1)
+            )
+            empty = False
+            if kind == "object":
+                key, element = element
+                write(json.dumps(str(key), ensure_ascii=False) + ": ")
+            write(_dumps(element, indent, depth + 1))
+    finally:
+        write(opening + closing if empty else _newline(indent, depth) + closing)
+
+
+def open_sink(write, kind="array", indent=None, depth=0):
+    """Create a primed ``json_sink`` coroutine"""
+    sink = json_sink(write, kind, indent, depth)
+    next(sink)
+    return sink
+
+
+def mirrored(items, sink):
+    """Yield ``items`` unchanged while sending each of them to ``sink``"""
+    try:
+        for item in items:
+            sink.send(item)
+            yield item
+    finally:
+        sink.close()
+
+
+def frontend_article(row, keywords):
+    """Build the frontend representation of an article values row"""
+    article_id, title, content, language, level, publication_date, created_at = row
+    return {
+        "id": str(article_id),
+        "title": title,
+        "content": content,
+        "language": language,
+        "level": level,
+        "date": publication_date.isoformat(),
+        "summary": f"Article {level} en {language}",
+        "keywords": keywords,
+        "status": "published",
+        "createdAt": created_at.isoformat(),
+        "updatedAt": created_at.isoformat(),
+    }
+
+
+def frontend_word(row, translations):
+    """Build the frontend representation of a word values row"""
+    _, _, primary_language, grammar_note, usage_example, difficulty_level = row
+    return {
+        "es": translations.get("es", ""),
+        "it": translations.get("it", ""),
+        "pt": translations.get("pt", ""),
+        "ca": translations.get("ca", ""),
+        "fr": translations.get("fr", ""),
+        "grammar": grammar_note or "",
+        "usage_example": usage_example or "",
+        "difficulty_level": difficulty_level or "intermediate",
+        "primary_language": primary_language,
+    }
+
+
+def iter_frontend_articles(articles=None, stats=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield frontend article dicts using two queries in total.
+
+    Articles and their keywords are read with the same ordering and
+    merge-joined, so the keywords of each article are collected without a
+    query per article. ``stats`` (a dict) receives the article count and the
+    creation date of the first article.
+    """
+    if articles is None:
+        articles = Article.objects.filter(is_active=True)
+    articles = articles.order_by("-publication_date", "-id")
+
+    rows = articles.values_list(
+        "id",
+        "title",
+        "content",
+        "language",
+        "level",
+        "publication_date",
+        "created_at",
+    ).iterator(chunk_size=chunk_size)
+    keyword_rows = (
+        ArticleWord.objects.filter(
+            article__in=articles.order_by().values("pk"), is_key_vocabulary=True
+        )
+        .order_by("-article__publication_date", "-article_id", "position_in_text", "id")
+        .values_list("article_id", "word__word")
+        .iterator(chunk_size=chunk_size)
+    )
+    keyword_groups = groupby(keyword_rows, key=itemgetter(0))
+    pending = next(keyword_groups, None)
+
+    for row in rows:
+        keywords = []
+        if pending is not None and pending[0] == row[0]:
+            keywords = [word for _, word in pending[1]]
+            pending = next(keyword_groups, None)
+
+        if stats is not None:
+            if not stats.get("articles"):
+                stats["sync_timestamp"] = row[-1].isoformat()
+            stats["articles"] = stats.get("articles", 0) + 1
+
+        yield frontend_article(row, keywords)
+
+
+def iter_frontend_words(words=None, stats=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield ``(word, definition)`` pairs using two queries in total.
+
+    The definition is joined into the word query and translations are
+    merge-joined on the word ordering. ``stats`` receives the word count.
+    """
+    if words is None:
+        words = Word.objects.all()
+    words = words.order_by("word")
+
+    rows = words.values_list(
+        "id",
+        "word",
+        "primary_language",
+        "definition__grammar_note",
+        "definition__usage_example",
+        "definition__difficulty_level",
+    ).iterator(chunk_size=chunk_size)
+    translation_rows = (
+        WordTranslation.objects.filter(word__in=words.order_by().values("pk"))
+        .order_by("word__word", "language")
+        .values_list("word_id", "language", "translation")
+        .iterator(chunk_size=chunk_size)
+    )
+    translation_groups = groupby(translation_rows, key=itemgetter(0))
+    pending = next(translation_groups, None)
+
+    for row in rows:
+        translations = {}
+        if pending is not None and pending[0] == row[0]:
+            translations = {language: text for _, language, text in pending[1]}
+            pending = next(translation_groups, None)
+
+        if stats is not None:
+            stats["words"] = stats.get("words", 0) + 1
+
+        yield row[1], frontend_word(row, translations)
+
+
+def frontend_payload(articles, words, stats):
+    """
+    Lazily build the localStorage payload written by the sync command.
+
+    The totals are read from ``stats`` only once both streams are exhausted,
+    which is why they come after the data, as in the historical format.
+    """
+    yield "linguaromana_custom_articles", StreamedList(articles)
+    yield "linguaromana_custom_words", StreamedDict(words)
+    yield "sync_timestamp", stats.get("sync_timestamp")
+    yield "sync_token", stats.get("sync_token")
+    yield "total_articles", stats.get("articles", 0)
+    yield "total_words", stats.get("words", 0)
+
+
+JS_HEADER = """// Script de synchronisation des articles Django vers frontend
+// Généré automatiquement - NE PAS MODIFIER MANUELLEMENT
+
+console.log("🔄 Synchronisation des articles depuis Django...");
+
+// Données des articles depuis Django
+const articlesData = """
+
+JS_MIDDLE = """;
+
+// Données des définitions de mots depuis Django
+const wordsData = """
+
+JS_STORE = """;
+
+// Nettoyer les anciennes données
+localStorage.removeItem('linguaromana_custom_articles');
+localStorage.removeItem('linguaromana_custom_words');
+
+// Charger les nouvelles données
+localStorage.setItem('linguaromana_custom_articles', JSON.stringify(articlesData));
+localStorage.setItem('linguaromana_custom_words', JSON.stringify(wordsData));
+"""
+
+JS_SYNC_TOKEN = """
+// Jeton de synchronisation pour les mises à jour incrémentales
+localStorage.setItem('linguaromana_sync_token', {token});
+"""
+
+JS_REPORT = """
+console.log(`✅ {articlesData.length} article(s) synchronisé(s)`);
+console.log(`✅ {Object.keys(wordsData).length} définition(s) de mots synchronisée(s)`);
+
+console.log("📊 Statistiques articles:");
+articlesData.forEach((article, index) => {
+    console.log(`   {index + 1}. {article.title} ({article.language}, {article.level})`);
+});
+
+console.log("🔤 Définitions de mots:");
+Object.keys(wordsData).forEach((word, index) => {
+    console.log(`   {index + 1}. {word} ({wordsData[word].primary_language}, {wordsData[word].difficulty_level})`);
+});
+
+console.log("\\n🔄 Rechargement de la page...");
+// Recharger automatiquement pour appliquer les changements
+setTimeout(() => {
+    window.location.reload();
+}, 1000);
+"""
+
+
+def js_footer(sync_token):
+    """Build the end of the JS initialization script, after the words data"""
+    token = json.dumps(sync_token)
+    return JS_STORE + JS_SYNC_TOKEN.format(token=token) + JS_REPORT
+
+
+def write_streaming_export(
+    json_file, js_file, articles=None, words=None, chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Stream the JSON payload and the JS initialization script in one pass.
+
+    Every article and word is read once and written to both files as it
+    arrives: ``json_file`` receives the full payload while ``js_file`` gets
+    the same data mirrored through ``json_sink`` coroutines.
+
+    Returns:
+        dict: Export statistics (``articles``, ``words``, ``sync_timestamp``,
+        ``sync_token``)
+    """
+    stats = {
+        "articles": 0,
+        "words": 0,
+        "sync_timestamp": None,
+        "sync_token": new_sync_token(),
+    }
+
+    js_file.write(JS_HEADER)
+    article_sink = open_sink(js_file.write, "array", indent=2)
+    articles = mirrored(
+        iter_frontend_articles(articles, stats, chunk_size), article_sink
+    )
+
+    def words_after_articles():
+        # The JS script declares wordsData after articlesData, so its sink is
+        # only opened once the articles stream has been fully written.
+        js_file.write(JS_MIDDLE)
+        word_sink = open_sink(js_file.write, "object", indent=2)
+        yield from mirrored(iter_frontend_words(words, stats, chunk_size), word_sink)
+        js_file.write(js_footer(stats["sync_token"]))
+
+    for chunk in iter_json(
+        StreamedDict(frontend_payload(articles, words_after_articles(), stats)),
+        indent=2,
+    ):
+        json_file.write(chunk)
+
+    return stats
+
+
+def new_sync_token(now=None):
+    """
+    Return a sync token for an export starting at ``now``, minus
+    ``SYNC_TOKEN_LAG``: ``updated_at`` is set before its transaction
+    commits, so a row committed after the export started may carry an
+    earlier time. Rows changed within the lag are sent again, which is
+    harmless.
+    """
+    return ((now or timezone.now()) - SYNC_TOKEN_LAG).isoformat()
+
+
+def parse_sync_token(token):
+    """
+    Decode a sync token into its watermark.
+
+    Raises:
+        ValueError: If the token is malformed or not timezone-aware
+    """
+    watermark = datetime.fromisoformat(token)
+    if timezone.is_naive(watermark):
+        raise ValueError(f"Sync token without timezone: {token}")
+    return watermark
+
+
+def changed_articles(since):
+    """Active articles created or modified since the ``since`` watermark"""
+    return Article.objects.filter(is_active=True, updated_at__gte=since)
+
+
+def changed_words(since):
+    """Words whose own row, translations or definition changed since ``since``"""
+    return Word.objects.filter(
+        Q(updated_at__gte=since)
+        | Q(translations__updated_at__gte=since)
+        | Q(definition__updated_at__gte=since)
+    ).distinct()
+
+
+def iter_deleted_articles(since):
+    """Ids of articles deleted or deactivated since ``since``"""
+    deactivated = Article.objects.filter(
+        is_active=False, updated_at__gte=since
+    ).values_list("id", flat=True)
+    deleted = SyncTombstone.objects.filter(
+        kind="article", deleted_at__gte=since
+    ).values_list("key", flat=True)
+    return (str(key) for key in chain(deactivated.iterator(), deleted.iterator()))
+
+
+def iter_deleted_words(since):
+    """Words deleted or renamed since ``since`` that do not exist anymore"""
+    return (
+        SyncTombstone.objects.filter(kind="word", deleted_at__gte=since)
+        .exclude(key__in=Word.objects.values("word"))
+        .values_list("key", flat=True)
+        .distinct()
+        .iterator()
+    )
+
+
+def delta_payload(since, stats, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lazily build the patch bringing a client from ``since`` to now.
+
+    Deletions come first: a client applies them, then upserts the changed
+    rows, so a word deleted and recreated in the meantime ends up present.
+    Watermarks are compared inclusively, so replaying a delta is harmless.
+    """
+    stats.setdefault("sync_token", new_sync_token())
+    yield "sync_token", stats["sync_token"]
+    yield "since", since.isoformat()
+    yield "deleted_articles", StreamedList(iter_deleted_articles(since))
+    yield "deleted_words", StreamedList(iter_deleted_words(since))
+    yield "linguaromana_custom_articles", StreamedList(
+        iter_frontend_articles(changed_articles(since), stats, chunk_size)
+    )
+    yield "linguaromana_custom_words", StreamedDict(
+        iter_frontend_words(changed_words(since), stats, chunk_size)
+    )
+    yield "total_articles", stats.get("articles", 0)
+    yield "total_words", stats.get("words", 0)
+
+
+def queue_shard_exports(keys):
+    """
+    Mark shards as needing a regeneration by the sync daemon.
+
+    Re-queuing a pending shard only moves its ``queued_at``, which is what
+    the daemon debounces on. One query whatever the number of keys.
+    """
+    now = timezone.now()
+    PendingShardExport.objects.bulk_create(
+        [PendingShardExport(shard_key=key, queued_at=now) for key in set(keys)],
+        update_conflicts=True,
+        unique_fields=["shard_key"],
+        update_fields=["queued_at"],
+    )
+
+
+def article_shard_keys(articles):
+    """Shard keys of the articles of a queryset, in one query"""
+    return {
+        article_shard_key(language, level)
+        for language, level in articles.values_list("language", "level").distinct()
+    }
+
+
+def export_shards_parallel(
+    directory,
+    workers,
+    languages=LANGUAGES,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    compress=False,
+    vocab_format=None,
+    executor_class=ProcessPoolExecutor,
+):
+    """
+    Export the shards of each language in a separate worker process.
+
+    JSON encoding dominates the export, so languages are exported in
+    parallel and the parent only merges the manifest entries returned by the
+    workers. The manifest is written once, atomically, after every worker
+    succeeded; a failing worker leaves the previous manifest in place.
+
+    Returns:
+        dict: The manifest that was written
+    """
+    os.makedirs(directory, exist_ok=True)
+    sync_token = new_sync_token()
+
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+    with executor_class(
+        max_workers=workers, initializer=export_workers.init_worker
+    ) as executor:
+        futures = [
+            executor.submit(
+                export_workers.export_language,
+                directory,
+                language,
+                chunk_size,
+                compress,
+                vocab_format,
+            )
+            for language in languages
+        ]
+        shards = {}
+        for future in futures:
+            shards.update(future.result())
+
+    return write_manifest(
+        directory,
+        shards,
+        sync_token,
+        merge=set(languages) != set(LANGUAGES),
+        compress=compress,
+    )
+
+
+def _replace_atomic(path, write_content):
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write_content(f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _iter_file(path):
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_COPY_BUFFER_SIZE)
+            if not block:
+                return
+            yield block
+
+
+def compress_artifact(path):
+    """
+    Write the gzip and, when the ``brotli`` package is installed, brotli
+    variants of ``path`` next to it.
+
+    Compression streams over the file with the highest compression levels,
+    since it happens once per export. Gzip output carries no timestamp, so
+    unchanged content yields byte-identical variants.
+
+    Returns:
+        list: Paths of the variants written
+    """
+
+    def write_gzip(f):
+        with gzip.GzipFile(
+            filename="", mode="wb", fileobj=f, compresslevel=9, mtime=0
+        ) as compressed:
+            for block in _iter_file(path):
+                compressed.write(block)
+
+    def write_brotli(f):
+        compressor = brotli.Compressor(quality=11)
+        for block in _iter_file(path):
+            f.write(compressor.process(block))
+        f.write(compressor.finish())
+
+    variants = [(path + COMPRESSION_SUFFIXES["gzip"], write_gzip)]
+    if brotli is not None:
+        variants.append((path + COMPRESSION_SUFFIXES["br"], write_brotli))
+
+    for variant_path, write_content in variants:
+        _replace_atomic(variant_path, write_content)
+    return [variant_path for variant_path, _ in variants]
+
+
+def write_atomic(path, chunks):
+    """
+    Write string ``chunks`` to ``path`` through a temporary file.
+
+    Readers never see a partially written file: the temporary file is moved
+    over ``path`` once complete. The content is hashed while it is written.
+
+    Returns:
+        dict: ``sha256`` hex digest and size in ``bytes`` of the written file
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    def write_content(f):
+        nonlocal size
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            digest.update(data)
+            size += len(data)
+            f.write(data)
+
+    _replace_atomic(path, write_content)
+    return {"sha256": digest.hexdigest(), "bytes": size}
+
+
+def article_shard_key(language, level):
+    return f"articles/{language}/{level}"
+
+
+def word_shard_key(language):
+    return f"words/{language}"
+
+
+def shard_file(key):
+    """File name of a shard inside the export directory"""
+    return key.replace("/", "-") + ".json"
+
+
+def shard_keys(languages=LANGUAGES):
+    """All shard keys of ``languages``, articles first"""
+    for language in languages:
+        for level in LEVELS:
+            yield article_shard_key(language, level)
+        yield word_shard_key(language)
+
+
+def export_shard(
+    directory,
+    key,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    compress=False,
+    vocab_format=None,
+):
+    """
+    Write one shard and return its manifest entry.
+
+    Article shards hold the active articles of one language and level as a
+    JSON array; vocabulary shards map the words of one primary language to
+    their definitions, or use the compact layout of ``vocabulary_format``
+    when ``vocab_format`` is ``"columnar"``. Each shard costs two queries.
+    """
+    kind, language, *level = key.split("/")
+    stats = {}
+    entry = {"file": shard_file(key)}
+    if kind == "articles":
+        articles = Article.objects.filter(
+            is_active=True, language=language, level=level[0]
+        )
+        value = StreamedList(iter_frontend_articles(articles, stats, chunk_size))
+        chunks = iter_json(value)
+    else:
+        words = Word.objects.filter(primary_language=language)
+        entries = iter_frontend_words(words, stats, chunk_size)
+        if vocab_format == VOCABULARY_FORMAT:
+            entry["format"] = VOCABULARY_FORMAT
+            chunks = [dumps_vocabulary(encode_vocabulary(entries))]
+        else:
+            chunks = iter_json(StreamedDict(entries))
+
+    path = os.path.join(directory, entry["file"])
+    entry.update(write_atomic(path, chunks))
+    entry["count"] = stats.get(kind, 0)
+    if compress:
+        compress_artifact(path)
+    return entry
+
+
+def read_manifest(directory):
+    """Load the manifest of an export directory, or an empty one"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"version": MANIFEST_VERSION, "shards": {}}
+
+
+def write_manifest(directory, shards, sync_token, merge=False, compress=False):
+    """
+    Atomically write the manifest describing ``shards``.
+
+    With ``merge``, entries of shards that were not regenerated are kept
+    from the current manifest.
+    """
+    entries = read_manifest(directory)["shards"] if merge else {}
+    entries.update(shards)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generated_at": timezone.now().isoformat(),
+        "sync_token": sync_token,
+        "shards": dict(sorted(entries.items())),
+    }
+    path = os.path.join(directory, MANIFEST_NAME)
+    write_atomic(path, [json.dumps(manifest, ensure_ascii=False, indent=2)])
+    if compress:
+        compress_artifact(path)
+    return manifest
+
+
+def export_shards(
+    directory,
+    keys=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    compress=False,
+    vocab_format=None,
+):
+    """
+    Export the catalog as shards plus a manifest.
+
+    ``keys`` limits the export to some shards; the manifest entries of the
+    other shards are then preserved. With ``compress``, every file also gets
+    its precompressed variants. ``vocab_format`` selects the vocabulary
+    layout (see ``export_shard``).
+
+    Returns:
+        dict: The manifest that was written
+    """
+    os.makedirs(directory, exist_ok=True)
+    sync_token = new_sync_token()
+    shards = {
+        key: export_shard(directory, key, chunk_size, compress, vocab_format)
+        for key in (keys if keys is not None else shard_keys())
+    }
+    return write_manifest(
+        directory, shards, sync_token, merge=keys is not None, compress=compress
+    )
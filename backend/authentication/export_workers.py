@@ -0,0 +1,27 @@
+"""
+Process pool entry points for the parallel sharded export.
+
+This module imports nothing from Django at import time so that it can be
+loaded by freshly spawned worker processes before Django is set up.
+"""
+
+
+def init_worker():
+    """Set up Django in a worker and drop database connections it inherited"""
+    import django
+
+    django.setup()
+
+    from django.db import connections
+
+    connections.close_all()
+
+
+def export_language(directory, language, chunk_size, compress, vocab_format=None):
+    """Export every shard of one language and return their manifest entries"""
+    from .export import export_shard, shard_keys
+
+    return {
+        key: export_shard(directory, key, chunk_size, compress, vocab_format)
+        for key in shard_keys([language])
+    }
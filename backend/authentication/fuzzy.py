@@ -0,0 +1,160 @@
+"""
+"Did you mean" lookups over the vocabulary.
+
+Every ``Word.word`` and ``WordTranslation.translation`` is indexed under its
+folded spelling (see ``text.fold``) in a SymSpell-style deletion
+dictionary: each spelling is stored under every string obtained by deleting
+up to ``MAX_DISTANCE`` of its characters. Two spellings within that edit
+distance share such a deletion, so a lookup generates the deletions of the
+term, collects the spellings stored under them and only computes the edit
+distance of those few candidates: "controversía" finds "controversia" and
+"lanzamentos" finds "lanzamientos" without scanning the vocabulary.
+
+Matches are ranked by edit distance (a swap of two neighbouring letters
+counts as one edit), then by corpus frequency like type-ahead suggestions
+(see ``completion``), whose incremental sync the index shares.
+"""
+
+import heapq
+import threading
+
+from .cache import WORDS, generation
+from .completion import DEFAULT_LIMIT, VocabularyIndex
+from .text import fold
+
+MAX_DISTANCE = 2
+
+
+def deletions(key, distance=MAX_DISTANCE):
+    """``key`` and the strings left by deleting up to ``distance`` characters"""
+    variants = {key}
+    frontier = {key}
+    for _ in range(distance):
+        frontier = {
+            text[:i] + text[i + 1 :] for text in frontier for i in range(len(text))
+        }
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a, b, limit=MAX_DISTANCE):
+    """
+    Optimal string alignment distance between ``a`` and ``b``: insertions,
+    deletions, substitutions and adjacent transpositions, or ``limit + 1``
+    when it is above ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = None
+    row = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        before, previous, row = previous, row, [i] + [0] * len(b)
+        for j, other in enumerate(b, 1):
+            row[j] = min(
+                previous[j] + 1,
+                row[j - 1] + 1,
+                previous[j - 1] + (char != other),
+            )
+            if (
+                before is not None
+                and j > 1
+                and char == b[j - 2]
+                and a[i - 2] == other
+            ):
+                row[j] = min(row[j], before[j - 2] + 1)
+        # A transposition reaches back two rows
+        if min(row) > limit and min(previous) > limit:
+            return limit + 1
+    return min(row[-1], limit + 1)
+
+
+class FuzzyIndex(VocabularyIndex):
+    """Deletion dictionary over the folded spellings of words and translations"""
+
+    def __init__(self):
+        super().__init__()
+        # Folded spelling -> suggestions spelled so
+        self._spellings = {}
+        # Deletion -> folded spellings it was derived from
+        self._deletions = {}
+
+    def _insert(self, item):
+        key = fold(item.text)
+        if key not in self._spellings:
+            self._spellings[key] = set()
+            for variant in deletions(key):
+                self._deletions.setdefault(variant, set()).add(key)
+        self._spellings[key].add(item)
+
+    def _delete(self, item):
+        key = fold(item.text)
+        items = self._spellings[key]
+        items.discard(item)
+        if items:
+            return
+        del self._spellings[key]
+        for variant in deletions(key):
+            keys = self._deletions[variant]
+            keys.discard(key)
+            if not keys:
+                del self._deletions[variant]
+
+    def lookup(self, term, language=None, limit=DEFAULT_LIMIT):
+        """
+        Best ``(distance, suggestion)`` pairs within ``MAX_DISTANCE`` of
+        ``term`` (accents and case ignored), in ``language`` or in any
+        language
+        """
+        key = fold(term)
+        if not key:
+            return []
+        candidates = set()
+        for variant in deletions(key):
+            candidates.update(self._deletions.get(variant, ()))
+        matches = []
+        for candidate in candidates:
+            distance = edit_distance(key, candidate)
+            if distance > MAX_DISTANCE:
+                continue
+            matches.extend(
+                (distance, item)
+                for item in self._spellings[candidate]
+                if language is None or item.language == language
+            )
+        return heapq.nsmallest(
+            limit, matches, key=lambda match: (match[0], match[1].rank)
+        )
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def reset_fuzzy_index():
+    """Drop the index of this process; the next use rebuilds it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def suggest_words(term, language=None, limit=DEFAULT_LIMIT):
+    """
+    Spellings close to ``term`` as ``{"text", "word", "language",
+    "distance"}`` dicts, closest and most frequent words first
+    """
+    global _index
+    current = generation(WORDS)
+    with _index_lock:
+        if _index is None:
+            _index = FuzzyIndex()
+        _index.refresh(current)
+        matches = _index.lookup(term, language, limit)
+    return [
+        {
+            "text": item.text,
+            "word": item.word,
+            "language": item.language,
+            "distance": distance,
+        }
+        for distance, item in matches
+    ]
@@ -0,0 +1,278 @@
+"""
+Bulk import of articles from JSON Lines.
+
+Each line is an article object::
+
+    {"title": "...", "content": "... [palabra] ...", "language": "es",
+     "level": "beginner", "publication_date": "2024-05-01", "is_active": true}
+
+``level`` defaults to intermediate and ``is_active`` to true. Bracketed
+words of the content become ``ArticleWord`` key vocabulary of the word they
+are a form of (see ``inflection``), creating the missing ``Word`` rows in
+the language of the article. The other known words of the articles are
+then linked by the annotator (see ``annotation``).
+
+Lines are read lazily and written in batches, each batch in a transaction,
+with one ``bulk_create`` per model. ``bulk_create`` skips ``save()`` and
+signals, so the importer fills the derived columns itself and does the
+signal work once per batch: archive counts, latest article pointers, cache
+generations, export shards, the forms of the new words and the annotation.
+"""
+
+import json
+from collections import defaultdict
+from datetime import date
+from itertools import islice
+
+from django.db import transaction
+
+from .annotation import annotate_articles
+from .archive import apply_archive_deltas, archive_bucket, archive_state
+from .articles import refresh_latest_articles
+from .cache import WORDS, bump_generation, bump_generations
+from .export import (
+    LANGUAGES,
+    LEVELS,
+    article_shard_key,
+    queue_shard_exports,
+    word_shard_key,
+)
+from .inflection import rebuild_word_forms
+from .models import (
+    LOOKUP_CHUNK_SIZE,
+    Article,
+    ArticleWord,
+    Word,
+    WordForm,
+    clitic_host_checker,
+    search_key,
+)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ArticleImportError(ValueError):
+    """Invalid article line, reported with its line number and skipped"""
+
+
+def parse_article(line):
+    """
+    Build an unsaved ``Article`` from a JSON line.
+
+    Raises:
+        ArticleImportError: If the line is not a valid article
+    """
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        raise ArticleImportError(f"Invalid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise ArticleImportError("Expected a JSON object")
+
+    for field in ("title", "content", "language", "publication_date"):
+        if not data.get(field):
+            raise ArticleImportError(f"Missing {field}")
+    for field in ("title", "content", "language", "level", "publication_date"):
+        if field in data and not isinstance(data[field], (str, type(None))):
+            raise ArticleImportError(f"{field} must be a string")
+    if data["language"] not in LANGUAGES:
+        raise ArticleImportError(f"Unknown language: {data['language']}")
+    level = data.get("level") or "intermediate"
+    if level not in LEVELS:
+        raise ArticleImportError(f"Unknown level: {level}")
+    if len(data["title"]) > Article._meta.get_field("title").max_length:
+        raise ArticleImportError("Title too long")
+    try:
+        publication_date = date.fromisoformat(data["publication_date"])
+    except (TypeError, ValueError) as e:
+        raise ArticleImportError(f"Invalid publication_date: {e}") from e
+    is_active = data.get("is_active", True)
+    if not isinstance(is_active, bool):
+        raise ArticleImportError("is_active must be true or false")
+
+    article = Article(
+        title=data["title"],
+        content=data["content"],
+        language=data["language"],
+        level=level,
+        publication_date=publication_date,
+        is_active=is_active,
+    )
+    return article
+
+
+def import_articles(lines, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Import the articles of an iterable of JSON lines.
+
+    Invalid lines are skipped and reported in ``errors``. A database error
+    rolls back the current batch only and is raised.
+
+    Yields:
+        dict: Running totals after each batch: ``lines``, ``articles``,
+        ``words`` (created), ``occurrences`` (bracketed), ``annotated``
+        (other known words linked) and ``errors`` as ``(line number,
+        message)`` pairs
+    """
+    stats = {
+        "lines": 0,
+        "articles": 0,
+        "words": 0,
+        "occurrences": 0,
+        "annotated": 0,
+        "errors": [],
+    }
+    numbered = enumerate(lines, 1)
+    while batch := list(islice(numbered, batch_size)):
+        articles = []
+        for number, line in batch:
+            if not line.strip():
+                continue
+            try:
+                articles.append(parse_article(line))
+            except ArticleImportError as e:
+                stats["errors"].append((number, str(e)))
+        stats["lines"] = batch[-1][0]
+
+        if articles:
+            with transaction.atomic():
+                words, occurrences = import_batch(articles)
+            # Once committed, so that no worker caches the previous state
+            # under the new generation
+            bump_generations({article.language for article in articles})
+            if words:
+                bump_generation(WORDS)
+            stats["articles"] += len(articles)
+            stats["words"] += words
+            stats["occurrences"] += occurrences
+            # In its own transaction, as the admin does after a save
+            stats["annotated"] += annotate_articles(articles)
+        yield stats
+
+
+def import_batch(articles):
+    """
+    Insert unsaved articles with their vocabulary.
+
+    Returns:
+        tuple: Numbers of created words and of word occurrences
+    """
+    texts = defaultdict(list)
+    for article in articles:
+        texts[article.language].append(article.plain_text)
+    is_host = {
+        language: clitic_host_checker(language_texts, language)
+        for language, language_texts in texts.items()
+    }
+    for article in articles:
+        article.update_derived_fields(is_host[article.language])
+    Article.objects.bulk_create(articles)
+
+    occurrences = []
+    languages = {}
+    for article in articles:
+        markup = article.markup
+        for span, sentence_index in zip(markup.spans, markup.sentence_indexes):
+            occurrences.append((article, span.start, sentence_index, span.surface))
+            languages.setdefault(span.surface, article.language)
+
+    word_ids = _word_ids(languages)
+    word_ids.update(
+        _form_word_ids(
+            (text, language)
+            for text, language in languages.items()
+            if text not in word_ids
+        )
+    )
+    missing = [
+        Word(word=text, primary_language=language)
+        for text, language in languages.items()
+        if text not in word_ids
+    ]
+    for word in missing:
+        word.update_derived_fields()
+    # A word created by someone else in the meantime is simply reused
+    Word.objects.bulk_create(missing, ignore_conflicts=True)
+    created = _word_ids([word.word for word in missing])
+    word_ids.update(created)
+    rebuild_word_forms(
+        (created[word.word], word.word, word.primary_language)
+        for word in missing
+        if word.word in created
+    )
+
+    ArticleWord.objects.bulk_create(
+        [
+            ArticleWord(
+                article=article,
+                word_id=word_ids[text],
+                position_in_text=position,
+                sentence_index=sentence_index,
+                is_key_vocabulary=True,
+            )
+            for article, position, sentence_index, text in occurrences
+        ]
+    )
+
+    _after_bulk_insert(articles, missing)
+    return len(missing), len(occurrences)
+
+
+def _word_ids(texts):
+    texts = list(texts)
+    word_ids = {}
+    for start in range(0, len(texts), LOOKUP_CHUNK_SIZE):
+        chunk = texts[start : start + LOOKUP_CHUNK_SIZE]
+        word_ids.update(Word.objects.filter(word__in=chunk).values_list("word", "id"))
+    return word_ids
+
+
+def _form_word_ids(texts):
+    """
+    Ids of the words of which the ``(text, language)`` pairs are a form in
+    that language, preferring the word spelled that way
+    """
+    keys = defaultdict(list)
+    for text, language in texts:
+        keys[search_key(text), language].append(text)
+    form_keys = list({key for key, _ in keys})
+    best = {}
+    for start in range(0, len(form_keys), LOOKUP_CHUNK_SIZE):
+        chunk = form_keys[start : start + LOOKUP_CHUNK_SIZE]
+        for form_key, language, word_id, word_key in (
+            WordForm.objects.filter(form_key__in=chunk)
+            .order_by()
+            .values_list(
+                "form_key", "word__primary_language", "word_id", "word__word_key"
+            )
+        ):
+            rank = (word_key != form_key, word_id)
+            if (form_key, language) in keys:
+                best[form_key, language] = min(
+                    best.get((form_key, language), rank), rank
+                )
+    return {
+        text: best[key][1]
+        for key, texts in keys.items()
+        if key in best
+        for text in texts
+    }
+
+
+def _after_bulk_insert(articles, words):
+    """
+    What the article and word signals would have done, once per batch.
+    Cache generations are bumped by the caller after the commit.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for article in articles:
+        delta = deltas[archive_bucket(archive_state(article))]
+        delta[0] += 1
+        delta[1] += article.is_active
+    apply_archive_deltas(deltas)
+
+    refresh_latest_articles({article.language for article in articles})
+    queue_shard_exports(
+        {article_shard_key(a.language, a.level) for a in articles}
+        | {word_shard_key(word.primary_language) for word in words}
+    )
@@ -0,0 +1,228 @@
+"""
+Inflected forms of vocabulary words.
+
+Every ``Word`` is indexed under its surface forms in ``WordForm``: the word
+itself, the forms generated by the suffix rules of its language (plurals,
+feminines, common verb endings) and the irregular forms added by editors.
+A form found in a text resolves to its lemma with one indexed lookup on
+``WordForm.form_key``, so "lanzamientos" needs no row of its own.
+
+Rules only look at the ending of the word: they over-generate a little
+("mar" is too short for verb endings, but "lugar" gets "lugo"), which is
+harmless as long as exact words win over generated forms.
+"""
+
+
+from .models import SyncTombstone, Word, WordForm, search_key
+
+# Stems shorter than this get no generated forms
+MIN_STEM_LENGTH = 2
+
+# Per language, groups of ``ending: replacements`` rules. In each group the
+# longest matching ending applies; "" matches every word.
+# fmt: off
+SUFFIX_RULES = {
+    "es": [
+        {
+            "o": ["a", "os", "as"],
+            "a": ["as"],
+            "e": ["es"],
+            "ón": ["ones"],
+            "és": ["esa", "eses", "esas"],
+            "z": ["ces"],
+            "l": ["les"],
+            "n": ["nes"],
+            "r": ["res"],
+            "d": ["des"],
+        },
+        {
+            "ar": ["o", "as", "a", "amos", "áis", "an", "é", "aste", "ó", "aron",
+                   "aba", "aban", "ado", "ada", "ados", "adas", "ando", "ará",
+                   "arán", "aría", "e", "en"],
+            "er": ["o", "es", "e", "emos", "éis", "en", "í", "ió", "ieron", "ía",
+                   "ían", "ido", "ida", "idos", "idas", "iendo", "erá", "erán",
+                   "ería", "a", "an"],
+            "ir": ["o", "es", "e", "imos", "ís", "en", "í", "ió", "ieron", "ía",
+                   "ían", "ido", "ida", "idos", "idas", "iendo", "irá", "irán",
+                   "iría", "a", "an"],
+        },
+    ],
+    "it": [
+        {
+            "o": ["i", "a", "e"],
+            "io": ["i"],
+            "co": ["chi", "ca", "che"],
+            "go": ["ghi", "ga", "ghe"],
+            "a": ["e"],
+            "ca": ["che"],
+            "ga": ["ghe"],
+            "e": ["i"],
+        },
+        {
+            "are": ["o", "i", "a", "iamo", "ate", "ano", "ato", "ata", "ati",
+                    "ando", "ava", "avano", "ai", "ò", "arono", "erà",
+                    "eranno"],
+            "ere": ["o", "i", "e", "iamo", "ete", "ono", "uto", "uta", "uti",
+                    "ute", "endo", "eva", "evano", "erà", "eranno"],
+            "ire": ["o", "i", "e", "iamo", "ite", "ono", "ito", "ita", "iti",
+                    "endo", "iva", "ivano", "irà", "iranno", "isco", "isce",
+                    "iscono"],
+        },
+    ],
+    "pt": [
+        {
+            "o": ["a", "os", "as"],
+            "a": ["as"],
+            "e": ["es"],
+            "ão": ["ões", "ãos"],
+            "m": ["ns"],
+            "al": ["ais"],
+            "el": ["éis"],
+            "ol": ["óis"],
+            "r": ["res"],
+            "z": ["zes"],
+        },
+        {
+            "ar": ["o", "as", "a", "amos", "am", "ei", "ou", "aram", "ava",
+                   "avam", "ado", "ada", "ados", "adas", "ando", "ará",
+                   "arão"],
+            "er": ["o", "es", "e", "emos", "em", "i", "eu", "eram", "ia", "iam",
+                   "ido", "ida", "idos", "idas", "endo", "erá", "erão"],
+            "ir": ["o", "es", "e", "imos", "em", "i", "iu", "iram", "ia", "iam",
+                   "ido", "ida", "idos", "idas", "indo", "irá", "irão"],
+        },
+    ],
+    "fr": [
+        {
+            "": ["s", "e", "es"],
+            "e": ["es"],
+            "s": [],
+            "x": [],
+            "z": [],
+            "al": ["aux", "ale", "ales"],
+            "au": ["aux"],
+            "eau": ["eaux"],
+            "eu": ["eux"],
+            "eux": ["euse", "euses"],
+            "if": ["ifs", "ive", "ives"],
+            "er": ["ers", "ère", "ères"],
+            "ir": ["irs"],
+            "re": ["res"],
+        },
+        {
+            "er": ["e", "es", "ons", "ez", "ent", "é", "ée", "és", "ées", "ais",
+                   "ait", "aient", "ant", "era", "eront", "a", "èrent"],
+            "ir": ["is", "it", "issons", "issez", "issent", "i", "ie", "ies",
+                   "issait", "issant", "ira", "iront"],
+            "re": ["s", "", "ons", "ez", "ent", "u", "ue", "us", "ues", "ait",
+                   "ant", "ra", "ront"],
+        },
+    ],
+    "ca": [
+        {
+            "": ["s", "a", "es"],
+            "a": ["es"],
+            "ca": ["ques"],
+            "ga": ["gues"],
+            "ça": ["ces"],
+            "ja": ["ges"],
+            "gua": ["gües"],
+            "e": ["es"],
+            "ó": ["ons"],
+            "r": ["rs"],
+            "re": ["res"],
+            "s": [],
+        },
+        {
+            "ar": ["o", "es", "a", "em", "eu", "en", "at", "ada", "ats", "ades",
+                   "ant", "ava", "aven", "arà", "aran"],
+            "re": ["o", "s", "", "em", "eu", "en", "ut", "uda", "uts", "udes",
+                   "ent", "ia", "ien", "rà", "ran"],
+            "ir": ["eixo", "eixes", "eix", "im", "iu", "eixen", "it", "ida",
+                   "its", "ides", "int", "ia", "ien", "irà", "iran"],
+        },
+    ],
+}
+# fmt: on
+
+
+def inflect(word, language):
+    """
+    Forms of ``word`` generated by the suffix rules of ``language``, the
+    word itself excluded.
+    """
+    forms = set()
+    for group in SUFFIX_RULES.get(language, ()):
+        for length in range(len(word), -1, -1):
+            ending = word[len(word) - length :]
+            if ending in group:
+                stem = word[: len(word) - length]
+                if len(stem) >= MIN_STEM_LENGTH:
+                    forms.update(stem + suffix for suffix in group[ending])
+                break
+    forms.discard(word)
+    return sorted(form for form in forms if form)
+
+
+def rebuild_word_forms(words, form_model=WordForm):
+    """
+    Replace the generated forms of ``words``, ``(id, word, language)``
+    tuples. Forms added by editors are kept.
+
+    Returns:
+        int: Number of forms generated
+    """
+    words = list(words)
+    forms = [
+        form_model(
+            word_id=word_id,
+            form=form,
+            form_key=search_key(form),
+            is_generated=True,
+        )
+        for word_id, text, language in words
+        for form in [text, *inflect(text, language)]
+    ]
+    form_model.objects.filter(
+        word_id__in=[word_id for word_id, _, _ in words], is_generated=True
+    ).delete()
+    # A form an editor already added stays theirs
+    form_model.objects.bulk_create(forms, ignore_conflicts=True, batch_size=1000)
+    return len(forms)
+
+
+def rebuild_all_word_forms(word_model=Word, form_model=WordForm, batch_size=1000):
+    """
+    Regenerate the forms of every word, after rule changes or writes that
+    bypass signals. The words are not touched: a "forms" ``SyncTombstone``
+    tells running annotators to reload them all.
+
+    Returns:
+        int: Number of forms generated
+    """
+    words = word_model.objects.order_by("pk").values_list(
+        "pk", "word", "primary_language"
+    )
+    generated = 0
+    last_pk = 0
+    while batch := list(words.filter(pk__gt=last_pk)[:batch_size]):
+        generated += rebuild_word_forms(batch, form_model)
+        last_pk = batch[-1][0]
+    SyncTombstone.objects.create(kind="forms", key="*")
+    return generated
+
+
+def lookup_words(text, language=None):
+    """
+    Words of which ``text`` is a form (accents and case ignored), in one
+    query, optionally only in ``language``. Words spelled ``text`` come
+    first.
+    """
+    key = search_key(text)
+    forms = WordForm.objects.filter(form_key=key).select_related("word")
+    if language:
+        forms = forms.filter(word__primary_language=language)
+    words = {}
+    for form in forms:
+        words.setdefault(form.word_id, form.word)
+    return sorted(words.values(), key=lambda word: (word.word_key != key, word.pk))
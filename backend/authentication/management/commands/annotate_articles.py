@@ -0,0 +1,64 @@
+"""
+Django Management Command pour relier automatiquement les articles au
+vocabulaire connu.
+
+Chaque mot de la table ``Word`` présent dans un article (dans la langue de
+l'article) sans y être entre crochets devient une occurrence
+(``ArticleWord``) qui n'est pas du vocabulaire clé. Les articles sont
+parcourus par lots, chacun en une seule passe d'un automate Aho-Corasick.
+Relancer la commande ne crée que les occurrences manquantes.
+
+Usage:
+    python manage.py annotate_articles
+    python manage.py annotate_articles --language fr --batch-size 1000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.annotation import DEFAULT_BATCH_SIZE, annotate_all_articles
+from authentication.export import LANGUAGES
+from authentication.models import Article
+
+
+class Command(BaseCommand):
+    help = "Relier automatiquement les articles aux mots connus"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--language",
+            choices=LANGUAGES,
+            help="Annoter seulement les articles de cette langue",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Nombre d'articles par lot (défaut: {DEFAULT_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size doit être positif")
+
+        articles = Article.objects.all()
+        if options["language"]:
+            articles = articles.filter(language=options["language"])
+
+        self.stdout.write(self.style.SUCCESS("🔎 Annotation des articles"))
+        started = time.monotonic()
+        scanned = created = 0
+        for scanned, created in annotate_all_articles(
+            articles, batch_size=options["batch_size"]
+        ):
+            self.stdout.write(f"   ✅ {scanned} article(s) parcouru(s)")
+        elapsed = time.monotonic() - started
+
+        rate = scanned / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✅ {created} occurrence(s) créée(s) dans {scanned} article(s)"
+                f" en {elapsed:.1f} s ({rate:.0f} articles/s)"
+            )
+        )
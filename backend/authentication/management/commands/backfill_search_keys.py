@@ -0,0 +1,43 @@
+"""
+Django Management Command pour recalculer les clés de recherche normalisées.
+
+Les colonnes ``*_key`` (sans accents, en minuscules, "l·l" catalan en "ll")
+sont remplies à chaque sauvegarde. Les écritures en masse (bulk_create,
+update, SQL brut) ne passent pas par ``save()``: cette commande les remet
+à jour.
+
+Usage:
+    python manage.py backfill_search_keys
+    python manage.py backfill_search_keys --batch-size 5000
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from authentication.utils import SEARCH_KEYS, backfill_search_keys
+
+
+class Command(BaseCommand):
+    help = "Recalculer les clés de recherche insensibles aux accents et à la casse"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Nombre de lignes lues et écrites par lot (défaut: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("🔤 Recalcul des clés de recherche"))
+
+        for model_name, source, key in SEARCH_KEYS:
+            model = apps.get_model("authentication", model_name)
+            updated = backfill_search_keys(
+                model, source, key, batch_size=options["batch_size"]
+            )
+            self.stdout.write(
+                f"   ✅ {model_name}.{key}: {updated} ligne(s) mise(s) à jour"
+            )
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Clés de recherche à jour!"))
@@ -6,7 +6,6 @@ Usage:
     python manage.py create_default_article
 """
 
-import re
 from datetime import date
 
 from django.contrib.auth.models import User
@@ -250,7 +249,7 @@ Los defensores de esta estrategia sostienen que, ante la imposibilidad de acceso
 
         self.stdout.write(f"✅ Article par défaut créé: {article.title}")
 
-        # Créer les associations ArticleWord
+        # Créer les associations ArticleWord, en une seule lecture du contenu
         words_in_brackets = [
             "crisis",
             "humanitaria",
@@ -259,25 +258,19 @@ Los defensores de esta estrategia sostienen que, ante la imposibilidad de acceso
             "controversia",
         ]
 
-        for word_text in words_in_brackets:
-            if word_text in vocabulary_words:
-                word = vocabulary_words[word_text]
-
-                # Trouver toutes les positions du mot dans le contenu
-                pattern = f"\\[{re.escape(word_text)}\\]"
-                matches = list(re.finditer(pattern, article_content))
-
-                for i, match in enumerate(matches):
-                    article_word = ArticleWord.objects.create(
-                        article=article,
-                        word=word,
-                        position_in_text=match.start(),
-                        context_sentence=article_content,
-                        is_key_vocabulary=True,
-                    )
+        markup = article.markup
+        for span, sentence_index in zip(markup.spans, markup.sentence_indexes):
+            if span.surface in words_in_brackets and span.surface in vocabulary_words:
+                ArticleWord.objects.create(
+                    article=article,
+                    word=vocabulary_words[span.surface],
+                    position_in_text=span.start,
+                    sentence_index=sentence_index,
+                    is_key_vocabulary=True,
+                )
 
-                    self.stdout.write(
-                        f"   ✅ Association créée: {article.title} -> {word_text} (pos: {match.start()})"
-                    )
+                self.stdout.write(
+                    f"   ✅ Association créée: {article.title} -> {span.surface} (pos: {span.start})"
+                )
 
         return article
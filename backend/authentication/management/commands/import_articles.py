@@ -0,0 +1,106 @@
+"""
+Django Management Command pour importer des articles en masse depuis un
+fichier JSON Lines (un article JSON par ligne).
+
+Les articles sont insérés par lots (``bulk_create``), chaque lot dans une
+transaction. Les mots entre crochets du contenu deviennent du vocabulaire
+(``ArticleWord``), les mots absents sont créés, et les autres mots connus
+présents dans les articles y sont reliés automatiquement. Les lignes
+invalides sont signalées et ignorées.
+
+Format d'une ligne:
+    {"title": "...", "content": "... [palabra] ...", "language": "es",
+     "level": "beginner", "publication_date": "2024-05-01", "is_active": true}
+
+Usage:
+    python manage.py import_articles articles.jsonl
+    python manage.py import_articles articles.jsonl --batch-size 5000
+    cat articles.jsonl | python manage.py import_articles -
+"""
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from authentication.importer import DEFAULT_BATCH_SIZE, import_articles
+
+# Invalid lines listed in the report, the others are only counted
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = "Importer des articles en masse depuis un fichier JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "file", help="Fichier JSON Lines à importer ('-' pour l'entrée standard)"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Nombre d'articles par lot et par transaction (défaut: {DEFAULT_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size doit être positif")
+
+        self.stdout.write(self.style.SUCCESS("📥 Import des articles"))
+        if options["file"] == "-":
+            self.run(sys.stdin, options["batch_size"])
+            return
+        try:
+            with open(options["file"], encoding="utf-8") as lines:
+                self.run(lines, options["batch_size"])
+        except OSError as e:
+            raise CommandError(f"Impossible de lire {options['file']}: {e}")
+
+    def run(self, lines, batch_size):
+        started = time.monotonic()
+        stats = {
+            "lines": 0,
+            "articles": 0,
+            "words": 0,
+            "occurrences": 0,
+            "annotated": 0,
+            "errors": [],
+        }
+        try:
+            for stats in import_articles(lines, batch_size=batch_size):
+                self.stdout.write(
+                    f"   ✅ {stats['articles']} article(s) importé(s)"
+                    f" ({stats['lines']} ligne(s) lue(s))"
+                )
+        except DatabaseError as e:
+            raise CommandError(
+                f"Erreur de base de données après {stats['articles']} article(s),"
+                f" le lot en cours est annulé: {e}"
+            )
+        elapsed = time.monotonic() - started
+
+        errors = stats["errors"]
+        for number, message in errors[:MAX_REPORTED_ERRORS]:
+            self.stdout.write(self.style.WARNING(f"⚠️  Ligne {number}: {message}"))
+        if len(errors) > MAX_REPORTED_ERRORS:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"⚠️  ... et {len(errors) - MAX_REPORTED_ERRORS} autre(s) ligne(s) invalide(s)"
+                )
+            )
+
+        rate = stats["articles"] / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✅ {stats['articles']} article(s), {stats['occurrences']}"
+                f" occurrence(s) de vocabulaire, {stats['annotated']} mot(s) connu(s)"
+                f" relié(s), {stats['words']} nouveau(x) mot(s)"
+                f" en {elapsed:.1f} s ({rate:.0f} articles/s)"
+            )
+        )
+        if errors:
+            self.stdout.write(
+                self.style.WARNING(f"⚠️  {len(errors)} ligne(s) ignorée(s)")
+            )
@@ -0,0 +1,25 @@
+"""
+Django Management Command pour recalculer les compteurs d'archive.
+
+Les compteurs d'articles par langue, niveau et mois (``ArchiveMonth``) sont
+mis à jour à chaque sauvegarde ou suppression d'article. Les écritures en
+masse (bulk_create, update, SQL brut) ne déclenchent pas les signaux: cette
+commande les recalcule à partir des articles.
+
+Usage:
+    python manage.py rebuild_archive_months
+"""
+
+from django.core.management.base import BaseCommand
+
+from authentication.archive import rebuild_archive_months
+
+
+class Command(BaseCommand):
+    help = "Recalculer les compteurs d'articles par langue, niveau et mois"
+
+    def handle(self, *args, **options):
+        rows = rebuild_archive_months()
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Compteurs d'archive recalculés: {rows} mois")
+        )
@@ -0,0 +1,32 @@
+"""
+Django Management Command pour reconstruire l'index de recherche plein texte.
+
+À lancer si l'index FTS5 des articles n'est plus à jour, par exemple après
+une migration qui reconstruit la table des articles (SQLite supprime alors
+ses déclencheurs).
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from authentication.search import fts_available, install_article_fts
+
+
+class Command(BaseCommand):
+    help = "Reconstruire l'index de recherche plein texte des articles"
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            install_article_fts(schema_editor)
+
+        if fts_available():
+            self.stdout.write(self.style.SUCCESS("✅ Index de recherche reconstruit"))
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    "⚠️  FTS5 indisponible: la recherche utilise des requêtes LIKE"
+                )
+            )
@@ -0,0 +1,55 @@
+"""
+Django Management Command pour régénérer les formes fléchies du vocabulaire.
+
+Les formes de chaque mot (pluriels, féminins, terminaisons verbales) sont
+générées par les règles de suffixes de sa langue (voir
+``authentication.inflection``) et régénérées à chaque modification du mot.
+Cette commande les régénère toutes, après un changement des règles ou des
+écritures qui contournent les signaux. Les formes irrégulières ajoutées par
+les éditeurs sont conservées.
+
+Usage:
+    python manage.py rebuild_word_forms
+    python manage.py rebuild_word_forms --batch-size 5000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.cache import WORDS, bump_generation
+from authentication.inflection import rebuild_all_word_forms
+from authentication.models import Word, WordForm
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Régénérer les formes fléchies de tous les mots"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Nombre de mots par lot (défaut: {DEFAULT_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size doit être positif")
+
+        self.stdout.write(self.style.SUCCESS("🔤 Génération des formes fléchies"))
+        started = time.monotonic()
+        generated = rebuild_all_word_forms(
+            Word, WordForm, batch_size=options["batch_size"]
+        )
+        bump_generation(WORDS)
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✅ {generated} forme(s) générée(s) pour"
+                f" {Word.objects.count()} mot(s) en {elapsed:.1f} s"
+            )
+        )
@@ -0,0 +1,141 @@
+"""
+Django Management Command qui régénère en continu les fragments exportés.
+
+Chaque modification d'un Article, ArticleWord, Word, WordTranslation ou
+WordDefinition (signaux post_save / post_delete) met en file d'attente les
+fragments concernés. Ce démon attend la fin d'une rafale de modifications
+(anti-rebond) puis régénère uniquement ces fragments et le manifest.
+
+Usage:
+    python manage.py run_sync_daemon
+    python manage.py run_sync_daemon --shards ../sync --debounce 2 --compress
+    python manage.py run_sync_daemon --once
+"""
+
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from authentication.export import DEFAULT_CHUNK_SIZE, export_shards
+from authentication.models import PendingShardExport
+
+
+class Command(BaseCommand):
+    help = "Régénérer automatiquement les fragments exportés après chaque modification"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--shards",
+            type=str,
+            default="../sync",
+            help="Dossier des fragments exportés (défaut: ../sync)",
+        )
+        parser.add_argument(
+            "--debounce",
+            type=float,
+            default=2.0,
+            help="Secondes sans nouvelle modification avant de régénérer (défaut: 2)",
+        )
+        parser.add_argument(
+            "--max-delay",
+            type=float,
+            default=30.0,
+            help="Délai maximal avant régénération pendant une longue rafale (défaut: 30)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=0.5,
+            help="Intervalle de lecture de la file d'attente en secondes (défaut: 0.5)",
+        )
+        parser.add_argument(
+            "--compress",
+            action="store_true",
+            help="Écrire aussi les variantes précompressées des fragments",
+        )
+        parser.add_argument(
+            "--vocab-format",
+            choices=["json", "columnar"],
+            default="json",
+            help="Format des fragments de vocabulaire (défaut: json)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Nombre de lignes lues par lot (défaut: {DEFAULT_CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Traiter la file d'attente actuelle sans anti-rebond puis s'arrêter",
+        )
+
+    def handle(self, *args, **options):
+        directory = self.get_output_path(options["shards"])
+
+        if options["once"]:
+            self.export_pending(directory, options)
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "👀 Démon de synchronisation démarré (Ctrl+C pour arrêter)"
+            )
+        )
+        self.stdout.write(f"   Fragments: {directory}")
+
+        try:
+            while True:
+                if self.is_ready(options):
+                    self.export_pending(directory, options)
+                time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("\n👋 Démon de synchronisation arrêté")
+
+    def get_output_path(self, output_dir):
+        """Résoudre le chemin de sortie relatif au dossier backend"""
+        return os.path.join(os.path.dirname(__file__), "..", "..", "..", output_dir)
+
+    def is_ready(self, options):
+        """La rafale de modifications est-elle terminée (ou dure-t-elle trop)?"""
+        window = PendingShardExport.objects.aggregate(
+            first=Min("queued_at"), last=Max("queued_at")
+        )
+        if window["last"] is None:
+            return False
+
+        now = timezone.now()
+        quiet = (now - window["last"]).total_seconds() >= options["debounce"]
+        overdue = (now - window["first"]).total_seconds() >= options["max_delay"]
+        return quiet or overdue
+
+    def export_pending(self, directory, options):
+        """Régénérer les fragments en attente et les retirer de la file"""
+        pending = dict(PendingShardExport.objects.values_list("shard_key", "queued_at"))
+        if not pending:
+            return
+
+        started = time.monotonic()
+        export_shards(
+            directory,
+            keys=sorted(pending),
+            chunk_size=options["chunk_size"],
+            compress=options["compress"],
+            vocab_format=options["vocab_format"],
+        )
+
+        # A shard modified again during the export keeps a newer queued_at
+        # and stays in the queue for the next round.
+        done = Q()
+        for key, queued_at in pending.items():
+            done |= Q(shard_key=key, queued_at=queued_at)
+        PendingShardExport.objects.filter(done).delete()
+
+        self.stdout.write(
+            f"🔄 {len(pending)} fragment(s) régénéré(s) en "
+            f"{time.monotonic() - started:.2f}s: {', '.join(sorted(pending))}"
+        )
@@ -4,13 +4,34 @@ Génère les données JSON nécessaires pour le localStorage.
 
 Usage:
     python manage.py sync_articles_to_frontend
+    python manage.py sync_articles_to_frontend --stream
+    python manage.py sync_articles_to_frontend --since <sync_token>
+    python manage.py sync_articles_to_frontend --shards ../sync
+    python manage.py sync_articles_to_frontend --shards ../sync --workers 5
+    python manage.py sync_articles_to_frontend --shards ../sync --vocab-format columnar
 """
 
 import json
 import os
 
-from django.core.management.base import BaseCommand
-
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.export import (
+    DEFAULT_CHUNK_SIZE,
+    JS_HEADER,
+    JS_MIDDLE,
+    MANIFEST_NAME,
+    StreamedDict,
+    compress_artifact,
+    delta_payload,
+    export_shards,
+    export_shards_parallel,
+    iter_json,
+    js_footer,
+    new_sync_token,
+    parse_sync_token,
+    write_streaming_export,
+)
 from authentication.models import Article, ArticleWord
 
 
@@ -24,6 +45,50 @@ class Command(BaseCommand):
             default="../frontend_articles_data.json",
             help="Fichier de sortie pour les données JSON (défaut: ../frontend_articles_data.json)",
         )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Export en flux: nombre de requêtes fixe et mémoire constante",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Nombre de lignes lues par lot en mode --stream (défaut: {DEFAULT_CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            help="Jeton de synchronisation: exporter uniquement les changements depuis ce jeton",
+        )
+        parser.add_argument(
+            "--delta-output",
+            type=str,
+            default="../frontend_articles_delta.json",
+            help="Fichier de sortie du delta (défaut: ../frontend_articles_delta.json)",
+        )
+        parser.add_argument(
+            "--shards",
+            type=str,
+            help="Dossier où écrire un fichier par (langue, niveau) et par vocabulaire, avec un manifest",
+        )
+        parser.add_argument(
+            "--compress",
+            action="store_true",
+            help="Écrire aussi les variantes précompressées (.gz, et .br si brotli est installé)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Nombre de processus pour exporter les langues en parallèle (avec --shards)",
+        )
+        parser.add_argument(
+            "--vocab-format",
+            choices=["json", "columnar"],
+            default="json",
+            help="Format des fragments de vocabulaire: objet JSON par mot ou colonnes compactes avec table de chaînes (avec --shards)",
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(
@@ -31,7 +96,28 @@ class Command(BaseCommand):
         )
         self.stdout.write("=" * 60)
 
+        if options["since"]:
+            self.handle_delta(options)
+            return
+
+        if options["workers"] < 1:
+            raise CommandError("--workers doit être au moins 1")
+        if options["workers"] > 1 and not options["shards"]:
+            raise CommandError("--workers nécessite --shards (un fragment par langue)")
+        if options["vocab_format"] != "json" and not options["shards"]:
+            raise CommandError("--vocab-format nécessite --shards")
+
+        if options["shards"]:
+            self.handle_shards(options)
+            return
+
+        if options["stream"]:
+            self.handle_stream(options)
+            return
+
         try:
+            sync_token = new_sync_token()
+
             # Récupérer tous les articles actifs
             articles = Article.objects.filter(is_active=True).order_by(
                 "-publication_date"
@@ -49,7 +135,9 @@ class Command(BaseCommand):
 
             for article in articles:
                 # Récupérer les mots-clés associés
-                article_words = ArticleWord.objects.filter(article=article)
+                article_words = ArticleWord.objects.filter(
+                    article=article, is_key_vocabulary=True
+                )
                 keywords = [aw.word.word for aw in article_words]
 
                 # Convertir au format frontend
@@ -87,15 +175,13 @@ class Command(BaseCommand):
                 "sync_timestamp": articles.first().created_at.isoformat()
                 if articles
                 else None,
+                "sync_token": sync_token,
                 "total_articles": len(frontend_articles),
                 "total_words": len(word_definitions),
             }
 
             # Sauvegarder les données JSON
-            output_file = options["output"]
-            output_path = os.path.join(
-                os.path.dirname(__file__), "..", "..", "..", output_file
-            )
+            output_path = self.get_output_path(options["output"])
 
             with open(output_path, "w", encoding="utf-8") as f:
                 json.dump(localStorage_data, f, ensure_ascii=False, indent=2)
@@ -107,6 +193,8 @@ class Command(BaseCommand):
             with open(js_path, "w", encoding="utf-8") as f:
                 f.write(js_script)
 
+            self.compress_outputs(options, output_path, js_path)
+
             self.stdout.write(self.style.SUCCESS(f"\n✅ Synchronisation terminée!"))
             self.stdout.write(f"   Articles synchronisés: {len(frontend_articles)}")
             self.stdout.write(f"   Données JSON: {output_path}")
@@ -124,6 +212,105 @@ class Command(BaseCommand):
             )
             raise
 
+    def get_output_path(self, output_file):
+        """Résoudre le chemin de sortie relatif au dossier backend"""
+        return os.path.join(os.path.dirname(__file__), "..", "..", "..", output_file)
+
+    def compress_outputs(self, options, *paths):
+        """Écrire les variantes .gz/.br des fichiers générés si --compress"""
+        if not options["compress"]:
+            return
+        for path in paths:
+            for variant in compress_artifact(path):
+                self.stdout.write(f"   🗜️  Variante compressée: {variant}")
+
+    def handle_stream(self, options):
+        """Exporter articles et mots en flux, sans charger le catalogue en mémoire"""
+        output_path = self.get_output_path(options["output"])
+        js_path = os.path.join(os.path.dirname(output_path), "sync_articles.js")
+
+        try:
+            with open(output_path, "w", encoding="utf-8") as json_file, open(
+                js_path, "w", encoding="utf-8"
+            ) as js_file:
+                stats = write_streaming_export(
+                    json_file, js_file, chunk_size=options["chunk_size"]
+                )
+            self.compress_outputs(options, output_path, js_path)
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f"❌ Erreur lors de la synchronisation: {e}")
+            )
+            raise
+
+        if not stats["articles"]:
+            self.stdout.write(
+                self.style.WARNING("⚠️  Aucun article actif trouvé en base de données")
+            )
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Synchronisation en flux terminée!"))
+        self.stdout.write(f"   Articles synchronisés: {stats['articles']}")
+        self.stdout.write(f"   Définitions synchronisées: {stats['words']}")
+        self.stdout.write(f"   Données JSON: {output_path}")
+        self.stdout.write(f"   Script JS: {js_path}")
+
+    def handle_shards(self, options):
+        """Exporter le catalogue en fragments par langue et niveau"""
+        directory = self.get_output_path(options["shards"])
+        if options["workers"] > 1:
+            self.stdout.write(
+                f"⚙️  Export parallèle: {options['workers']} processus, une langue chacun"
+            )
+            manifest = export_shards_parallel(
+                directory,
+                options["workers"],
+                chunk_size=options["chunk_size"],
+                compress=options["compress"],
+                vocab_format=options["vocab_format"],
+            )
+        else:
+            manifest = export_shards(
+                directory,
+                chunk_size=options["chunk_size"],
+                compress=options["compress"],
+                vocab_format=options["vocab_format"],
+            )
+
+        for key, entry in manifest["shards"].items():
+            self.stdout.write(
+                f"   📦 {key}: {entry['count']} élément(s), {entry['bytes']} octets"
+                f" ({entry['sha256'][:12]})"
+            )
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Fragments générés!"))
+        self.stdout.write(f"   Fragments: {len(manifest['shards'])}")
+        self.stdout.write(f"   Manifest: {os.path.join(directory, MANIFEST_NAME)}")
+
+    def handle_delta(self, options):
+        """Exporter uniquement les lignes modifiées ou supprimées depuis un jeton"""
+        try:
+            since = parse_sync_token(options["since"])
+        except ValueError as e:
+            raise CommandError(f"Jeton de synchronisation invalide: {e}")
+
+        output_path = self.get_output_path(options["delta_output"])
+        stats = {}
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            for chunk in iter_json(
+                StreamedDict(delta_payload(since, stats, options["chunk_size"])),
+                indent=2,
+            ):
+                f.write(chunk)
+        self.compress_outputs(options, output_path)
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Delta de synchronisation généré!"))
+        self.stdout.write(f"   Depuis: {since.isoformat()}")
+        self.stdout.write(f"   Articles modifiés: {stats.get('articles', 0)}")
+        self.stdout.write(f"   Définitions modifiées: {stats.get('words', 0)}")
+        self.stdout.write(f"   Nouveau jeton: {stats['sync_token']}")
+        self.stdout.write(f"   Données JSON: {output_path}")
+
     def sync_word_definitions(self):
         """Synchroniser les définitions des mots vers le format frontend"""
         from authentication.models import Word, WordDefinition, WordTranslation
@@ -172,42 +359,16 @@ class Command(BaseCommand):
 
     def generate_js_initialization_script(self, data):
         """Générer le script JavaScript pour initialiser le localStorage"""
-        script = f"""// Script de synchronisation des articles Django vers frontend
-// Généré automatiquement - NE PAS MODIFIER MANUELLEMENT
-
-console.log("🔄 Synchronisation des articles depuis Django...");
-
-// Données des articles depuis Django
-const articlesData = {json.dumps(data["linguaromana_custom_articles"], ensure_ascii=False, indent=2)};
-
-// Données des définitions de mots depuis Django
-const wordsData = {json.dumps(data["linguaromana_custom_words"], ensure_ascii=False, indent=2)};
-
-// Nettoyer les anciennes données
-localStorage.removeItem('linguaromana_custom_articles');
-localStorage.removeItem('linguaromana_custom_words');
-
-// Charger les nouvelles données
-localStorage.setItem('linguaromana_custom_articles', JSON.stringify(articlesData));
-localStorage.setItem('linguaromana_custom_words', JSON.stringify(wordsData));
-
-console.log(`✅ {{articlesData.length}} article(s) synchronisé(s)`);
-console.log(`✅ {{Object.keys(wordsData).length}} définition(s) de mots synchronisée(s)`);
-
-console.log("📊 Statistiques articles:");
-articlesData.forEach((article, index) => {{
-    console.log(`   {{index + 1}}. {{article.title}} ({{article.language}}, {{article.level}})`);
-}});
-
-console.log("🔤 Définitions de mots:");
-Object.keys(wordsData).forEach((word, index) => {{
-    console.log(`   {{index + 1}}. {{word}} ({{wordsData[word].primary_language}}, {{wordsData[word].difficulty_level}})`);
-}});
-
-console.log("\\n🔄 Rechargement de la page...");
-// Recharger automatiquement pour appliquer les changements
-setTimeout(() => {{
-    window.location.reload();
-}}, 1000);
-"""
-        return script
+        articles_json = json.dumps(
+            data["linguaromana_custom_articles"], ensure_ascii=False, indent=2
+        )
+        words_json = json.dumps(
+            data["linguaromana_custom_words"], ensure_ascii=False, indent=2
+        )
+        return (
+            JS_HEADER
+            + articles_json
+            + JS_MIDDLE
+            + words_json
+            + js_footer(data["sync_token"])
+        )
@@ -0,0 +1,73 @@
+"""
+Django Management Command pour lister les mots les plus fréquents des
+articles d'une langue.
+
+Les textes sont découpés par le tokenizer des langues romanes: "l'aide"
+compte pour "aide" et "dárselo" pour "dár" ("hablarle" compte pour
+"hablar" si le verbe "hablar" est dans le vocabulaire). Avec ``--unknown``, seuls les
+mots qui ne sont la forme d'aucun mot de la table ``Word`` sont listés, pour
+choisir le vocabulaire à ajouter.
+
+Usage:
+    python manage.py word_frequencies es
+    python manage.py word_frequencies fr --unknown --limit 100
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.export import LANGUAGES
+from authentication.models import Article, Word, WordForm
+from authentication.text import fold, parse_markup
+from authentication.tokenizer import word_frequencies
+
+DEFAULT_LIMIT = 30
+
+
+class Command(BaseCommand):
+    help = "Lister les mots les plus fréquents des articles d'une langue"
+
+    def add_arguments(self, parser):
+        parser.add_argument("language", choices=LANGUAGES, help="Langue des articles")
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=DEFAULT_LIMIT,
+            help=f"Nombre de mots affichés (défaut: {DEFAULT_LIMIT})",
+        )
+        parser.add_argument(
+            "--unknown",
+            action="store_true",
+            help="Ignorer les mots déjà présents dans le vocabulaire",
+        )
+
+    def handle(self, *args, **options):
+        if options["limit"] < 1:
+            raise CommandError("--limit doit être positif")
+
+        language = options["language"]
+        contents = (
+            Article.objects.filter(language=language)
+            .values_list("content", flat=True)
+            .iterator()
+        )
+        # The verbs of the language: the infinitives carrying clitics
+        verbs = set(
+            Word.objects.filter(primary_language=language, is_verb=True).values_list(
+                "word_key", flat=True
+            )
+        )
+        counts = word_frequencies(
+            (parse_markup(content).text for content in contents),
+            language,
+            lambda host: fold(host) in verbs,
+        )
+        if options["unknown"]:
+            known = set(WordForm.objects.values_list("form_key", flat=True))
+            counts = {word: n for word, n in counts.items() if fold(word) not in known}
+
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        self.stdout.write(
+            self.style.SUCCESS(f"📊 {len(counts)} mot(s) distinct(s) en {language}")
+        )
+        for word, count in ranked[: options["limit"]]:
+            self.stdout.write(f"   {count:>6}  {word}")
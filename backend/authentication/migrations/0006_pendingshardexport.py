@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_sync_watermarks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingShardExport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard_key', models.CharField(max_length=50, unique=True)),
+                ('queued_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['queued_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:53
+
+import re
+from bisect import bisect_right
+
+from django.db import migrations, models
+
+# Frozen copy of the text helpers of this migration: later changes to
+# authentication.text must not change what it does
+
+SENTENCE_BOUNDARY_RE = re.compile(r"""[.!?…]+[»"'”’)\]]*(?=\s)|\n""")
+
+
+def sentence_spans(text):
+    spans = []
+    start = 0
+    for match in SENTENCE_BOUNDARY_RE.finditer(text):
+        _append_span(spans, text, start, match.end())
+        start = match.end()
+    _append_span(spans, text, start, len(text))
+    return spans
+
+
+def _append_span(spans, text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append([start, end])
+
+
+def sentence_index_at(spans, position):
+    index = bisect_right(spans, [position, float('inf')]) - 1
+    if index < 0:
+        return 0 if spans else None
+    return index
+
+
+def segment_articles(apps, schema_editor):
+    Article = apps.get_model('authentication', 'Article')
+    ArticleWord = apps.get_model('authentication', 'ArticleWord')
+    for article in Article.objects.iterator():
+        article.sentence_offsets = sentence_spans(article.content)
+        article.save(update_fields=['sentence_offsets'])
+        article_words = list(ArticleWord.objects.filter(article=article))
+        for article_word in article_words:
+            article_word.sentence_index = sentence_index_at(
+                article.sentence_offsets, article_word.position_in_text
+            )
+        ArticleWord.objects.bulk_update(article_words, ['sentence_index'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_pendingshardexport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='sentence_offsets',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='[start, end] character offsets of each sentence of the content'),
+        ),
+        migrations.AddField(
+            model_name='articleword',
+            name='sentence_index',
+            field=models.PositiveIntegerField(blank=True, help_text='Index of the sentence where this word appears (see Article.sentence_offsets)', null=True),
+        ),
+        migrations.RunPython(segment_articles, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='articleword',
+            name='context_sentence',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_article_sentence_offsets'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-publication_date', '-id'], name='article_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['language', '-publication_date', '-id'], name='article_language_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:05
+
+from django.db import DatabaseError, migrations
+
+# Frozen copy of the full-text index of this migration: later changes to
+# authentication.search must not change what it does
+
+FTS_TABLE = 'authentication_article_fts'
+
+ARTICLE_TABLE = 'authentication_article'
+
+
+def fts_schema(columns):
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {names},
+            content='{ARTICLE_TABLE}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+        AFTER INSERT ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {names})
+            VALUES (new.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+        AFTER DELETE ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF {names} ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+            INSERT INTO {FTS_TABLE}(rowid, {names})
+            VALUES (new.id, {new});
+        END
+        """,
+    ]
+
+
+def install_article_fts(schema_editor, columns):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        for statement in fts_schema(columns):
+            schema_editor.execute(statement)
+    except DatabaseError:
+        # SQLite built without FTS5: searches use the fallback
+        return
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_article_fts(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for suffix in ('insert', 'delete', 'update'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def install(apps, schema_editor):
+    install_article_fts(schema_editor, ['title', 'content'])
+
+
+def uninstall(apps, schema_editor):
+    uninstall_article_fts(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_article_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
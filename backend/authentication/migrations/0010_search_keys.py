@@ -0,0 +1,143 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:05
+
+import re
+import unicodedata
+
+from django.db import DatabaseError, migrations, models
+
+# Frozen copy of the helpers of this migration: later changes to
+# authentication.text and authentication.search must not change what it does
+
+GEMINATED_L_RE = re.compile('l[\u00b7\u0387\u2027\u2219\u22c5\u30fb]l')
+
+APOSTROPHES_RE = re.compile('[\u2018\u2019\u02bc`]')
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+SEARCH_KEYS = [
+    ('Article', 'title', 'title_key'),
+    ('Word', 'word', 'word_key'),
+    ('WordTranslation', 'translation', 'translation_key'),
+]
+
+
+def search_key(text):
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    folded = GEMINATED_L_RE.sub('ll', stripped.casefold())
+    folded = APOSTROPHES_RE.sub("'", folded)
+    return WHITESPACE_RE.sub(' ', folded).strip()[:200]
+
+
+def backfill_search_keys(model, source, key, batch_size=1000):
+    stale = []
+    rows = model.objects.only('pk', source, key).order_by('pk')
+    for row in rows.iterator(chunk_size=batch_size):
+        value = search_key(getattr(row, source))
+        if getattr(row, key) != value:
+            setattr(row, key, value)
+            stale.append(row)
+        if len(stale) >= batch_size:
+            model.objects.bulk_update(stale, [key])
+            stale = []
+    model.objects.bulk_update(stale, [key])
+
+
+FTS_TABLE = 'authentication_article_fts'
+
+ARTICLE_TABLE = 'authentication_article'
+
+
+def fts_schema(columns):
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {names},
+            content='{ARTICLE_TABLE}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+        AFTER INSERT ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {names})
+            VALUES (new.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+        AFTER DELETE ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF {names} ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+            INSERT INTO {FTS_TABLE}(rowid, {names})
+            VALUES (new.id, {new});
+        END
+        """,
+    ]
+
+
+def install_article_fts(schema_editor, columns):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        for statement in fts_schema(columns):
+            schema_editor.execute(statement)
+    except DatabaseError:
+        # SQLite built without FTS5: searches use the fallback
+        return
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_article_fts(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for suffix in ('insert', 'delete', 'update'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def fill_search_keys(apps, schema_editor):
+    for model_name, source, key in SEARCH_KEYS:
+        backfill_search_keys(apps.get_model('authentication', model_name), source, key)
+
+
+def reinstall_article_fts(apps, schema_editor):
+    # Adding title_key rebuilt the article table, which dropped its triggers
+    install_article_fts(schema_editor, ['title', 'content'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0009_article_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='title_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Accent- and case-insensitive search key of title', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='word_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Accent- and case-insensitive search key of word', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='wordtranslation',
+            name='translation_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Accent- and case-insensitive search key of translation', max_length=200),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+        migrations.RunPython(reinstall_article_fts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def latest_article_summary(article):
+    # Frozen copy of the summary of this migration. Sentence offsets are
+    # still in raw content coordinates here (see 0007); 0013 recomputes the
+    # excerpt from the clean text.
+    summary = {
+        'id': article.id,
+        'title': article.title,
+        'language': article.language,
+        'level': article.level,
+        'date': article.publication_date.isoformat(),
+        'summary': f'Article {article.level} en {article.language}',
+    }
+    if article.sentence_offsets:
+        start, end = article.sentence_offsets[0]
+        summary['excerpt'] = article.content[start:end]
+    else:
+        summary['excerpt'] = ''
+    return summary
+
+
+def fill_latest_articles(apps, schema_editor):
+    Article = apps.get_model('authentication', 'Article')
+    LatestArticle = apps.get_model('authentication', 'LatestArticle')
+    languages = Article.objects.order_by().values_list('language', flat=True).distinct()
+    for language in list(languages):
+        article = (
+            Article.objects.filter(is_active=True, language=language)
+            .order_by('-publication_date', '-id')
+            .first()
+        )
+        if article is not None:
+            LatestArticle.objects.create(
+                language=language, article=article, summary=latest_article_summary(article)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0010_search_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestArticle',
+            fields=[
+                ('language', models.CharField(max_length=5, primary_key=True, serialize=False)),
+                ('summary', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='authentication.article')),
+            ],
+            options={
+                'ordering': ['language'],
+            },
+        ),
+        migrations.RunPython(fill_latest_articles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:17
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def fill_archive_months(apps, schema_editor):
+    # Frozen copy of archive.rebuild_archive_months
+    Article = apps.get_model('authentication', 'Article')
+    ArchiveMonth = apps.get_model('authentication', 'ArchiveMonth')
+    rows = (
+        Article.objects.order_by()
+        .values(
+            'language',
+            'level',
+            year=ExtractYear('publication_date'),
+            month=ExtractMonth('publication_date'),
+        )
+        .annotate(
+            article_count=Count('id'),
+            active_count=Count('id', filter=Q(is_active=True)),
+        )
+    )
+    ArchiveMonth.objects.all().delete()
+    ArchiveMonth.objects.bulk_create(ArchiveMonth(**row) for row in rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0011_latestarticle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=5)),
+                ('level', models.CharField(max_length=20)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('article_count', models.IntegerField(default=0)),
+                ('active_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-year', '-month', 'language', 'level'],
+                'constraints': [models.UniqueConstraint(fields=('language', 'level', 'year', 'month'), name='archive_month_unique')],
+            },
+        ),
+        migrations.RunPython(fill_archive_months, migrations.RunPython.noop),
+    ]
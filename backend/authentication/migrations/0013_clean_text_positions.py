@@ -0,0 +1,142 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:30
+
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+from django.db import migrations, models
+
+# Frozen copy of the text helpers of this migration: later changes to
+# authentication.text must not change what it does
+
+SENTENCE_BOUNDARY_RE = re.compile(r"""[.!?…]+[»"'”’)\]]*(?=\s)|\n""")
+
+MARKUP_RE = re.compile(r'\[([^\[\]\s](?:[^\[\]\n]{0,98}[^\[\]\s])?)\]')
+
+MarkupSpan = namedtuple('MarkupSpan', 'start end surface')
+
+Markup = namedtuple('Markup', 'text spans sentences')
+
+
+def parse_markup(content):
+    pieces = []
+    spans = []
+    copied = 0
+    for match in MARKUP_RE.finditer(content):
+        pieces.append(content[copied : match.start()])
+        # Two brackets were dropped for each previous span
+        start = match.start() - 2 * len(spans)
+        surface = match.group(1)
+        spans.append(MarkupSpan(start, start + len(surface), surface))
+        pieces.append(surface)
+        copied = match.end()
+    pieces.append(content[copied:])
+    text = ''.join(pieces)
+    return Markup(text, spans, sentence_spans(text))
+
+
+def sentence_spans(text):
+    spans = []
+    start = 0
+    for match in SENTENCE_BOUNDARY_RE.finditer(text):
+        _append_span(spans, text, start, match.end())
+        start = match.end()
+    _append_span(spans, text, start, len(text))
+    return spans
+
+
+def _append_span(spans, text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append([start, end])
+
+
+def sentence_index_at(spans, position):
+    index = bisect_right(spans, [position, float('inf')]) - 1
+    if index < 0:
+        return 0 if spans else None
+    return index
+
+
+def to_clean_position(matches, position):
+    # Markup brackets before a position in the raw content
+    for match in matches:
+        if match.end() <= position:
+            position -= 2
+        elif match.start() < position:
+            position -= 1
+    return position
+
+
+def to_raw_position(spans, position):
+    shift = 0
+    for span in spans:
+        if span.end <= position:
+            shift += 2
+        elif span.start < position:
+            shift += 1
+    return position + shift
+
+
+def convert_articles(apps, to_clean):
+    Article = apps.get_model('authentication', 'Article')
+    ArticleWord = apps.get_model('authentication', 'ArticleWord')
+    for article in Article.objects.iterator():
+        if to_clean:
+            matches = list(MARKUP_RE.finditer(article.content))
+            article.sentence_offsets = parse_markup(article.content).sentences
+            convert = lambda position: to_clean_position(matches, position)
+        else:
+            spans = parse_markup(article.content).spans
+            article.sentence_offsets = sentence_spans(article.content)
+            convert = lambda position: to_raw_position(spans, position)
+        article.save(update_fields=['sentence_offsets'])
+
+        article_words = list(ArticleWord.objects.filter(article=article))
+        for article_word in article_words:
+            article_word.position_in_text = convert(article_word.position_in_text)
+            article_word.sentence_index = sentence_index_at(
+                article.sentence_offsets, article_word.position_in_text
+            )
+        ArticleWord.objects.bulk_update(article_words, ['position_in_text', 'sentence_index'])
+
+
+def positions_to_clean_text(apps, schema_editor):
+    convert_articles(apps, to_clean=True)
+
+    # Home page excerpts were sliced from the raw content
+    LatestArticle = apps.get_model('authentication', 'LatestArticle')
+    for latest in LatestArticle.objects.select_related('article'):
+        markup = parse_markup(latest.article.content)
+        if markup.sentences:
+            start, end = markup.sentences[0]
+            latest.summary['excerpt'] = markup.text[start:end]
+            latest.save(update_fields=['summary'])
+
+
+def positions_to_raw_content(apps, schema_editor):
+    convert_articles(apps, to_clean=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0012_archivemonth'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='sentence_offsets',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='[start, end] offsets of each sentence of the content without its [word] markup'),
+        ),
+        migrations.AlterField(
+            model_name='articleword',
+            name='position_in_text',
+            field=models.PositiveIntegerField(help_text='Character position where word appears in the article text without its [word] markup'),
+        ),
+        migrations.RunPython(positions_to_clean_text, positions_to_raw_content),
+    ]
@@ -0,0 +1,198 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:40
+
+import re
+from collections import namedtuple
+
+from django.db import DatabaseError, migrations, models
+
+# Frozen copy of the text helpers of this migration: later changes to
+# authentication.text must not change what it does
+
+SENTENCE_BOUNDARY_RE = re.compile(r"""[.!?…]+[»"'”’)\]]*(?=\s)|\n""")
+
+MARKUP_RE = re.compile(r'\[([^\[\]\s](?:[^\[\]\n]{0,98}[^\[\]\s])?)\]')
+
+MarkupSpan = namedtuple('MarkupSpan', 'start end surface')
+
+Markup = namedtuple('Markup', 'text spans sentences')
+
+
+def parse_markup(content):
+    pieces = []
+    spans = []
+    copied = 0
+    for match in MARKUP_RE.finditer(content):
+        pieces.append(content[copied : match.start()])
+        # Two brackets were dropped for each previous span
+        start = match.start() - 2 * len(spans)
+        surface = match.group(1)
+        spans.append(MarkupSpan(start, start + len(surface), surface))
+        pieces.append(surface)
+        copied = match.end()
+    pieces.append(content[copied:])
+    text = ''.join(pieces)
+    return Markup(text, spans, sentence_spans(text))
+
+
+def sentence_spans(text):
+    spans = []
+    start = 0
+    for match in SENTENCE_BOUNDARY_RE.finditer(text):
+        _append_span(spans, text, start, match.end())
+        start = match.end()
+    _append_span(spans, text, start, len(text))
+    return spans
+
+
+def _append_span(spans, text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append([start, end])
+
+# Frozen copy of the Spanish part of tokenizer.index_terms: only Spanish
+# clitics are glued to their word without an apostrophe or a hyphen, which
+# FTS5 splits on by itself. Unaccented infinitives ("hablarle") are not
+# split without a dictionary.
+
+LETTER = r'[^\W\d_]'
+
+WORD = r'[^\W_](?:[^\W_]|·(?=[^\W_]))*'
+
+END = r'(?![\w·])'
+
+SPANISH_CLITIC = '(?:les|los|las|nos|me|te|se|le|lo|la|os)'
+
+SPANISH_RE = re.compile(
+    rf'(?<={LETTER})(?P<clitic>{SPANISH_CLITIC})(?={SPANISH_CLITIC}{{0,2}}{END})'
+    rf'|(?P<host>dar|ver|ser|ir|{LETTER}+?(?:ár|ér|ír)|{LETTER}+?(?:ándo|iéndo|yéndo))'
+    rf'(?={SPANISH_CLITIC}{{1,3}}{END})'
+    rf'|(?P<word>{WORD})',
+    re.IGNORECASE,
+)
+
+
+def index_terms(text, language):
+    if language != 'es':
+        return ''
+    parts = []
+    previous = None
+    for match in SPANISH_RE.finditer(text):
+        token = match.span(match.lastgroup)
+        start = token[0]
+        if (
+            previous is not None
+            and previous[1] == start
+            and text[start - 1].isalnum()
+            and text[start].isalnum()
+        ):
+            if not parts or parts[-1] is not previous:
+                parts.append(previous)
+            parts.append(token)
+        previous = token
+    return ' '.join(text[start:end] for start, end in parts)
+
+# Frozen copy of the full-text index of this migration
+
+FTS_TABLE = 'authentication_article_fts'
+
+ARTICLE_TABLE = 'authentication_article'
+
+
+def fts_schema(columns):
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {names},
+            content='{ARTICLE_TABLE}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+        AFTER INSERT ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {names})
+            VALUES (new.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+        AFTER DELETE ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF {names} ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+            INSERT INTO {FTS_TABLE}(rowid, {names})
+            VALUES (new.id, {new});
+        END
+        """,
+    ]
+
+
+def install_article_fts(schema_editor, columns):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        for statement in fts_schema(columns):
+            schema_editor.execute(statement)
+    except DatabaseError:
+        # SQLite built without FTS5: searches use the fallback
+        return
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_article_fts(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for suffix in ('insert', 'delete', 'update'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def fill_search_terms(apps, schema_editor):
+    Article = apps.get_model('authentication', 'Article')
+    articles = list(Article.objects.only('content', 'language'))
+    for article in articles:
+        article.search_terms = index_terms(parse_markup(article.content).text, article.language)
+    Article.objects.bulk_update(articles, ['search_terms'], batch_size=500)
+
+
+def install(apps, schema_editor):
+    install_article_fts(schema_editor, ['title', 'content', 'search_terms'])
+
+
+def uninstall(apps, schema_editor):
+    uninstall_article_fts(schema_editor)
+
+
+def reinstall_previous(apps, schema_editor):
+    install_article_fts(schema_editor, ['title', 'content'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0013_clean_text_positions'),
+    ]
+
+    operations = [
+        # The index and its triggers are recreated with the new column
+        migrations.RunPython(uninstall, reinstall_previous),
+        migrations.AddField(
+            model_name='article',
+            name='search_terms',
+            field=models.TextField(blank=True, editable=False, help_text='Parts of the glued words of the content (clitics), for the full-text index'),
+        ),
+        migrations.RunPython(fill_search_terms, migrations.RunPython.noop),
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,214 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:45
+
+import django.db.models.deletion
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Frozen copy of the inflection rules and text helpers of this migration:
+# later changes to authentication.inflection and authentication.text must
+# not change what it does
+
+GEMINATED_L_RE = re.compile('l[\u00b7\u0387\u2027\u2219\u22c5\u30fb]l')
+
+APOSTROPHES_RE = re.compile('[\u2018\u2019\u02bc`]')
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+MIN_STEM_LENGTH = 2
+
+# fmt: off
+SUFFIX_RULES = {
+    'es': [
+        {
+            'o': ['a', 'os', 'as'],
+            'a': ['as'],
+            'e': ['es'],
+            'ón': ['ones'],
+            'és': ['esa', 'eses', 'esas'],
+            'z': ['ces'],
+            'l': ['les'],
+            'n': ['nes'],
+            'r': ['res'],
+            'd': ['des'],
+        },
+        {
+            'ar': ['o', 'as', 'a', 'amos', 'áis', 'an', 'é', 'aste', 'ó', 'aron',
+                   'aba', 'aban', 'ado', 'ada', 'ados', 'adas', 'ando', 'ará',
+                   'arán', 'aría', 'e', 'en'],
+            'er': ['o', 'es', 'e', 'emos', 'éis', 'en', 'í', 'ió', 'ieron', 'ía',
+                   'ían', 'ido', 'ida', 'idos', 'idas', 'iendo', 'erá', 'erán',
+                   'ería', 'a', 'an'],
+            'ir': ['o', 'es', 'e', 'imos', 'ís', 'en', 'í', 'ió', 'ieron', 'ía',
+                   'ían', 'ido', 'ida', 'idos', 'idas', 'iendo', 'irá', 'irán',
+                   'iría', 'a', 'an'],
+        },
+    ],
+    'it': [
+        {
+            'o': ['i', 'a', 'e'],
+            'io': ['i'],
+            'co': ['chi', 'ca', 'che'],
+            'go': ['ghi', 'ga', 'ghe'],
+            'a': ['e'],
+            'ca': ['che'],
+            'ga': ['ghe'],
+            'e': ['i'],
+        },
+        {
+            'are': ['o', 'i', 'a', 'iamo', 'ate', 'ano', 'ato', 'ata', 'ati',
+                    'ando', 'ava', 'avano', 'ai', 'ò', 'arono', 'erà',
+                    'eranno'],
+            'ere': ['o', 'i', 'e', 'iamo', 'ete', 'ono', 'uto', 'uta', 'uti',
+                    'ute', 'endo', 'eva', 'evano', 'erà', 'eranno'],
+            'ire': ['o', 'i', 'e', 'iamo', 'ite', 'ono', 'ito', 'ita', 'iti',
+                    'endo', 'iva', 'ivano', 'irà', 'iranno', 'isco', 'isce',
+                    'iscono'],
+        },
+    ],
+    'pt': [
+        {
+            'o': ['a', 'os', 'as'],
+            'a': ['as'],
+            'e': ['es'],
+            'ão': ['ões', 'ãos'],
+            'm': ['ns'],
+            'al': ['ais'],
+            'el': ['éis'],
+            'ol': ['óis'],
+            'r': ['res'],
+            'z': ['zes'],
+        },
+        {
+            'ar': ['o', 'as', 'a', 'amos', 'am', 'ei', 'ou', 'aram', 'ava',
+                   'avam', 'ado', 'ada', 'ados', 'adas', 'ando', 'ará',
+                   'arão'],
+            'er': ['o', 'es', 'e', 'emos', 'em', 'i', 'eu', 'eram', 'ia', 'iam',
+                   'ido', 'ida', 'idos', 'idas', 'endo', 'erá', 'erão'],
+            'ir': ['o', 'es', 'e', 'imos', 'em', 'i', 'iu', 'iram', 'ia', 'iam',
+                   'ido', 'ida', 'idos', 'idas', 'indo', 'irá', 'irão'],
+        },
+    ],
+    'fr': [
+        {
+            '': ['s', 'e', 'es'],
+            'e': ['es'],
+            's': [],
+            'x': [],
+            'z': [],
+            'al': ['aux', 'ale', 'ales'],
+            'au': ['aux'],
+            'eau': ['eaux'],
+            'eu': ['eux'],
+            'eux': ['euse', 'euses'],
+            'if': ['ifs', 'ive', 'ives'],
+            'er': ['ers', 'ère', 'ères'],
+            'ir': ['irs'],
+            're': ['res'],
+        },
+        {
+            'er': ['e', 'es', 'ons', 'ez', 'ent', 'é', 'ée', 'és', 'ées', 'ais',
+                   'ait', 'aient', 'ant', 'era', 'eront', 'a', 'èrent'],
+            'ir': ['is', 'it', 'issons', 'issez', 'issent', 'i', 'ie', 'ies',
+                   'issait', 'issant', 'ira', 'iront'],
+            're': ['s', '', 'ons', 'ez', 'ent', 'u', 'ue', 'us', 'ues', 'ait',
+                   'ant', 'ra', 'ront'],
+        },
+    ],
+    'ca': [
+        {
+            '': ['s', 'a', 'es'],
+            'a': ['es'],
+            'ca': ['ques'],
+            'ga': ['gues'],
+            'ça': ['ces'],
+            'ja': ['ges'],
+            'gua': ['gües'],
+            'e': ['es'],
+            'ó': ['ons'],
+            'r': ['rs'],
+            're': ['res'],
+            's': [],
+        },
+        {
+            'ar': ['o', 'es', 'a', 'em', 'eu', 'en', 'at', 'ada', 'ats', 'ades',
+                   'ant', 'ava', 'aven', 'arà', 'aran'],
+            're': ['o', 's', '', 'em', 'eu', 'en', 'ut', 'uda', 'uts', 'udes',
+                   'ent', 'ia', 'ien', 'rà', 'ran'],
+            'ir': ['eixo', 'eixes', 'eix', 'im', 'iu', 'eixen', 'it', 'ida',
+                   'its', 'ides', 'int', 'ia', 'ien', 'irà', 'iran'],
+        },
+    ],
+}
+# fmt: on
+
+
+def search_key(text):
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    folded = GEMINATED_L_RE.sub('ll', stripped.casefold())
+    folded = APOSTROPHES_RE.sub("'", folded)
+    return WHITESPACE_RE.sub(' ', folded).strip()[:200]
+
+
+def inflect(word, language):
+    forms = set()
+    for group in SUFFIX_RULES.get(language, ()):
+        for length in range(len(word), -1, -1):
+            ending = word[len(word) - length :]
+            if ending in group:
+                stem = word[: len(word) - length]
+                if len(stem) >= MIN_STEM_LENGTH:
+                    forms.update(stem + suffix for suffix in group[ending])
+                break
+    forms.discard(word)
+    return sorted(form for form in forms if form)
+
+
+def fill_word_forms(apps, schema_editor):
+    Word = apps.get_model('authentication', 'Word')
+    WordForm = apps.get_model('authentication', 'WordForm')
+    words = Word.objects.order_by('pk').values_list('pk', 'word', 'primary_language')
+    last_pk = 0
+    while batch := list(words.filter(pk__gt=last_pk)[:1000]):
+        WordForm.objects.bulk_create(
+            [
+                WordForm(
+                    word_id=word_id,
+                    form=form,
+                    form_key=search_key(form),
+                    is_generated=True,
+                )
+                for word_id, text, language in batch
+                for form in [text, *inflect(text, language)]
+            ],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0014_article_search_terms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordForm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('form', models.CharField(max_length=100)),
+                ('form_key', models.CharField(blank=True, db_index=True, editable=False, help_text='Accent- and case-insensitive search key of form', max_length=200)),
+                ('is_generated', models.BooleanField(default=False, help_text='Generated from the suffix rules of the word language, rebuilt when the word changes')),
+                ('word', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='forms', to='authentication.word')),
+            ],
+            options={
+                'ordering': ['form'],
+                'constraints': [models.UniqueConstraint(fields=('word', 'form'), name='word_form_unique')],
+            },
+        ),
+        migrations.RunPython(fill_word_forms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0015_wordform'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wordtranslation',
+            index=models.Index(fields=['language', 'translation_key'], name='translation_lookup_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0016_translation_lookup_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='is_verb',
+            field=models.BooleanField(default=False, help_text='Infinitive: Spanish clitics glued to it are split off (hablarle)'),
+        ),
+    ]
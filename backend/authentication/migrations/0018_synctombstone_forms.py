@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0017_word_is_verb'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='synctombstone',
+            name='kind',
+            field=models.CharField(choices=[('article', 'Article'), ('word', 'Word'), ('forms', 'Forms of every word rebuilt')], max_length=20),
+        ),
+    ]
@@ -1,6 +1,36 @@
 from django.contrib.auth.models import User
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils.functional import cached_property
+
+from .text import fold, parse_markup, sentence_index_at
+from .tokenizer import clitic_hosts, index_terms
+
+# Stay well below the SQLite limit on query parameters
+LOOKUP_CHUNK_SIZE = 500
+
+
+def search_key_field(source):
+    """Indexed shadow column holding the folded value of ``source``"""
+    return models.CharField(
+        max_length=200,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text=f"Accent- and case-insensitive search key of {source}",
+    )
+
+
+def search_key(value):
+    return fold(value)[:200]
+
+
+def with_search_keys(update_fields, keys):
+    """Add the search keys of updated source fields to ``update_fields``"""
+    if update_fields is None:
+        return None
+    update_fields = set(update_fields)
+    return update_fields | {key for source, key in keys if source in update_fields}
 
 
 class UserProfile(models.Model):
@@ -37,6 +67,7 @@ class Article(models.Model):
     """Model for news articles used in language learning"""
 
     title = models.CharField(max_length=200)
+    title_key = search_key_field("title")
     content = models.TextField()
     language = models.CharField(
         max_length=5,
@@ -59,13 +90,83 @@ class Article(models.Model):
     )
     publication_date = models.DateField()
     is_active = models.BooleanField(default=True)
+    sentence_offsets = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="[start, end] offsets of each sentence of the content without its [word] markup",
+    )
+    search_terms = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Parts of the glued words of the content (clitics), for the full-text index",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.title} ({self.language})"
 
+    def save(self, *args, **kwargs):
+        self.update_derived_fields()
+        kwargs["update_fields"] = with_search_keys(
+            kwargs.get("update_fields"),
+            [
+                ("content", "sentence_offsets"),
+                ("content", "search_terms"),
+                ("language", "search_terms"),
+                ("title", "title_key"),
+            ],
+        )
+        super().save(*args, **kwargs)
+
+    def update_derived_fields(self, is_host=None):
+        """
+        Compute the columns derived from the title and content. Called by
+        ``save()``; ``bulk_create`` callers must call it themselves, with
+        the ``clitic_host_checker`` of their articles to save queries.
+        """
+        self.__dict__.pop("markup", None)
+        # Segment once per save; word occurrences only store a sentence index
+        self.sentence_offsets = self.markup.sentences
+        if is_host is None:
+            is_host = clitic_host_checker([self.plain_text], self.language)
+        self.search_terms = index_terms(self.plain_text, self.language, is_host)
+        self.title_key = search_key(self.title)
+
+    @cached_property
+    def markup(self):
+        """The parsed ``[word]`` markup of the content (see ``parse_markup``)"""
+        return parse_markup(self.content)
+
+    @property
+    def plain_text(self):
+        """The content without its ``[word]`` markup"""
+        return self.markup.text
+
+    def sentence(self, index):
+        """Text of the sentence at ``index``, or an empty string"""
+        if index is None or not 0 <= index < len(self.sentence_offsets):
+            return ""
+        start, end = self.sentence_offsets[index]
+        return self.plain_text[start:end]
+
     class Meta:
         ordering = ["-publication_date"]
+        indexes = [
+            # Keyset pagination of the published article list, with and
+            # without a language filter
+            models.Index(
+                fields=["-publication_date", "-id"],
+                condition=models.Q(is_active=True),
+                name="article_keyset_idx",
+            ),
+            models.Index(
+                fields=["language", "-publication_date", "-id"],
+                condition=models.Q(is_active=True),
+                name="article_language_keyset_idx",
+            ),
+        ]
 
 
 class QuizQuestion(models.Model):
@@ -165,6 +266,7 @@ class Word(models.Model):
     """Vocabulary words with translations across Romance languages"""
 
     word = models.CharField(max_length=100, unique=True)
+    word_key = search_key_field("word")
     primary_language = models.CharField(
         max_length=5,
         choices=[
@@ -176,8 +278,12 @@ class Word(models.Model):
         ],
         default="es",
     )
+    is_verb = models.BooleanField(
+        default=False,
+        help_text="Infinitive: Spanish clitics glued to it are split off (hablarle)",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     created_by = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -189,10 +295,73 @@ class Word(models.Model):
     def __str__(self):
         return f"{self.word} ({self.primary_language})"
 
+    def update_derived_fields(self):
+        """Compute ``word_key``; ``bulk_create`` callers must call it themselves"""
+        self.word_key = search_key(self.word)
+
+    def save(self, *args, **kwargs):
+        self.update_derived_fields()
+        kwargs["update_fields"] = with_search_keys(
+            kwargs.get("update_fields"), [("word", "word_key")]
+        )
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ["word"]
 
 
+def clitic_host_checker(texts, language):
+    """
+    ``is_host`` for ``tokenize``: tells which of the infinitives of
+    ``texts`` are ``language`` verbs, so that "hablarle" is split but not
+    "muerte", nor "primeros" when "primer" is a known word. One query per
+    ``LOOKUP_CHUNK_SIZE`` hosts.
+    """
+    keys = list(
+        {search_key(host) for text in texts for host in clitic_hosts(text, language)}
+    )
+    known = set()
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        known.update(
+            Word.objects.filter(
+                word_key__in=keys[start : start + LOOKUP_CHUNK_SIZE],
+                primary_language=language,
+                is_verb=True,
+            )
+            .order_by()
+            .values_list("word_key", flat=True)
+        )
+    return lambda host: search_key(host) in known
+
+
+class WordForm(models.Model):
+    """Surface forms of a word, generated from suffix rules or added by editors"""
+
+    word = models.ForeignKey(Word, on_delete=models.CASCADE, related_name="forms")
+    form = models.CharField(max_length=100)
+    form_key = search_key_field("form")
+    is_generated = models.BooleanField(
+        default=False,
+        help_text="Generated from the suffix rules of the word language, rebuilt when the word changes",
+    )
+
+    def __str__(self):
+        return f"{self.form} → {self.word.word}"
+
+    def save(self, *args, **kwargs):
+        self.form_key = search_key(self.form)
+        kwargs["update_fields"] = with_search_keys(
+            kwargs.get("update_fields"), [("form", "form_key")]
+        )
+        super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ["form"]
+        constraints = [
+            models.UniqueConstraint(fields=["word", "form"], name="word_form_unique")
+        ]
+
+
 class WordTranslation(models.Model):
     """Translations of words in different Romance languages"""
 
@@ -210,6 +379,7 @@ class WordTranslation(models.Model):
         ],
     )
     translation = models.CharField(max_length=200)
+    translation_key = search_key_field("translation")
     pronunciation = models.CharField(max_length=200, blank=True)
     part_of_speech = models.CharField(
         max_length=20,
@@ -224,12 +394,27 @@ class WordTranslation(models.Model):
         ],
         blank=True,
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.word.word} → {self.translation} ({self.language})"
 
+    def save(self, *args, **kwargs):
+        self.translation_key = search_key(self.translation)
+        kwargs["update_fields"] = with_search_keys(
+            kwargs.get("update_fields"), [("translation", "translation_key")]
+        )
+        super().save(*args, **kwargs)
+
     class Meta:
         unique_together = ["word", "language"]
+        indexes = [
+            # Reverse lookups: which word is "crise" in French a translation of
+            models.Index(
+                fields=["language", "translation_key"],
+                name="translation_lookup_idx",
+            ),
+        ]
 
 
 class WordDefinition(models.Model):
@@ -252,6 +437,7 @@ class WordDefinition(models.Model):
         default="intermediate",
     )
     etymology = models.TextField(blank=True, help_text="Word origin and etymology")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"Definition: {self.word.word}"
@@ -267,10 +453,12 @@ class ArticleWord(models.Model):
         Word, on_delete=models.CASCADE, related_name="word_articles"
     )
     position_in_text = models.PositiveIntegerField(
-        help_text="Character position where word appears in article"
+        help_text="Character position where word appears in the article text without its [word] markup"
     )
-    context_sentence = models.TextField(
-        blank=True, help_text="The sentence where this word appears"
+    sentence_index = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Index of the sentence where this word appears (see Article.sentence_offsets)",
     )
     is_key_vocabulary = models.BooleanField(
         default=True, help_text="Whether this word is highlighted as key vocabulary"
@@ -280,6 +468,18 @@ class ArticleWord(models.Model):
     def __str__(self):
         return f"{self.article.title} → {self.word.word}"
 
+    def save(self, *args, **kwargs):
+        if self.sentence_index is None:
+            self.sentence_index = sentence_index_at(
+                self.article.sentence_offsets, self.position_in_text
+            )
+        super().save(*args, **kwargs)
+
+    @property
+    def context_sentence(self):
+        """The sentence where this word appears, sliced from the article"""
+        return self.article.sentence(self.sentence_index)
+
     class Meta:
         unique_together = ["article", "word", "position_in_text"]
         ordering = ["position_in_text"]
@@ -317,3 +517,84 @@ class UserSavedWord(models.Model):
     class Meta:
         unique_together = ["user", "word"]
         ordering = ["-saved_at"]
+
+
+class SyncTombstone(models.Model):
+    """Deleted rows kept so that delta syncs can tell clients to drop them"""
+
+    kind = models.CharField(
+        max_length=20,
+        choices=[
+            ("article", "Article"),
+            ("word", "Word"),
+            ("forms", "Forms of every word rebuilt"),
+        ],
+    )
+    key = models.CharField(
+        max_length=200, help_text="Frontend key of the deleted row (id or word)"
+    )
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.key} deleted at {self.deleted_at}"
+
+    class Meta:
+        ordering = ["deleted_at"]
+
+
+class PendingShardExport(models.Model):
+    """Export shards waiting to be regenerated by the sync daemon"""
+
+    shard_key = models.CharField(max_length=50, unique=True)
+    queued_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.shard_key} queued at {self.queued_at}"
+
+    class Meta:
+        ordering = ["queued_at"]
+
+
+class LatestArticle(models.Model):
+    """
+    Newest active article of each language with its pre-rendered summary,
+    kept up to date by signals so that the home page reads it by primary key
+    instead of sorting the articles
+    """
+
+    language = models.CharField(max_length=5, primary_key=True)
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="+")
+    summary = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.language}: {self.article_id}"
+
+    class Meta:
+        ordering = ["language"]
+
+
+class ArchiveMonth(models.Model):
+    """
+    Article counts per language, level and publication month, kept up to
+    date by signals so that archive facets do not aggregate the articles
+    """
+
+    language = models.CharField(max_length=5)
+    level = models.CharField(max_length=20)
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    article_count = models.IntegerField(default=0)
+    active_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.language} {self.level} {self.year}-{self.month:02d}"
+
+    class Meta:
+        ordering = ["-year", "-month", "language", "level"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["language", "level", "year", "month"],
+                name="archive_month_unique",
+            )
+        ]
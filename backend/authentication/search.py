@@ -0,0 +1,255 @@
+"""
+Full-text search over article titles and contents.
+
+On SQLite, articles are indexed by an FTS5 table using the article table as
+external content, so the text is not stored twice. Triggers keep the index
+up to date on every insert, update and delete, including bulk operations
+that bypass model signals. Results are ranked with BM25, a title match
+weighing more than a content match.
+
+Other databases, or SQLite builds without FTS5, fall back to ``icontains``
+lookups.
+
+The FTS5 tokenizer splits words on apostrophes and hyphens, which covers
+elisions ("l'aide") and hyphenated clitics ("dá-lo"), but it reads a
+Spanish infinitive and its clitics ("dárselo") as one word. Their parts
+(see ``tokenize``) are indexed from ``Article.search_terms``, and queries
+are split the same way. Which words are split depends on the verbs known
+when an article was saved, so a split query word also matches the whole
+word: "hablarle" still finds the articles saved before "hablar" was known.
+"""
+
+import html
+
+from django.db import DatabaseError, connection
+from django.db.models import Q
+
+from .models import Article, clitic_host_checker
+from .tokenizer import word_parts
+
+FTS_TABLE = "authentication_article_fts"
+
+ARTICLE_TABLE = Article._meta.db_table
+
+TITLE_WEIGHT = 10.0
+
+CONTENT_WEIGHT = 1.0
+
+TERMS_WEIGHT = 1.0
+
+DEFAULT_LIMIT = 20
+
+MAX_LIMIT = 100
+
+SNIPPET_TOKENS = 16
+
+# Highlight markers that cannot appear in article text; they are replaced
+# by <mark> tags once the snippet has been HTML-escaped.
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+FTS_COLUMNS = ("title", "content", "search_terms")
+
+
+def fts_schema(columns=FTS_COLUMNS):
+    """Statements creating the FTS5 table over ``columns`` and its triggers"""
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {names},
+            content='{ARTICLE_TABLE}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+        AFTER INSERT ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {names})
+            VALUES (new.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+        AFTER DELETE ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF {names} ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+            INSERT INTO {FTS_TABLE}(rowid, {names})
+            VALUES (new.id, {new});
+        END
+        """,
+    ]
+
+
+def install_article_fts(schema_editor):
+    """
+    Create the FTS5 table and its triggers, then index existing articles.
+
+    SQLite drops the triggers whenever a migration rebuilds the article
+    table, so this is safe to run again (``rebuild_search_index`` does).
+    Does nothing on other databases or when FTS5 is not compiled in.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        for statement in fts_schema():
+            schema_editor.execute(statement)
+    except DatabaseError:
+        # SQLite built without FTS5: searches use the fallback
+        return
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def fts_available():
+    if connection.vendor != "sqlite":
+        return False
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+def query_words(text, language=None):
+    """
+    Words of ``text`` as the lists of their parts, split like the indexed
+    ``Article.search_terms``
+    """
+    is_host = clitic_host_checker([text], language)
+    return [
+        [token.text for token in parts]
+        for parts in word_parts(text, language, is_host)
+    ]
+
+
+def query_terms(text, language=None):
+    """Words of ``text``, split like the indexed ``Article.search_terms``"""
+    return [term for parts in query_words(text, language) for term in parts]
+
+
+def fts_query(text, language=None):
+    """
+    Turn user input into an FTS5 query matching every word of ``text``.
+
+    Words are quoted so that FTS5 operators typed by users are matched
+    literally; the last word is a prefix so results follow typing. A word
+    split in parts matches them all or the whole word. Returns an empty
+    string when ``text`` has no word.
+    """
+    words = query_words(text, language)
+    if not words:
+        return ""
+    clauses = []
+    for index, parts in enumerate(words):
+        prefix = "*" if index == len(words) - 1 else ""
+        clause = " ".join(f'"{part}"' for part in parts) + prefix
+        if len(parts) > 1:
+            clause = f'({clause} OR "{"".join(parts)}"{prefix})'
+        clauses.append(clause)
+    # FTS5 only reads a parenthesized clause after an explicit AND
+    return " AND ".join(clauses)
+
+
+def _highlight(snippet):
+    escaped = html.escape(snippet)
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def search_articles(text, filters=None, limit=DEFAULT_LIMIT):
+    """
+    Active articles matching every word of ``text``, best matches first.
+
+    ``filters`` may restrict ``language`` and ``level``.
+
+    Returns:
+        list: Result dicts with an HTML-escaped ``snippet`` where matches
+        are wrapped in ``<mark>`` tags
+    """
+    filters = filters or {}
+    query = fts_query(text, filters.get("language"))
+    if not query:
+        return []
+    if not fts_available():
+        return _search_articles_fallback(text, filters, limit)
+
+    conditions = [f"{FTS_TABLE} MATCH %s", "a.is_active"]
+    params = [query]
+    for field in ("language", "level"):
+        if filters.get(field):
+            conditions.append(f"a.{field} = %s")
+            params.append(filters[field])
+    params.append(limit)
+
+    sql = f"""
+        SELECT a.id, a.title, a.language, a.level, a.publication_date,
+               snippet({FTS_TABLE}, -1, %s, %s, '…', {SNIPPET_TOKENS}),
+               bm25({FTS_TABLE}, {TITLE_WEIGHT}, {CONTENT_WEIGHT}, {TERMS_WEIGHT})
+                   AS score
+        FROM {FTS_TABLE}
+        JOIN {ARTICLE_TABLE} a ON a.id = {FTS_TABLE}.rowid
+        WHERE {" AND ".join(conditions)}
+        ORDER BY score, a.publication_date DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [_MARK_START, _MARK_END, *params])
+        rows = cursor.fetchall()
+
+    return [
+        {
+            "id": article_id,
+            "title": title,
+            "language": language,
+            "level": level,
+            "date": str(publication_date),
+            "snippet": _highlight(snippet),
+            "score": -score,
+        }
+        for article_id, title, language, level, publication_date, snippet, score in rows
+    ]
+
+
+def _search_articles_fallback(text, filters, limit):
+    articles = Article.objects.filter(is_active=True, **filters)
+    terms = query_terms(text, filters.get("language"))
+    for term in terms:
+        articles = articles.filter(
+            Q(title__icontains=term) | Q(content__icontains=term)
+        )
+    articles = articles.order_by("-publication_date").values(
+        "id", "title", "language", "level", "publication_date", "content"
+    )[:limit]
+
+    results = []
+    for row in articles:
+        content = row["content"]
+        position = max(content.lower().find(terms[0].lower()), 0)
+        snippet = content[max(position - 60, 0) : position + 60]
+        results.append(
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "language": row["language"],
+                "level": row["level"],
+                "date": row["publication_date"].isoformat(),
+                "snippet": html.escape(snippet),
+                "score": 0.0,
+            }
+        )
+    return results
+
+
+def matching_article_ids(text):
+    """
+    SQL and params selecting the ids of the articles matching ``text``, for
+    a ``pk__in=RawSQL(...)`` filter, or None without FTS5.
+    """
+    query = fts_query(text)
+    if not query or not fts_available():
+        return None
+    return f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]
@@ -0,0 +1,273 @@
+"""
+Signal receivers keeping derived sync data up to date.
+
+Delta syncs rely on ``updated_at`` watermarks. Rows that disappear leave no
+watermark behind, so their deletion is recorded as a ``SyncTombstone`` and
+the parent row of a deleted child is touched instead.
+
+Every change also queues the export shards it affects, which the
+``run_sync_daemon`` command regenerates, and bumps the cache generation of
+the article languages it affects. Article writes also move the
+``LatestArticle`` pointer of their language and adjust the ``ArchiveMonth``
+counts. Content edits resync the word occurrences of the article from its
+markup, wherever the article is saved.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .annotation import annotate_articles
+from .archive import apply_archive_deltas, archive_state, article_deltas
+from .articles import refresh_latest_articles, sync_article_words
+from .cache import (
+    WORDS,
+    article_language,
+    bump_generation,
+    bump_generations,
+    remember_article_language,
+)
+from .export import (
+    article_shard_key,
+    article_shard_keys,
+    queue_shard_exports,
+    word_shard_key,
+)
+from .inflection import rebuild_word_forms
+from .models import (
+    Article,
+    ArticleWord,
+    QuizQuestion,
+    SyncTombstone,
+    Word,
+    WordDefinition,
+    WordForm,
+    WordTranslation,
+)
+
+
+def touch(model, pk):
+    """Move the ``updated_at`` watermark of a row without sending signals"""
+    model.objects.filter(pk=pk).update(updated_at=timezone.now())
+
+
+def previous_state(instance, *fields):
+    """Values of ``fields`` currently stored for ``instance``, or None"""
+    if instance.pk is None:
+        return None
+    return (
+        type(instance).objects.filter(pk=instance.pk).values(*fields).order_by().first()
+    )
+
+
+@receiver(pre_save, sender=Article)
+def remember_article_state(sender, instance, **kwargs):
+    instance._previous_state = previous_state(
+        instance, "language", "level", "publication_date", "is_active", "content"
+    )
+
+
+@receiver(post_save, sender=Article)
+def queue_article_shards(sender, instance, **kwargs):
+    keys = {article_shard_key(instance.language, instance.level)}
+    previous = getattr(instance, "_previous_state", None)
+    if previous:
+        keys.add(article_shard_key(previous["language"], previous["level"]))
+    queue_shard_exports(keys)
+
+
+# Occurrence positions and sentence indexes are offsets into the content;
+# new articles are linked by whoever creates them (admin, importer)
+@receiver(post_save, sender=Article)
+def resync_article_words(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_state", None)
+    if previous and previous["content"] != instance.content:
+        sync_article_words(
+            instance, created_by=getattr(instance, "_words_created_by", None)
+        )
+        annotate_articles([instance])
+
+
+@receiver(post_delete, sender=Article)
+def record_article_deletion(sender, instance, **kwargs):
+    SyncTombstone.objects.create(kind="article", key=str(instance.pk))
+    queue_shard_exports([article_shard_key(instance.language, instance.level)])
+
+
+@receiver(pre_save, sender=Word)
+def record_word_rename(sender, instance, **kwargs):
+    instance._previous_state = previous_state(instance, "word", "primary_language")
+    # The frontend keys words by their text: a rename deletes the old key.
+    previous = instance._previous_state
+    if previous is not None and previous["word"] != instance.word:
+        SyncTombstone.objects.create(kind="word", key=previous["word"])
+
+
+@receiver(post_save, sender=Word)
+def queue_word_shards(sender, instance, **kwargs):
+    keys = {word_shard_key(instance.primary_language)}
+    previous = getattr(instance, "_previous_state", None)
+    if previous:
+        keys.add(word_shard_key(previous["primary_language"]))
+        if previous["word"] != instance.word:
+            # Article keywords are word texts
+            keys |= article_shard_keys(
+                Article.objects.filter(article_words__word=instance)
+            )
+    queue_shard_exports(keys)
+
+
+# Article keywords are word texts: delta syncs resend the linking articles
+@receiver(post_save, sender=Word)
+def touch_renamed_word_articles(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_state", None)
+    if previous and previous["word"] != instance.word:
+        Article.objects.filter(
+            pk__in=ArticleWord.objects.filter(word=instance).values("article_id")
+        ).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Word)
+def regenerate_word_forms(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_state", None)
+    if (
+        created
+        or previous is None
+        or previous
+        != {
+            "word": instance.word,
+            "primary_language": instance.primary_language,
+        }
+    ):
+        rebuild_word_forms([(instance.pk, instance.word, instance.primary_language)])
+
+
+# Annotation picks up the forms of a word through its watermark
+@receiver(post_save, sender=WordForm)
+@receiver(post_delete, sender=WordForm)
+def touch_word_forms(sender, instance, **kwargs):
+    if not instance.is_generated:
+        touch(Word, instance.word_id)
+
+
+@receiver(post_delete, sender=Word)
+def record_word_deletion(sender, instance, **kwargs):
+    SyncTombstone.objects.create(kind="word", key=instance.word)
+    queue_shard_exports([word_shard_key(instance.primary_language)])
+
+
+@receiver(post_save, sender=ArticleWord)
+@receiver(post_delete, sender=ArticleWord)
+def touch_article_keywords(sender, instance, **kwargs):
+    touch(Article, instance.article_id)
+    queue_shard_exports(
+        article_shard_keys(Article.objects.filter(pk=instance.article_id))
+    )
+
+
+@receiver(post_save, sender=WordTranslation)
+@receiver(post_save, sender=WordDefinition)
+def queue_word_details_shard(sender, instance, **kwargs):
+    queue_shard_exports(
+        word_shard_key(language)
+        for language in Word.objects.filter(pk=instance.word_id).values_list(
+            "primary_language", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=WordTranslation)
+@receiver(post_delete, sender=WordDefinition)
+def touch_word_details(sender, instance, **kwargs):
+    touch(Word, instance.word_id)
+    queue_word_details_shard(sender, instance)
+
+
+@receiver(post_save, sender=Article)
+def bump_article_cache(sender, instance, **kwargs):
+    languages = {instance.language}
+    previous = getattr(instance, "_previous_state", None)
+    if previous:
+        languages.add(previous["language"])
+    remember_article_language(instance.pk, instance.language)
+    bump_generations(languages)
+
+
+@receiver(post_delete, sender=Article)
+def bump_deleted_article_cache(sender, instance, **kwargs):
+    remember_article_language(instance.pk, "")
+    bump_generations([instance.language])
+
+
+@receiver(post_save, sender=Article)
+def update_latest_article(sender, instance, **kwargs):
+    languages = {instance.language}
+    previous = getattr(instance, "_previous_state", None)
+    if previous:
+        languages.add(previous["language"])
+    refresh_latest_articles(languages)
+
+
+@receiver(post_save, sender=Article)
+def count_saved_article(sender, instance, **kwargs):
+    apply_archive_deltas(
+        article_deltas(
+            getattr(instance, "_previous_state", None), archive_state(instance)
+        )
+    )
+
+
+@receiver(post_delete, sender=Article)
+def uncount_deleted_article(sender, instance, **kwargs):
+    apply_archive_deltas(article_deltas(archive_state(instance), None))
+
+
+# The pointer of a deleted article is deleted with it (CASCADE)
+@receiver(post_delete, sender=Article)
+def replace_latest_article(sender, instance, **kwargs):
+    refresh_latest_articles([instance.language])
+
+
+@receiver(post_save, sender=ArticleWord)
+@receiver(post_delete, sender=ArticleWord)
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+def bump_parent_article_cache(sender, instance, **kwargs):
+    bump_generations([article_language(instance.article_id)])
+
+
+def bump_word_article_caches(word_id):
+    bump_generations(
+        Article.objects.filter(article_words__word_id=word_id)
+        .order_by()
+        .values_list("language", flat=True)
+        .distinct()
+    )
+
+
+# Deleting a word cascades to its ArticleWord rows, which bump their
+# articles themselves
+@receiver(post_save, sender=Word)
+def bump_word_cache(sender, instance, **kwargs):
+    bump_word_article_caches(instance.pk)
+
+
+@receiver(post_save, sender=WordTranslation)
+@receiver(post_delete, sender=WordTranslation)
+@receiver(post_save, sender=WordDefinition)
+@receiver(post_delete, sender=WordDefinition)
+def bump_word_details_cache(sender, instance, **kwargs):
+    bump_word_article_caches(instance.word_id)
+
+
+# Word lookups resolve forms, so any vocabulary write can change them
+@receiver(post_save, sender=Word)
+@receiver(post_delete, sender=Word)
+@receiver(post_save, sender=WordForm)
+@receiver(post_delete, sender=WordForm)
+@receiver(post_save, sender=WordTranslation)
+@receiver(post_delete, sender=WordTranslation)
+@receiver(post_save, sender=WordDefinition)
+@receiver(post_delete, sender=WordDefinition)
+def bump_word_lookups(sender, instance, **kwargs):
+    bump_generation(WORDS)
@@ -0,0 +1,191 @@
+"""
+Tests for the automatic vocabulary annotation
+
+Test scenarios:
+1. The automaton finds whole words, case-insensitively, longest first
+2. Known words of an article are linked in bulk, without key vocabulary
+3. Word creations, renames and deletions reach the automaton incrementally
+4. The admin annotates the articles it saves
+5. The command annotates the archive and can be run again
+"""
+
+import io
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from authentication.annotation import (
+    VocabularyAutomaton,
+    annotate_articles,
+    reset_automaton,
+)
+from authentication.articles import build_article_detail
+from authentication.models import Article, ArticleWord, Word
+
+
+def create_article(content, language="es", title="Artículo"):
+    return Article.objects.create(
+        title=title,
+        content=content,
+        language=language,
+        level="beginner",
+        publication_date=date(2024, 5, 1),
+    )
+
+
+def linked_words(article):
+    return [
+        (aw.word.word, aw.position_in_text, aw.is_key_vocabulary)
+        for aw in ArticleWord.objects.filter(article=article)
+        .select_related("word")
+        .order_by("position_in_text")
+    ]
+
+
+class VocabularyAutomatonTestCase(TestCase):
+    """Test suite for the Aho-Corasick automaton"""
+
+    def test_whole_words_longest_first(self):
+        """Matches respect word boundaries and prefer the longest word"""
+        automaton = VocabularyAutomaton()
+        for word_id, text in enumerate(
+            ["agua", "agua potable", "pota", "Potable", "col·lecció", "lecció"], 1
+        ):
+            automaton.add(word_id, text, "es")
+        automaton.add(7, "aigua", "ca")
+
+        text = "El Agua potable, aguas y col·lecció; l'agua."
+        spans = automaton.annotate(text, "es")
+        self.assertEqual(
+            [(text[start:end], word_id) for start, end, word_id in spans],
+            [("Agua potable", 2), ("col·lecció", 5), ("agua", 1)],
+        )
+        self.assertEqual(automaton.annotate("L'aigua", "ca"), [(2, 7, 7)])
+        self.assertEqual(automaton.annotate("L'aigua", "es"), [])
+
+        print("✅ Automaton finds whole words, longest first")
+
+    def test_taken_spans_and_removal(self):
+        """Spans already linked are skipped and removed words are not found"""
+        automaton = VocabularyAutomaton()
+        automaton.add(1, "agua", "es")
+        automaton.add(2, "pan", "es")
+
+        self.assertEqual(
+            automaton.annotate("agua y pan", "es", taken=[(0, 4)]), [(7, 10, 2)]
+        )
+        automaton.discard("pan")
+        automaton.add(1, "vino", "es")
+        self.assertEqual(automaton.annotate("agua y pan y vino", "es"), [(13, 17, 1)])
+        self.assertEqual(len(automaton), 1)
+
+
+class AnnotateArticlesTestCase(TestCase):
+    """Test suite for annotate_articles"""
+
+    def setUp(self):
+        reset_automaton()
+        self.addCleanup(reset_automaton)
+        self.agua = Word.objects.create(word="agua", primary_language="es")
+        self.pan = Word.objects.create(word="pan", primary_language="es")
+
+    def test_known_words_linked(self):
+        """Bracketed words stay key vocabulary, the others are linked after"""
+        article = create_article("El [agua] es vida. Agua y pan.")
+        ArticleWord.objects.create(article=article, word=self.agua, position_in_text=3)
+
+        self.assertEqual(annotate_articles([article]), 2)
+        self.assertEqual(
+            linked_words(article),
+            [("agua", 3, True), ("agua", 17, False), ("pan", 24, False)],
+        )
+        self.assertEqual(
+            ArticleWord.objects.get(position_in_text=24).context_sentence,
+            "Agua y pan.",
+        )
+        self.assertEqual(build_article_detail(article.id)["keywords"], ["agua"])
+
+        self.assertEqual(annotate_articles([article]), 0)
+
+        print("✅ Known words linked to the article")
+
+    def test_word_changes_reach_automaton(self):
+        """New, renamed and deleted words are applied by the next sync"""
+        article = create_article("Come pan con queso.")
+        annotate_articles([article])
+
+        queso = Word.objects.create(word="queso", primary_language="es")
+        self.pan.word = "pancito"
+        self.pan.save()
+        ArticleWord.objects.filter(article=article).delete()
+        self.assertEqual(annotate_articles([article]), 1)
+        self.assertEqual(linked_words(article), [("queso", 13, False)])
+
+        ArticleWord.objects.filter(article=article).delete()
+        queso.delete()
+        self.assertEqual(annotate_articles([article]), 0)
+
+    def test_bounded_queries(self):
+        """Annotating a batch costs a fixed number of queries"""
+        articles = [create_article(f"Agua {i} y pan.") for i in range(10)]
+        annotate_articles(articles[:1])
+
+        with self.assertNumQueries(11):
+            self.assertEqual(annotate_articles(articles[1:]), 18)
+
+
+class AnnotationAdminTestCase(TestCase):
+    """Test suite for the annotation of articles saved in the admin"""
+
+    def setUp(self):
+        reset_automaton()
+        self.addCleanup(reset_automaton)
+        User.objects.create_superuser("admin", password="pass")
+        self.client = Client()
+        self.client.login(username="admin", password="pass")
+        Word.objects.create(word="vida", primary_language="es")
+
+    def test_saved_article_annotated(self):
+        """Bracketed words and known words are both linked"""
+        self.client.post(
+            reverse("admin:authentication_article_add"),
+            {
+                "title": "Vida",
+                "content": "El [agua] es vida.",
+                "language": "es",
+                "level": "beginner",
+                "publication_date": "2024-05-01",
+                "is_active": "on",
+            },
+        )
+        article = Article.objects.get(title="Vida")
+        self.assertEqual(
+            linked_words(article), [("agua", 3, True), ("vida", 11, False)]
+        )
+
+
+class AnnotateArticlesCommandTestCase(TestCase):
+    """Test suite for the annotate_articles management command"""
+
+    def setUp(self):
+        reset_automaton()
+        self.addCleanup(reset_automaton)
+
+    def test_command_annotates_archive(self):
+        """Every article of the selected language is annotated once"""
+        Word.objects.create(word="acqua", primary_language="it")
+        italian = [create_article("L'acqua è vita.", language="it") for _ in range(3)]
+        spanish = create_article("El acqua no.")
+
+        out = io.StringIO()
+        call_command("annotate_articles", language="it", batch_size=2, stdout=out)
+        self.assertIn("3 occurrence(s) créée(s) dans 3 article(s)", out.getvalue())
+        self.assertEqual(linked_words(italian[0]), [("acqua", 2, False)])
+        self.assertEqual(linked_words(spanish), [])
+
+        out = io.StringIO()
+        call_command("annotate_articles", stdout=out)
+        self.assertIn("0 occurrence(s) créée(s) dans 4 article(s)", out.getvalue())
@@ -0,0 +1,193 @@
+"""
+Tests for the archive month rollups
+
+Test scenarios:
+1. Rollup counts follow article creation, edits, publication and deletion
+2. Rebuilding the rollups from the articles gives the incremental counts
+3. The archive facets endpoint filters every facet but its own
+4. The admin month filter lists the rollup months
+"""
+
+import io
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from authentication.archive import rebuild_archive_months
+from authentication.models import ArchiveMonth, Article
+
+
+def create_article(language="es", level="beginner", day=date(2024, 5, 10), **kwargs):
+    return Article.objects.create(
+        title=f"{language} {level} {day}",
+        content="Texto.",
+        language=language,
+        level=level,
+        publication_date=day,
+        **kwargs,
+    )
+
+
+def rollup():
+    return {
+        (row.language, row.level, row.year, row.month): (
+            row.article_count,
+            row.active_count,
+        )
+        for row in ArchiveMonth.objects.all()
+    }
+
+
+class ArchiveRollupTestCase(TestCase):
+    """Test suite for the incremental ArchiveMonth counts"""
+
+    def test_counts_follow_writes(self):
+        """Each write moves the counts of the months it leaves and enters"""
+        article = create_article()
+        create_article(is_active=False)
+        self.assertEqual(rollup(), {("es", "beginner", 2024, 5): (2, 1)})
+
+        article.is_active = False
+        article.save()
+        self.assertEqual(rollup(), {("es", "beginner", 2024, 5): (2, 0)})
+
+        article.is_active = True
+        article.level = "advanced"
+        article.publication_date = date(2024, 6, 1)
+        article.save()
+        self.assertEqual(
+            rollup(),
+            {
+                ("es", "beginner", 2024, 5): (1, 0),
+                ("es", "advanced", 2024, 6): (1, 1),
+            },
+        )
+
+        article.delete()
+        self.assertEqual(rollup(), {("es", "beginner", 2024, 5): (1, 0)})
+
+        print("✅ Archive rollups follow every article write")
+
+    def test_untouched_save_keeps_counts(self):
+        """Saving an article without moving it leaves its month alone"""
+        article = create_article()
+        article.title = "Otro título"
+        article.save()
+        self.assertEqual(rollup(), {("es", "beginner", 2024, 5): (1, 1)})
+
+    def test_string_dates_counted(self):
+        """A date assigned as an ISO string is counted in its month"""
+        article = create_article(day="2024-01-05")
+        self.assertEqual(rollup(), {("es", "beginner", 2024, 1): (1, 1)})
+
+        article.publication_date = "2024-02-01"
+        article.save()
+        self.assertEqual(rollup(), {("es", "beginner", 2024, 2): (1, 1)})
+
+    def test_rebuild_matches_incremental_counts(self):
+        """The rebuild command recomputes the same rows"""
+        create_article()
+        create_article(language="it", day=date(2023, 12, 31))
+        create_article(language="it", day=date(2023, 12, 1), is_active=False)
+        expected = rollup()
+
+        ArchiveMonth.objects.all().delete()
+        Article.objects.filter(language="es").update(level="advanced")
+        expected[("es", "advanced", 2024, 5)] = expected.pop(
+            ("es", "beginner", 2024, 5)
+        )
+
+        call_command("rebuild_archive_months", stdout=io.StringIO())
+        self.assertEqual(rollup(), expected)
+        self.assertEqual(rebuild_archive_months(), 2)
+
+
+class ArchiveFacetsAPITestCase(TestCase):
+    """Test suite for /api/articles/archive/"""
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse("api_archive_facets")
+        create_article("es", "beginner", date(2024, 5, 1))
+        create_article("es", "advanced", date(2024, 5, 2))
+        create_article("es", "advanced", date(2024, 4, 2))
+        create_article("it", "beginner", date(2023, 1, 2))
+        create_article("it", "beginner", date(2024, 5, 3), is_active=False)
+
+    def facets(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_facets(self):
+        """Counts of published articles, newest months first"""
+        facets = self.facets()
+        self.assertEqual(facets["total"], 4)
+        self.assertEqual(facets["languages"], {"es": 3, "it": 1})
+        self.assertEqual(facets["levels"], {"advanced": 2, "beginner": 2})
+        self.assertEqual(
+            facets["months"],
+            [
+                {"year": 2024, "month": 5, "count": 2},
+                {"year": 2024, "month": 4, "count": 1},
+                {"year": 2023, "month": 1, "count": 1},
+            ],
+        )
+
+        print("✅ Archive facets served from rollups")
+
+    def test_filters_apply_to_other_facets(self):
+        """A facet ignores its own filter so that its other values stay listed"""
+        facets = self.facets(language="es", level="advanced")
+        self.assertEqual(facets["total"], 2)
+        self.assertEqual(facets["languages"], {"es": 2})
+        self.assertEqual(facets["levels"], {"advanced": 2, "beginner": 1})
+        self.assertEqual(
+            [m["month"] for m in facets["months"]],
+            [5, 4],
+        )
+
+    def test_reads_rollups_only(self):
+        """The facet query cost does not depend on the number of articles"""
+        for _ in range(20):
+            create_article()
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_inactive_articles(self):
+        """Drafts are only counted for staff"""
+        self.assertEqual(
+            self.client.get(self.url, {"is_active": "false"}).status_code, 400
+        )
+        User.objects.create_user("staff", password="pass", is_staff=True)
+        self.client.login(username="staff", password="pass")
+
+        self.assertEqual(self.facets(is_active="false")["total"], 1)
+        self.assertEqual(self.facets(is_active="all")["total"], 5)
+
+
+class PublicationMonthFilterTestCase(TestCase):
+    """Test suite for the admin publication month filter"""
+
+    def setUp(self):
+        User.objects.create_superuser("admin", password="pass")
+        self.client = Client()
+        self.client.login(username="admin", password="pass")
+        self.url = reverse("admin:authentication_article_changelist")
+        create_article("es", day=date(2024, 12, 31))
+        create_article("it", day=date(2024, 12, 1))
+        create_article("it", day=date(2025, 1, 1))
+
+    def test_months_listed_and_filtered(self):
+        """Months come from the rollups and filter by publication date range"""
+        response = self.client.get(self.url)
+        self.assertContains(response, "2024-12 (2)")
+        self.assertContains(response, "2025-01 (1)")
+
+        response = self.client.get(self.url, {"month": "2024-12"})
+        self.assertEqual(response.context["cl"].result_count, 2)
+        response = self.client.get(self.url, {"month": "2024-13"})
+        self.assertEqual(response.context["cl"].result_count, 0)
@@ -0,0 +1,664 @@
+"""
+Tests for the article read API
+
+Test scenarios:
+1. Article list pages are walked with keyset cursors without gaps or repeats
+2. Language, level and is_active filters, and their validation
+3. Keyset pages are served from the composite index
+4. Article bundles load in a bounded number of queries without quiz answers
+5. Cached bundles are invalidated when any of their parts change
+6. Full-text search ranks and highlights matches and follows every write
+7. Cached pages and details are only invalidated for the language written to
+8. Cache fills are single-flight, serve stale values and refresh early
+9. The latest article of each language follows saves, publication and deletes
+"""
+
+import json
+import re
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from authentication.articles import (
+    article_page,
+    build_article_bundle,
+    latest_article,
+)
+from authentication.cache import (
+    CacheEntry,
+    bump_generations,
+    cached_response,
+    generation,
+    generation_key,
+    response_key,
+)
+from authentication.export import iter_frontend_articles
+from authentication.search import fts_available, fts_query, search_articles
+from authentication.models import (
+    Article,
+    ArticleWord,
+    LatestArticle,
+    QuizQuestion,
+    Word,
+    WordDefinition,
+    WordTranslation,
+)
+
+
+def create_articles(count, language="es", level="intermediate", **kwargs):
+    """Create ``count`` articles, two per publication date"""
+    return [
+        Article.objects.create(
+            title=f"{language} {level} {i}",
+            content=f"Contenido {i}.",
+            language=language,
+            level=level,
+            publication_date=date(2024, 1, 1) + timedelta(days=i // 2),
+            **kwargs,
+        )
+        for i in range(count)
+    ]
+
+
+class ArticleListAPITestCase(TestCase):
+    """Test suite for /api/articles/"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = Client()
+        self.url = reverse("api_articles")
+        create_articles(7, language="es", level="beginner")
+        create_articles(3, language="it", level="advanced")
+        create_articles(2, language="es", level="advanced", is_active=False)
+
+    def walk(self, **params):
+        """Follow the cursors and return every page"""
+        pages = []
+        cursor = None
+        while True:
+            query = dict(params, **({"cursor": cursor} if cursor else {}))
+            response = self.client.get(self.url, query)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json())
+            cursor = pages[-1]["next"]
+            if cursor is None:
+                return pages
+
+    def test_cursor_walk_covers_every_article_once(self):
+        """Pages follow (publication_date, id) order even within a day"""
+        pages = self.walk(page_size=3)
+        ids = [article["id"] for page in pages for article in page["results"]]
+
+        self.assertEqual([len(page["results"]) for page in pages], [3, 3, 3, 1])
+        expected = Article.objects.filter(is_active=True).order_by(
+            "-publication_date", "-id"
+        )
+        self.assertEqual(ids, list(expected.values_list("id", flat=True)))
+
+        oldest = self.walk(page_size=4, sort="oldest")
+        oldest_ids = [article["id"] for page in oldest for article in page["results"]]
+        self.assertEqual(oldest_ids, ids[::-1])
+
+        print("✅ Keyset pagination walks the archive without gaps")
+
+    def test_each_page_is_one_query(self):
+        """Deep pages cost a single query, like the first one"""
+        first = self.client.get(self.url, {"page_size": 2}).json()
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.url, {"page_size": 2, "cursor": first["next"]}
+            )
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    def test_filters(self):
+        """Language and level filters restrict the listed articles"""
+        results = self.client.get(
+            self.url, {"language": "es", "level": "beginner"}
+        ).json()["results"]
+        self.assertEqual(len(results), 7)
+        self.assertEqual(
+            {(a["language"], a["level"]) for a in results}, {("es", "beginner")}
+        )
+        self.assertEqual(
+            set(results[0]), {"id", "title", "language", "level", "date", "summary"}
+        )
+
+        for params in (
+            {"language": "xx"},
+            {"level": "expert"},
+            {"page_size": "many"},
+            {"cursor": "not-a-cursor"},
+            {"sort": "title"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_inactive_articles_are_staff_only(self):
+        """Drafts are hidden from the public list"""
+        response = self.client.get(self.url, {"is_active": "false"})
+        self.assertEqual(response.status_code, 400)
+
+        User.objects.create_user("editor", password="pass", is_staff=True)
+        self.client.login(username="editor", password="pass")
+        results = self.client.get(self.url, {"is_active": "false"}).json()["results"]
+        self.assertEqual(len(results), 2)
+        results = self.client.get(self.url, {"is_active": "all"}).json()["results"]
+        self.assertEqual(len(results), 12)
+
+    def test_pages_use_composite_index(self):
+        """Deep pages seek into the partial keyset index, without sorting"""
+        filters = {"is_active": True, "language": "es"}
+        cursor = article_page(filters, page_size=2)["next"]
+        with CaptureQueriesContext(connection) as queries:
+            article_page(filters, cursor=cursor, page_size=2)
+
+        with connection.cursor() as c:
+            c.execute("EXPLAIN QUERY PLAN " + queries.captured_queries[0]["sql"])
+            plan = " ".join(str(row) for row in c.fetchall())
+        self.assertIn("article_language_keyset_idx", plan)
+        self.assertIn("publication_date<", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+class ArticleBundleAPITestCase(TestCase):
+    """Test suite for /api/articles/<id>/bundle/"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = Client()
+        self.article = Article.objects.create(
+            title="El agua",
+            content="El [agua] es vida. Bebe [agua] y come [pan].",
+            language="es",
+            level="beginner",
+            publication_date=date(2024, 5, 1),
+        )
+        words = {}
+        for text in ("agua", "pan"):
+            words[text] = Word.objects.create(word=text, primary_language="es")
+            WordTranslation.objects.create(
+                word=words[text], language="fr", translation=text
+            )
+            WordTranslation.objects.create(
+                word=words[text], language="it", translation=text
+            )
+        for span in self.article.markup.spans:
+            ArticleWord.objects.create(
+                article=self.article,
+                word=words[span.surface],
+                position_in_text=span.start,
+            )
+        WordDefinition.objects.create(
+            word=Word.objects.get(word="agua"), grammar_note="Sustantivo femenino"
+        )
+        for i in range(3):
+            QuizQuestion.objects.create(
+                article=self.article,
+                question_text=f"Pregunta {i}",
+                option_a="a",
+                option_b="b",
+                option_c="c",
+                option_d="d",
+                correct_option="B",
+            )
+        self.url = reverse("api_article_bundle", args=[self.article.id])
+
+    def test_bundle_content(self):
+        """The bundle holds article, occurrences, words and quiz"""
+        bundle = self.client.get(self.url).json()
+
+        self.assertEqual(bundle["article"]["title"], "El agua")
+        self.assertEqual(
+            [o["word"] for o in bundle["occurrences"]], ["agua", "agua", "pan"]
+        )
+        self.assertEqual(
+            [o["sentence_index"] for o in bundle["occurrences"]], [0, 1, 1]
+        )
+        self.assertEqual(
+            bundle["words"]["agua"]["definition"]["grammar_note"], "Sustantivo femenino"
+        )
+        self.assertIsNone(bundle["words"]["pan"]["definition"])
+        self.assertEqual(list(bundle["words"]["pan"]["translations"]), ["fr", "it"])
+        self.assertEqual(len(bundle["quiz"]), 3)
+        self.assertNotIn("correct_option", json.dumps(bundle))
+        self.assertNotIn("correct_option", bundle["quiz"][0])
+
+        print("✅ Article bundle served without quiz answers")
+
+    def test_bundle_queries_are_bounded_and_cached(self):
+        """Four queries on a cold cache, none once cached"""
+        with self.assertNumQueries(4):
+            build_article_bundle(self.article.id)
+
+        for text in ("sol", "mar", "luz"):
+            word = Word.objects.create(word=text, primary_language="es")
+            WordTranslation.objects.create(word=word, language="fr", translation=text)
+            ArticleWord.objects.create(
+                article=self.article, word=word, position_in_text=0
+            )
+        with self.assertNumQueries(4):
+            build_article_bundle(self.article.id)
+
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.json()["occurrences"]), 6)
+
+    def test_bundle_invalidation(self):
+        """Editing any part of the bundle drops the cached copy"""
+
+        def bundle():
+            return self.client.get(self.url).json()
+
+        bundle()
+        WordTranslation.objects.filter(word__word="pan", language="fr").update(
+            translation="stale"
+        )
+        self.assertEqual(
+            bundle()["words"]["pan"]["translations"]["fr"]["translation"], "pan"
+        )
+
+        translation = WordTranslation.objects.get(word__word="pan", language="fr")
+        translation.translation = "pain"
+        translation.save()
+        self.assertEqual(
+            bundle()["words"]["pan"]["translations"]["fr"]["translation"], "pain"
+        )
+
+        QuizQuestion.objects.filter(article=self.article).first().delete()
+        self.assertEqual(len(bundle()["quiz"]), 2)
+
+        definition = WordDefinition.objects.get(word__word="agua")
+        definition.grammar_note = "Nombre"
+        definition.save()
+        self.assertEqual(
+            bundle()["words"]["agua"]["definition"]["grammar_note"], "Nombre"
+        )
+
+        self.article.is_active = False
+        self.article.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_unknown_article(self):
+        """Missing articles return a 404"""
+        url = reverse("api_article_bundle", args=[self.article.id + 100])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class ArticleCacheTestCase(TestCase):
+    """Test suite for the per-language article response cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = Client()
+        self.url = reverse("api_articles")
+        self.spanish = create_articles(3, language="es")
+        self.italian = create_articles(3, language="it")
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def detail_url(self, article):
+        return reverse("api_article_detail", args=[article.id])
+
+    def test_writes_only_invalidate_their_language(self):
+        """Editing an Italian article keeps the Spanish responses cached"""
+        self.get(self.url, language="es")
+        self.get(self.detail_url(self.spanish[0]))
+        self.get(self.url, language="it")
+
+        article = self.italian[0]
+        article.title = "Titolo nuovo"
+        article.save()
+
+        with self.assertNumQueries(0):
+            self.get(self.url, language="es")
+            detail = self.get(self.detail_url(self.spanish[0]))
+        self.assertEqual(detail["title"], self.spanish[0].title)
+
+        titles = [a["title"] for a in self.get(self.url, language="it")["results"]]
+        self.assertIn("Titolo nuovo", titles)
+        titles = [a["title"] for a in self.get(self.url)["results"]]
+        self.assertIn("Titolo nuovo", titles)
+
+        print("✅ Article cache invalidated per language")
+
+    def test_children_invalidate_their_article_language(self):
+        """Keywords and quiz questions bump the language of their article"""
+        url = self.detail_url(self.spanish[0])
+        self.assertEqual(self.get(url)["keywords"], [])
+
+        word = Word.objects.create(word="sol", primary_language="es")
+        ArticleWord.objects.create(
+            article=self.spanish[0], word=word, position_in_text=0
+        )
+        self.assertEqual(self.get(url)["keywords"], ["sol"])
+
+        word.word = "luna"
+        word.save()
+        self.assertEqual(self.get(url)["keywords"], ["luna"])
+
+    def test_language_change_moves_article(self):
+        """An article moved to another language leaves the old lists"""
+        self.get(self.url, language="es")
+        self.get(self.url, language="it")
+
+        article = self.spanish[0]
+        article.language = "it"
+        article.save()
+
+        spanish = {a["id"] for a in self.get(self.url, language="es")["results"]}
+        italian = {a["id"] for a in self.get(self.url, language="it")["results"]}
+        self.assertNotIn(article.id, spanish)
+        self.assertIn(article.id, italian)
+        self.assertEqual(self.get(self.detail_url(article))["language"], "it")
+
+    def test_missing_and_deleted_articles(self):
+        """Unknown ids are cached as misses until an article takes them"""
+        article = self.spanish[0]
+        url = self.detail_url(article)
+        self.get(url)
+
+        article.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_evicted_generation_does_not_revive_entries(self):
+        """A generation lost from the cache restarts above its old value"""
+        self.get(self.url, language="es")
+        cache.delete(generation_key("es"))
+        self.spanish[0].delete()
+
+        ids = {a["id"] for a in self.get(self.url, language="es")["results"]}
+        self.assertNotIn(self.spanish[0].id, ids)
+
+    def test_file_based_cache(self):
+        """Generations work with Django's file-based cache"""
+        with tempfile.TemporaryDirectory() as location, override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            }
+        ):
+            url = self.detail_url(self.spanish[1])
+            self.get(url)
+            with self.assertNumQueries(0):
+                self.get(url)
+
+            self.spanish[1].title = "Nuevo"
+            self.spanish[1].save()
+            self.assertEqual(self.get(url)["title"], "Nuevo")
+
+
+class CacheFillTestCase(TestCase):
+    """Test suite for stampede protection of the article cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.builds = []
+
+    def build(self, value="fresh", delay=0):
+        def build():
+            self.builds.append(value)
+            time.sleep(delay)
+            return value
+
+        return build
+
+    def test_concurrent_misses_build_once(self):
+        """Only one of many concurrent requests rebuilds a cold key"""
+        results = []
+        start = threading.Barrier(8)
+
+        def request():
+            start.wait()
+            results.append(cached_response("es", "test", 1, self.build(delay=0.2)))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.builds, ["fresh"])
+        self.assertEqual(results, ["fresh"] * 8)
+
+        print("✅ Cold cache keys are rebuilt once")
+
+    def test_stale_value_served_during_rebuild(self):
+        """Invalidated entries are served while another worker rebuilds"""
+        cached_response("es", "test", 1, self.build("old"))
+        bump_generations(["es"])
+        cache.add(response_key("es", "test", 1) + ":lock", True)
+
+        self.assertEqual(cached_response("es", "test", 1, self.build("new")), "old")
+
+        cache.delete(response_key("es", "test", 1) + ":lock")
+        self.assertEqual(cached_response("es", "test", 1, self.build("new")), "new")
+        self.assertEqual(self.builds, ["old", "new"])
+
+    def test_failed_build_releases_lock(self):
+        """A build error is not cached and lets the next request retry"""
+
+        def fail():
+            raise RuntimeError("database down")
+
+        with self.assertRaises(RuntimeError):
+            cached_response("es", "test", 1, fail)
+        self.assertEqual(cached_response("es", "test", 1, self.build()), "fresh")
+
+    def test_early_refresh(self):
+        """Entries close to expiry, relative to their build time, are rebuilt"""
+        key = response_key("es", "test", 1)
+        entry = CacheEntry(generation("es"), time.time() + 1, 10.0, "old")
+
+        with mock.patch("authentication.cache.random.random", return_value=0.5):
+            cache.set(key, entry._replace(expires_at=time.time() + 3600))
+            self.assertEqual(cached_response("es", "test", 1, self.build()), "old")
+
+            cache.set(key, entry)
+            self.assertEqual(cached_response("es", "test", 1, self.build()), "fresh")
+
+
+class LatestArticleTestCase(TestCase):
+    """Test suite for the latest article pointers"""
+
+    def setUp(self):
+        self.older, self.newer = create_articles(2, language="es")
+        self.italian = Article.objects.create(
+            title="Vecchio",
+            content="Testo.",
+            language="it",
+            publication_date=date(2023, 12, 1),
+        )
+
+    def latest_id(self, language=None):
+        summary = latest_article(language)
+        return summary and summary["id"]
+
+    def test_pointer_follows_writes(self):
+        """Saving, publishing and deleting articles move the pointer"""
+        self.assertEqual(self.latest_id("es"), self.newer.id)
+        summary = latest_article("es")
+        self.assertEqual(summary["title"], self.newer.title)
+        self.assertEqual(summary["excerpt"], self.newer.content)
+
+        self.newer.is_active = False
+        self.newer.save()
+        self.assertEqual(self.latest_id("es"), self.older.id)
+
+        self.newer.is_active = True
+        self.newer.title = "Publicado"
+        self.newer.save()
+        self.assertEqual(latest_article("es")["title"], "Publicado")
+
+        self.newer.language = "it"
+        self.newer.save()
+        self.assertEqual(self.latest_id("es"), self.older.id)
+        self.assertEqual(self.latest_id("it"), self.newer.id)
+
+        self.newer.delete()
+        self.assertEqual(self.latest_id("it"), self.italian.id)
+        Article.objects.filter(language="it").delete()
+        self.assertIsNone(latest_article("it"))
+        self.assertFalse(LatestArticle.objects.filter(language="it").exists())
+
+        print("✅ Latest article pointers follow every write")
+
+    def test_lookup_is_one_row_read(self):
+        """The home page reads the pointers instead of sorting articles"""
+        with self.assertNumQueries(1):
+            self.assertEqual(self.latest_id("es"), self.newer.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.latest_id(), self.newer.id)
+        self.assertIsNone(latest_article("fr"))
+
+    def test_home_page_and_api(self):
+        """The home page embeds the pointer and the API serves it"""
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, 'id="latest-article"')
+        self.assertEqual(response.context["latest_article"]["id"], self.newer.id)
+
+        url = reverse("api_latest_article")
+        self.assertEqual(
+            self.client.get(url, {"language": "it"}).json()["id"], self.italian.id
+        )
+        self.assertEqual(self.client.get(url, {"language": "fr"}).status_code, 404)
+        self.assertEqual(self.client.get(url, {"language": "xx"}).status_code, 400)
+
+    def test_home_pointer_matches_exported_article(self):
+        """script.js finds the embedded pointer among the exported articles"""
+        response = self.client.get(reverse("home"))
+        pointer = json.loads(
+            re.search(
+                r'<script id="latest-article" type="application/json">(.*?)</script>',
+                response.content.decode(),
+                re.S,
+            ).group(1)
+        )
+        # script.js compares String(article.id) === String(featured.id)
+        exported = [
+            article
+            for article in iter_frontend_articles()
+            if article["id"] == str(pointer["id"])
+        ]
+        self.assertEqual([article["title"] for article in exported], [self.newer.title])
+
+
+class ArticleSearchTestCase(TestCase):
+    """Test suite for the FTS5 article search"""
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse("api_search_articles")
+        self.title_match = Article.objects.create(
+            title="Los lanzamientos aéreos",
+            content="Un texto sobre la ayuda.",
+            language="es",
+            publication_date=date(2024, 1, 1),
+        )
+        self.content_match = Article.objects.create(
+            title="Ayuda humanitaria",
+            content="La ayuda llega por <lanzamientos> aéreos & terrestres.",
+            language="es",
+            level="advanced",
+            publication_date=date(2024, 2, 1),
+        )
+        Article.objects.create(
+            title="Notizie",
+            content="I lanciamenti aerei sono imprecisi.",
+            language="it",
+            publication_date=date(2024, 3, 1),
+        )
+
+    def search(self, q, **params):
+        response = self.client.get(self.url, dict(params, q=q))
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_index_is_installed(self):
+        """The migrations create the FTS5 table"""
+        self.assertTrue(fts_available())
+
+    def test_ranked_accent_insensitive_results(self):
+        """Title matches rank first and accents are ignored"""
+        results = self.search("lanzamientos aereos")
+
+        self.assertEqual(
+            [r["id"] for r in results], [self.title_match.id, self.content_match.id]
+        )
+        self.assertGreater(results[0]["score"], results[1]["score"])
+        self.assertIn("<mark>lanzamientos</mark>", results[1]["snippet"])
+        self.assertIn("&lt;", results[1]["snippet"])
+        self.assertIn("&amp;", results[1]["snippet"])
+
+        self.assertEqual(len(self.search("lanza")), 2)
+        self.assertEqual(len(self.search("aereos", level="advanced")), 1)
+        self.assertEqual(self.search("aerei", language="es"), [])
+
+        print("✅ Full-text search ranks and highlights matches")
+
+    def test_index_follows_writes(self):
+        """Triggers keep the index in sync, bulk updates included"""
+        Article.objects.filter(pk=self.content_match.pk).update(
+            content="Nada que ver.", title="Otro tema"
+        )
+        self.assertEqual(len(self.search("lanzamientos")), 1)
+
+        self.title_match.delete()
+        self.assertEqual(self.search("lanzamientos"), [])
+
+        Article.objects.bulk_create(
+            [
+                Article(
+                    title="Nuevos lanzamientos",
+                    content="Texto.",
+                    language="pt",
+                    publication_date=date(2024, 4, 1),
+                )
+            ]
+        )
+        self.assertEqual(len(self.search("lanzamientos")), 1)
+
+        Article.objects.filter(language="pt").update(is_active=False)
+        self.assertEqual(self.search("lanzamientos"), [])
+
+    def test_user_input_is_not_fts_syntax(self):
+        """Operators and quotes typed by users are matched literally"""
+        self.assertEqual(fts_query('ayuda OR "x'), '"ayuda" AND "OR" AND "x"*')
+        self.assertEqual(fts_query("¿?"), "")
+        self.assertEqual(self.search('ayuda NEAR( "'), [])
+        self.assertEqual(self.search(""), [])
+        self.assertEqual(len(search_articles("ayuda")), 2)
+
+    def test_admin_search_uses_index(self):
+        """The admin changelist search goes through the FTS index"""
+        User.objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.login(username="admin", password="pass")
+
+        response = self.client.get(
+            reverse("admin:authentication_article_changelist"), {"q": "aereos"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {article.id for article in response.context["cl"].result_list},
+            {self.title_match.id, self.content_match.id},
+        )
@@ -174,7 +174,6 @@ class ArticlesVocabularyTestCase(TestCase):
                             article=article,
                             word=word,
                             position_in_text=article_content.find(f"[{bracket_word}]"),
-                            context_sentence=article_content,
                             is_key_vocabulary=True,
                         )
 
@@ -408,7 +407,6 @@ class ArticlesVocabularyTestCase(TestCase):
             article=article,
             word=word,
             position_in_text=13,  # Position of [devastadora]
-            context_sentence=article.content,
             is_key_vocabulary=True,
         )
 
@@ -693,7 +691,6 @@ class ArchiveReadingTestCase(TestCase):
             article=article,
             word=word1,
             position_in_text=19,  # Position of [palabras]
-            context_sentence=article.content,
             is_key_vocabulary=True,
         )
 
@@ -701,7 +698,6 @@ class ArchiveReadingTestCase(TestCase):
             article=article,
             word=word2,
             position_in_text=29,  # Position of [importantes]
-            context_sentence=article.content,
             is_key_vocabulary=True,
         )
 
@@ -889,7 +885,6 @@ class IntegrationUITestCase(TestCase):
             article=article,
             word=word,
             position_in_text=3,  # Position of [integración]
-            context_sentence=article.content,
             is_key_vocabulary=True,
         )
 
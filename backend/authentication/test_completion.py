@@ -0,0 +1,159 @@
+"""
+Tests for vocabulary type-ahead
+
+Test scenarios:
+1. Prefixes match folded spellings, most frequent words first
+2. Cached subtree suggestions follow insertions and removals
+3. Words and translations are suggested per language
+4. The process index follows vocabulary writes and hits skip the database
+5. The complete endpoint validates its parameters
+"""
+
+from datetime import date
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from authentication.completion import (
+    CompletionIndex,
+    PrefixTrie,
+    complete_words,
+    reset_completion_index,
+    suggestion,
+)
+from authentication.models import Article, ArticleWord, Word, WordTranslation
+
+
+def texts(items):
+    return [item.text for item in items]
+
+
+class PrefixTrieTestCase(TestCase):
+    """Test suite for PrefixTrie"""
+
+    def test_ranked_folded_prefixes(self):
+        """Accents and case are ignored; frequency, then length, decides"""
+        trie = PrefixTrie()
+        for text, frequency in [
+            ("cançó", 1),
+            ("canción", 3),
+            ("Canal", 3),
+            ("can", 0),
+            ("perro", 9),
+        ]:
+            trie.add(suggestion(text, text, "es", frequency))
+
+        self.assertEqual(
+            texts(trie.complete("can")), ["Canal", "canción", "cançó", "can"]
+        )
+        self.assertEqual(texts(trie.complete("canc")), ["canción", "cançó"])
+        self.assertEqual(trie.complete("gato"), [])
+
+        print("✅ Prefixes ranked by frequency")
+
+    def test_cached_suggestions_follow_changes(self):
+        """Adding or removing a spelling refreshes the cached best lists"""
+        trie = PrefixTrie()
+        casa = suggestion("casa", "casa", "es", 5)
+        trie.add(casa)
+        self.assertEqual(texts(trie.complete("c")), ["casa"])
+
+        trie.add(suggestion("cosa", "cosa", "es", 8))
+        self.assertEqual(texts(trie.complete("c")), ["cosa", "casa"])
+
+        trie.remove(casa)
+        self.assertEqual(texts(trie.complete("c")), ["cosa"])
+        self.assertEqual(trie.complete("ca"), [])
+
+
+class CompletionIndexTestCase(TestCase):
+    """Test suite for CompletionIndex"""
+
+    def test_words_and_translations(self):
+        """Translations are suggested in their own language"""
+        index = CompletionIndex()
+        index.add(1, "lanzamiento", "es", [("fr", "lancement"), ("it", "lancio")])
+        index.add(2, "lancha", "es", frequency=4)
+
+        self.assertEqual(
+            texts(index.complete("lan")),
+            ["lancha", "lancio", "lancement", "lanzamiento"],
+        )
+        self.assertEqual(texts(index.complete("LAN", "fr")), ["lancement"])
+        self.assertEqual(index.complete("lan", "es", limit=1)[0].word, "lancha")
+
+        index.add(1, "lanzamiento", "es")
+        self.assertEqual(index.complete("lanc", "fr"), [])
+        index.discard("lancha")
+        self.assertEqual(texts(index.complete("l")), ["lanzamiento"])
+        self.assertEqual(len(index), 1)
+
+
+class CompleteWordsTestCase(TestCase):
+    """Test suite for complete_words and its endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        reset_completion_index()
+        self.addCleanup(reset_completion_index)
+        self.client = Client()
+        self.url = reverse("api_complete_words")
+
+        self.agua = Word.objects.create(word="agua", primary_language="es")
+        WordTranslation.objects.create(
+            word=self.agua, language="ca", translation="aigua"
+        )
+        self.aguacate = Word.objects.create(word="aguacate", primary_language="es")
+        article = Article.objects.create(
+            title="Mercado",
+            content="Un [aguacate] y otro [aguacate].",
+            language="es",
+            publication_date=date(2024, 5, 1),
+        )
+        for position in (3, 20):
+            ArticleWord.objects.create(
+                article=article, word=self.aguacate, position_in_text=position
+            )
+
+    def test_follows_vocabulary_writes(self):
+        """Frequent words first; writes reach the index, hits cost no query"""
+        self.assertEqual(
+            [s["text"] for s in complete_words("Águ")], ["aguacate", "agua"]
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                complete_words("ai"),
+                [{"text": "aigua", "word": "agua", "language": "ca"}],
+            )
+
+        WordTranslation.objects.create(
+            word=self.aguacate, language="ca", translation="alvocat"
+        )
+        self.agua.word = "agüita"
+        self.agua.save()
+        self.assertEqual(
+            [s["word"] for s in complete_words("a", "ca")], ["aguacate", "agüita"]
+        )
+        self.assertEqual(
+            [s["text"] for s in complete_words("agua", "es")], ["aguacate"]
+        )
+
+        self.aguacate.delete()
+        self.assertEqual([s["text"] for s in complete_words("a")], ["aigua", "agüita"])
+
+        print("✅ Type-ahead follows the vocabulary")
+
+    def test_complete_endpoint(self):
+        """Suggestions are returned; invalid parameters are rejected"""
+        response = self.client.get(self.url, {"q": "agu", "limit": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"results": [{"text": "aguacate", "word": "aguacate", "language": "es"}]},
+        )
+
+        for params in ({}, {"q": "agu", "limit": "x"}, {"q": "agu", "language": "en"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
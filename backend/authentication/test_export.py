@@ -0,0 +1,678 @@
+"""
+Tests for the frontend export engine
+
+Test scenarios:
+1. Streaming export produces the same payload as the historical sync
+2. Query count does not depend on the size of the catalog
+3. Generator-based JSON writer matches json.dump byte for byte
+4. Delta sync only returns rows changed or deleted since a sync token
+5. Sharded export writes one file per language/level with content hashes
+6. Precompressed variants are served with ETag/Last-Modified revalidation
+7. Parallel export produces the same shards as the sequential one
+8. Edits queue the affected shards and the sync daemon regenerates them
+9. Columnar vocabulary shards decode to the same words as JSON shards
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from authentication.export import (
+    LANGUAGES,
+    LEVELS,
+    MANIFEST_NAME,
+    SYNC_TOKEN_LAG,
+    StreamedDict,
+    StreamedList,
+    brotli,
+    compress_artifact,
+    delta_payload,
+    export_shards,
+    export_shards_parallel,
+    iter_frontend_words,
+    iter_json,
+    parse_sync_token,
+    write_streaming_export,
+)
+from authentication.models import (
+    Article,
+    ArticleWord,
+    PendingShardExport,
+    Word,
+    WordDefinition,
+    WordTranslation,
+)
+from authentication.vocabulary_format import (
+    dumps_vocabulary,
+    encode_vocabulary,
+    iter_vocabulary,
+    load_vocabulary,
+)
+
+
+def create_catalog(size, language="es", level="intermediate", offset=0):
+    """Create ``size`` articles each linked to two words with translations"""
+    articles = []
+    for i in range(offset, offset + size):
+        word = Word.objects.create(word=f"palabra{i}", primary_language=language)
+        for lang_code in ["es", "it", "pt", "ca", "fr"]:
+            WordTranslation.objects.create(
+                word=word, language=lang_code, translation=f"{lang_code}-{i}"
+            )
+        if i % 2 == 0:
+            WordDefinition.objects.create(
+                word=word,
+                grammar_note=f"Nota {i}",
+                usage_example=f"Ejemplo {i}",
+                difficulty_level="advanced",
+            )
+        article = Article.objects.create(
+            title=f"Artículo {i}",
+            content=f"Texto con [palabra{i}] y [palabra{i}].",
+            language=language,
+            level=level,
+            publication_date=date.today() - timedelta(days=i % 3),
+            is_active=True,
+        )
+        for position in (10, 30):
+            ArticleWord.objects.create(
+                article=article,
+                word=word,
+                position_in_text=position,
+            )
+        articles.append(article)
+    return articles
+
+
+class StreamingExportTestCase(TestCase):
+    """Test suite for the streaming sync_articles_to_frontend mode"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def run_sync(self, *extra):
+        output = os.path.join(self.tmpdir.name, "frontend_articles_data.json")
+        call_command(
+            "sync_articles_to_frontend",
+            "--output",
+            output,
+            *extra,
+            stdout=io.StringIO(),
+        )
+        js_path = os.path.join(self.tmpdir.name, "sync_articles.js")
+        with open(output, encoding="utf-8") as f:
+            json_text = f.read()
+        with open(js_path, encoding="utf-8") as f:
+            js_text = f.read()
+        return json_text, js_text
+
+    def test_stream_matches_legacy_output(self):
+        """Streaming and historical exports write identical files"""
+        create_catalog(4)
+        Article.objects.create(
+            title="Inactif",
+            content="Texte",
+            language="fr",
+            publication_date=date.today(),
+            is_active=False,
+        )
+
+        export_time = datetime(2025, 9, 1, 12, 0, tzinfo=dt_timezone.utc)
+        with mock.patch("django.utils.timezone.now", return_value=export_time):
+            legacy_json, legacy_js = self.run_sync()
+            stream_json, stream_js = self.run_sync("--stream", "--chunk-size", "3")
+
+        self.assertEqual(stream_json, legacy_json)
+        self.assertEqual(stream_js, legacy_js)
+
+        payload = json.loads(stream_json)
+        self.assertEqual(payload["total_articles"], 4)
+        self.assertEqual(payload["total_words"], 4)
+        # Articles 0 and 3 share the latest date: the newest id comes first
+        self.assertEqual(
+            payload["linguaromana_custom_articles"][0]["keywords"],
+            ["palabra3", "palabra3"],
+        )
+        self.assertEqual(
+            payload["linguaromana_custom_words"]["palabra1"]["grammar"], ""
+        )
+        self.assertEqual(
+            payload["sync_token"], (export_time - SYNC_TOKEN_LAG).isoformat()
+        )
+
+        print("✅ Streaming export matches legacy output")
+
+    def test_query_count_is_constant(self):
+        """The number of queries does not grow with the catalog"""
+        create_catalog(2)
+
+        def export():
+            write_streaming_export(io.StringIO(), io.StringIO(), chunk_size=2)
+
+        with self.assertNumQueries(4):
+            export()
+
+        create_catalog(10, offset=2)
+
+        with self.assertNumQueries(4):
+            export()
+
+        print("✅ Streaming export uses a constant number of queries")
+
+    def test_empty_catalog(self):
+        """An empty database still produces a valid payload"""
+        json_file, js_file = io.StringIO(), io.StringIO()
+        stats = write_streaming_export(json_file, js_file)
+
+        payload = json.loads(json_file.getvalue())
+        self.assertEqual(stats["articles"], 0)
+        self.assertEqual(payload["linguaromana_custom_articles"], [])
+        self.assertEqual(payload["linguaromana_custom_words"], {})
+        self.assertIsNone(payload["sync_timestamp"])
+        self.assertIn("const articlesData = [];", js_file.getvalue())
+
+    def test_iter_json_matches_json_dumps(self):
+        """Streamed containers encode exactly like json.dumps"""
+        value = {
+            "list": [{"a": 1, "b": ["x", "é\n"]}, 2],
+            "empty": [],
+            "dict": {"k": {"nested": True}},
+        }
+        for indent in (None, 2):
+            with self.subTest(indent=indent):
+                streamed = StreamedDict(
+                    (key, StreamedList(iter(v)) if isinstance(v, list) else v)
+                    for key, v in value.items()
+                )
+                self.assertEqual(
+                    "".join(iter_json(streamed, indent=indent)),
+                    json.dumps(value, ensure_ascii=False, indent=indent),
+                )
+
+
+class DeltaSyncTestCase(TestCase):
+    """Test suite for incremental sync with change watermarks"""
+
+    def setUp(self):
+        self.articles = create_catalog(3)
+        self.since = timezone.now()
+
+    def get_delta(self, since=None):
+        stats = {}
+        chunks = iter_json(StreamedDict(delta_payload(since or self.since, stats)))
+        return json.loads("".join(chunks))
+
+    def test_unchanged_catalog_gives_empty_delta(self):
+        """Nothing changed since the token: the delta is empty"""
+        delta = self.get_delta()
+
+        self.assertEqual(delta["linguaromana_custom_articles"], [])
+        self.assertEqual(delta["linguaromana_custom_words"], {})
+        self.assertEqual(delta["deleted_articles"], [])
+        self.assertEqual(delta["deleted_words"], [])
+        self.assertGreaterEqual(
+            parse_sync_token(delta["sync_token"]), self.since - SYNC_TOKEN_LAG
+        )
+
+    def test_delta_contains_changes_and_deletions(self):
+        """Edits, deactivations and deletions are all reported"""
+        edited, deactivated, deleted = self.articles
+
+        edited.title = "Titre modifié"
+        edited.save()
+        deactivated.is_active = False
+        deactivated.save()
+        deleted_id = deleted.id
+        deleted.delete()
+
+        WordTranslation.objects.filter(word__word="palabra0", language="fr").update(
+            translation="mot", updated_at=timezone.now()
+        )
+        renamed = Word.objects.get(word="palabra1")
+        renamed.word = "vocablo1"
+        renamed.save()
+        WordDefinition.objects.filter(word__word="palabra2").delete()
+
+        delta = self.get_delta()
+
+        self.assertEqual(
+            [a["title"] for a in delta["linguaromana_custom_articles"]],
+            ["Titre modifié"],
+        )
+        self.assertCountEqual(
+            delta["deleted_articles"], [str(deactivated.id), str(deleted_id)]
+        )
+        self.assertEqual(
+            sorted(delta["linguaromana_custom_words"]),
+            ["palabra0", "palabra2", "vocablo1"],
+        )
+        self.assertEqual(delta["linguaromana_custom_words"]["palabra0"]["fr"], "mot")
+        self.assertEqual(delta["deleted_words"], ["palabra1"])
+
+        print("✅ Delta sync reports changed and deleted rows")
+
+    def test_keyword_changes_touch_article(self):
+        """Adding vocabulary to an article marks the article as changed"""
+        article = self.articles[0]
+        ArticleWord.objects.create(
+            article=article,
+            word=Word.objects.get(word="palabra1"),
+            position_in_text=50,
+        )
+
+        delta = self.get_delta()
+
+        self.assertEqual(
+            delta["linguaromana_custom_articles"][0]["keywords"],
+            ["palabra0", "palabra0", "palabra1"],
+        )
+
+    def test_word_rename_touches_articles(self):
+        """Renaming a word resends the articles using it as a keyword"""
+        word = Word.objects.get(word="palabra1")
+        word.word = "vocablo1"
+        word.save()
+
+        delta = self.get_delta()
+
+        self.assertEqual(
+            [
+                (a["title"], a["keywords"])
+                for a in delta["linguaromana_custom_articles"]
+            ],
+            [("Artículo 1", ["vocablo1", "vocablo1"])],
+        )
+
+    def test_delta_endpoint(self):
+        """The delta API validates the token and streams the patch"""
+        client = Client()
+        url = reverse("api_sync_delta")
+
+        self.assertEqual(client.get(url).status_code, 400)
+        self.assertEqual(client.get(url, {"since": "hier"}).status_code, 400)
+
+        self.articles[0].save()
+        response = client.get(url, {"since": self.since.isoformat()})
+
+        self.assertEqual(response.status_code, 200)
+        delta = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(delta["linguaromana_custom_articles"]), 1)
+
+
+class ShardedExportTestCase(TestCase):
+    """Test suite for the sharded export and its manifest"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.directory = self.tmpdir.name
+        create_catalog(2, language="es", level="beginner")
+        create_catalog(1, language="fr", level="advanced", offset=2)
+
+    def read_shard(self, manifest, key):
+        path = os.path.join(self.directory, manifest["shards"][key]["file"])
+        with open(path, "rb") as f:
+            data = f.read()
+        return data, json.loads(data)
+
+    def test_manifest_lists_every_shard_with_hash(self):
+        """Each (language, level) and vocabulary shard is written and hashed"""
+        manifest = export_shards(self.directory)
+
+        self.assertEqual(len(manifest["shards"]), len(LANGUAGES) * (len(LEVELS) + 1))
+        for key, entry in manifest["shards"].items():
+            data, _ = self.read_shard(manifest, key)
+            self.assertEqual(entry["sha256"], hashlib.sha256(data).hexdigest())
+            self.assertEqual(entry["bytes"], len(data))
+
+        _, spanish_beginner = self.read_shard(manifest, "articles/es/beginner")
+        self.assertEqual(len(spanish_beginner), 2)
+        self.assertEqual(manifest["shards"]["articles/fr/advanced"]["count"], 1)
+        _, empty = self.read_shard(manifest, "articles/it/intermediate")
+        self.assertEqual(empty, [])
+        _, french_words = self.read_shard(manifest, "words/fr")
+        self.assertEqual(list(french_words), ["palabra2"])
+
+        with open(os.path.join(self.directory, MANIFEST_NAME)) as f:
+            self.assertEqual(json.load(f), manifest)
+
+        print("✅ Sharded export writes hashed shards and manifest")
+
+    def test_only_changed_shards_change_hash(self):
+        """Editing a French article leaves the Spanish shards untouched"""
+        before = export_shards(self.directory)["shards"]
+
+        article = Article.objects.get(language="fr")
+        article.title = "Nouveau titre"
+        article.save()
+        after = export_shards(self.directory)["shards"]
+
+        changed = [
+            key for key in after if after[key]["sha256"] != before[key]["sha256"]
+        ]
+        self.assertEqual(changed, ["articles/fr/advanced"])
+
+    def test_partial_export_keeps_other_entries(self):
+        """Regenerating some shards merges them into the existing manifest"""
+        before = export_shards(self.directory)
+
+        Word.objects.filter(word="palabra0").update(primary_language="it")
+        after = export_shards(self.directory, keys=["words/es", "words/it"])
+
+        self.assertEqual(set(after["shards"]), set(before["shards"]))
+        self.assertEqual(after["shards"]["words/it"]["count"], 1)
+        self.assertEqual(
+            after["shards"]["articles/es/beginner"],
+            before["shards"]["articles/es/beginner"],
+        )
+
+
+class SyncServingTestCase(TestCase):
+    """Test suite for precompressed sync artifacts and their conditional serving"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.settings_override = override_settings(SYNC_EXPORT_ROOT=self.tmpdir.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        create_catalog(3)
+        self.manifest = export_shards(self.tmpdir.name, compress=True)
+        self.client = Client()
+        self.url = reverse("serve_sync_export", args=["articles-es-intermediate.json"])
+
+    def read(self, name):
+        with open(os.path.join(self.tmpdir.name, name), "rb") as f:
+            return f.read()
+
+    def test_variants_written_next_to_artifacts(self):
+        """Every shard and the manifest get a gzip (and brotli) variant"""
+        for name in ["manifest.json", "articles-es-intermediate.json"]:
+            original = self.read(name)
+            self.assertEqual(gzip.decompress(self.read(name + ".gz")), original)
+            if brotli is not None:
+                self.assertEqual(brotli.decompress(self.read(name + ".br")), original)
+
+        path = os.path.join(self.tmpdir.name, "manifest.json")
+        with open(path + ".gz", "rb") as f:
+            first = f.read()
+        compress_artifact(path)
+        self.assertEqual(self.read("manifest.json.gz"), first)
+
+    def test_content_negotiation(self):
+        """The best accepted precompressed variant is served"""
+        original = self.read("articles-es-intermediate.json")
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), original
+        )
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(b"".join(response.streaming_content), original)
+        self.assertEqual(response["Content-Type"], "application/json; charset=utf-8")
+
+        if brotli is not None:
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+            self.assertEqual(response["Content-Encoding"], "br")
+
+        print("✅ Precompressed sync variants negotiated")
+
+    def test_conditional_requests(self):
+        """Unchanged artifacts are answered with an empty 304"""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        etag = response["ETag"]
+        last_modified = response["Last-Modified"]
+        self.assertTrue(etag.startswith('"') and etag.endswith('-gzip"'))
+
+        response = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        # The identity and gzip representations have different strong ETags
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url + "?v=abc")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_only_export_files_are_served(self):
+        """Paths outside the export root or with other extensions are refused"""
+        for path in ["../settings.py", "articles-es-intermediate.json.gz", "nope.json"]:
+            with self.subTest(path=path):
+                response = self.client.get(f"/sync/{path}")
+                self.assertEqual(response.status_code, 404)
+
+
+class ParallelExportTestCase(TransactionTestCase):
+    """Test suite for the per-language parallel export"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        create_catalog(2, language="es", level="beginner")
+        create_catalog(2, language="pt", level="advanced", offset=2)
+
+    def test_parallel_manifest_matches_sequential(self):
+        """Workers export each language and the parent merges the manifest"""
+        sequential_dir = os.path.join(self.tmpdir.name, "sequential")
+        parallel_dir = os.path.join(self.tmpdir.name, "parallel")
+
+        sequential = export_shards(sequential_dir)
+        # Threads share the test database, unlike worker processes
+        parallel = export_shards_parallel(
+            parallel_dir, workers=3, executor_class=ThreadPoolExecutor
+        )
+
+        self.assertEqual(parallel["shards"], sequential["shards"])
+        with open(os.path.join(parallel_dir, MANIFEST_NAME)) as f:
+            self.assertEqual(json.load(f), parallel)
+
+        print("✅ Parallel export matches sequential export")
+
+    def test_partial_languages_merge_into_manifest(self):
+        """Exporting a subset of languages keeps the other entries"""
+        export_shards(self.tmpdir.name)
+        Article.objects.filter(language="pt").update(title="Novo título")
+
+        manifest = export_shards_parallel(
+            self.tmpdir.name,
+            workers=1,
+            languages=["pt"],
+            executor_class=ThreadPoolExecutor,
+        )
+
+        self.assertEqual(len(manifest["shards"]), len(LANGUAGES) * (len(LEVELS) + 1))
+        with open(os.path.join(self.tmpdir.name, "articles-pt-advanced.json")) as f:
+            self.assertEqual(json.load(f)[0]["title"], "Novo título")
+
+    def test_workers_require_shards(self):
+        """--workers only applies to the sharded export"""
+        with self.assertRaises(CommandError):
+            call_command("sync_articles_to_frontend", "--workers", "2")
+
+
+class SyncDaemonTestCase(TestCase):
+    """Test suite for the signal-driven shard queue and the sync daemon"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.article = create_catalog(1, language="es", level="beginner")[0]
+        PendingShardExport.objects.all().delete()
+
+    def queued(self):
+        return set(PendingShardExport.objects.values_list("shard_key", flat=True))
+
+    def test_article_edit_queues_old_and_new_shard(self):
+        """Moving an article to another level queues both shards"""
+        self.article.level = "advanced"
+        self.article.save()
+
+        self.assertEqual(
+            self.queued(), {"articles/es/beginner", "articles/es/advanced"}
+        )
+
+    def test_word_changes_queue_vocabulary_shard(self):
+        """Translations queue their word shard, renames the article shards too"""
+        word = Word.objects.get(word="palabra0")
+        WordTranslation.objects.get(word=word, language="it").delete()
+        self.assertEqual(self.queued(), {"words/es"})
+
+        word.word = "vocablo"
+        word.save()
+        self.assertEqual(self.queued(), {"words/es", "articles/es/beginner"})
+
+    def test_daemon_regenerates_queued_shards(self):
+        """--once exports only the queued shards and empties the queue"""
+        export_shards(self.tmpdir.name)
+        before = os.stat(os.path.join(self.tmpdir.name, "words-es.json")).st_mtime_ns
+
+        self.article.title = "Nuevo título"
+        self.article.save()
+        call_command(
+            "run_sync_daemon",
+            "--once",
+            "--shards",
+            self.tmpdir.name,
+            stdout=io.StringIO(),
+        )
+
+        self.assertEqual(self.queued(), set())
+        with open(os.path.join(self.tmpdir.name, "articles-es-beginner.json")) as f:
+            self.assertEqual(json.load(f)[0]["title"], "Nuevo título")
+        after = os.stat(os.path.join(self.tmpdir.name, "words-es.json")).st_mtime_ns
+        self.assertEqual(after, before)
+
+        print("✅ Sync daemon regenerates only the queued shards")
+
+    def test_requeued_shard_survives_export(self):
+        """A shard edited again during the export stays in the queue"""
+        self.article.save()
+        original = export_shards
+
+        def export_during_edit(*args, **kwargs):
+            manifest = original(*args, **kwargs)
+            PendingShardExport.objects.update(
+                queued_at=timezone.now() + timedelta(seconds=1)
+            )
+            return manifest
+
+        with mock.patch(
+            "authentication.management.commands.run_sync_daemon.export_shards",
+            export_during_edit,
+        ):
+            call_command(
+                "run_sync_daemon",
+                "--once",
+                "--shards",
+                self.tmpdir.name,
+                stdout=io.StringIO(),
+            )
+
+        self.assertEqual(self.queued(), {"articles/es/beginner"})
+
+
+class ColumnarVocabularyTestCase(TestCase):
+    """Test suite for the compact columnar vocabulary format"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        # Like real dictionaries, many words share translations and notes
+        for i in range(60):
+            word = Word.objects.create(word=f"vocablo{i}", primary_language="es")
+            for lang_code in ["es", "it", "pt", "ca", "fr"]:
+                WordTranslation.objects.create(
+                    word=word, language=lang_code, translation=f"{lang_code}-{i % 6}"
+                )
+            WordDefinition.objects.create(
+                word=word,
+                grammar_note="Sustantivo masculino",
+                usage_example=f"Ejemplo {i % 4}",
+                difficulty_level="beginner",
+            )
+
+    def test_round_trip_preserves_entries(self):
+        """Decoding the columnar payload gives back the JSON vocabulary"""
+        words = dict(iter_frontend_words())
+        payload = json.loads(dumps_vocabulary(encode_vocabulary(words.items())))
+
+        self.assertEqual(payload["count"], 60)
+        self.assertEqual(payload["strings"][:60], list(words))
+        self.assertEqual(payload["enums"]["primary_language"], ["es"])
+        self.assertEqual(dict(iter_vocabulary(payload)), words)
+        self.assertEqual(
+            list(dict(iter_vocabulary(payload))["vocablo0"]), list(words["vocablo0"])
+        )
+
+        # Repeated translations and notes are stored once
+        self.assertEqual(len(payload["strings"]), len(set(payload["strings"])))
+        self.assertLess(
+            len(dumps_vocabulary(payload)),
+            len(json.dumps(words, ensure_ascii=False)) // 2,
+        )
+
+        print("✅ Columnar vocabulary round-trips and is smaller")
+
+    def test_unknown_format_is_rejected(self):
+        """The reader refuses payloads it does not understand"""
+        payload = encode_vocabulary([])
+        payload["version"] = 99
+        with self.assertRaises(ValueError):
+            list(iter_vocabulary(payload))
+
+    def test_columnar_vocabulary_shards(self):
+        """--vocab-format columnar writes decodable vocabulary shards"""
+        json_dir = os.path.join(self.tmpdir.name, "json")
+        columnar_dir = os.path.join(self.tmpdir.name, "columnar")
+        json_manifest = export_shards(json_dir, keys=["words/es"])
+        call_command(
+            "sync_articles_to_frontend",
+            "--shards",
+            columnar_dir,
+            "--vocab-format",
+            "columnar",
+            stdout=io.StringIO(),
+        )
+
+        manifest = json.load(open(os.path.join(columnar_dir, MANIFEST_NAME)))
+        entry = manifest["shards"]["words/es"]
+        self.assertEqual(entry["format"], "columnar")
+        self.assertNotIn("format", manifest["shards"]["articles/es/intermediate"])
+        self.assertLess(entry["bytes"], json_manifest["shards"]["words/es"]["bytes"])
+
+        with open(os.path.join(json_dir, "words-es.json")) as f:
+            expected = json.load(f)
+        self.assertEqual(
+            load_vocabulary(os.path.join(columnar_dir, entry["file"])), expected
+        )
+
+    def test_vocab_format_requires_shards(self):
+        """The columnar layout only applies to vocabulary shards"""
+        with self.assertRaises(CommandError):
+            call_command("sync_articles_to_frontend", "--vocab-format", "columnar")
@@ -0,0 +1,166 @@
+"""
+Tests for "did you mean" word lookups
+
+Test scenarios:
+1. Edit distances count transpositions as one edit and stop at the limit
+2. Misspellings within two edits find words and translations, closest first
+3. Removed spellings leave no deletions behind
+4. The process index follows vocabulary writes and hits skip the database
+5. The suggest endpoint validates its parameters
+"""
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from authentication.fuzzy import (
+    MAX_DISTANCE,
+    FuzzyIndex,
+    deletions,
+    edit_distance,
+    reset_fuzzy_index,
+    suggest_words,
+)
+from authentication.models import Word, WordTranslation
+
+
+def texts(matches):
+    return [item.text for _, item in matches]
+
+
+class EditDistanceTestCase(TestCase):
+    """Test suite for edit_distance and deletions"""
+
+    def test_edit_distance(self):
+        """Insertions, deletions, substitutions and swaps cost one edit"""
+        self.assertEqual(edit_distance("lanzamentos", "lanzamientos"), 1)
+        self.assertEqual(edit_distance("perro", "pero"), 1)
+        self.assertEqual(edit_distance("casa", "cosa"), 1)
+        self.assertEqual(edit_distance("casa", "csaa"), 1)
+        self.assertEqual(edit_distance("casa", "cosas"), 2)
+        self.assertEqual(edit_distance("casa", "caballo"), MAX_DISTANCE + 1)
+        self.assertEqual(edit_distance("", "ab"), 2)
+
+    def test_deletions(self):
+        """Spellings within two edits share a deletion"""
+        self.assertEqual(deletions("abc", 1), {"abc", "ab", "ac", "bc"})
+        self.assertTrue(deletions("lanzamentos") & deletions("lanzamientos"))
+        self.assertFalse(deletions("casa") & deletions("perro"))
+
+
+class FuzzyIndexTestCase(TestCase):
+    """Test suite for FuzzyIndex"""
+
+    def test_close_words_and_translations(self):
+        """Closest spellings first, then the most frequent words"""
+        index = FuzzyIndex()
+        index.add(1, "lanzamientos", "es", [("pt", "lançamentos")], frequency=2)
+        index.add(2, "controversia", "es", [("fr", "controverse")])
+        index.add(3, "lanzamiento", "es", frequency=5)
+
+        self.assertEqual(
+            texts(index.lookup("lanzamentos")),
+            ["lançamentos", "lanzamientos", "lanzamiento"],
+        )
+        self.assertEqual(
+            [distance for distance, _ in index.lookup("lanzamentos")], [1, 1, 2]
+        )
+        self.assertEqual(
+            texts(index.lookup("lanzamentos", "es", limit=1)), ["lanzamientos"]
+        )
+        self.assertEqual(
+            texts(index.lookup("CONTROVERSÍA")), ["controversia", "controverse"]
+        )
+        self.assertEqual(texts(index.lookup("controvers", "fr")), ["controverse"])
+        self.assertEqual(index.lookup("gato"), [])
+
+        print("✅ Misspellings find their words")
+
+    def test_removal_cleans_deletions(self):
+        """Replacing or discarding a word removes its spellings"""
+        index = FuzzyIndex()
+        index.add(1, "casa", "es", [("ca", "casa")])
+        index.add(1, "casa", "es")
+        self.assertEqual(
+            [(item.text, item.language) for _, item in index.lookup("cas")],
+            [("casa", "es")],
+        )
+
+        index.discard("casa")
+        self.assertEqual(index.lookup("casa"), [])
+        self.assertEqual(index._deletions, {})
+        self.assertEqual(len(index), 0)
+
+
+class SuggestWordsTestCase(TestCase):
+    """Test suite for suggest_words and its endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        reset_fuzzy_index()
+        self.addCleanup(reset_fuzzy_index)
+        self.client = Client()
+        self.url = reverse("api_suggest_words")
+
+        self.crisis = Word.objects.create(word="crisis", primary_language="es")
+        WordTranslation.objects.create(
+            word=self.crisis, language="fr", translation="crise"
+        )
+
+    def test_follows_vocabulary_writes(self):
+        """Writes reach the index, hits cost no query"""
+        self.assertEqual(
+            suggest_words("crisi"),
+            [
+                {"text": "crise", "word": "crisis", "language": "fr", "distance": 1},
+                {"text": "crisis", "word": "crisis", "language": "es", "distance": 1},
+            ],
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [s["text"] for s in suggest_words("cirsis", "es")], ["crisis"]
+            )
+
+        WordTranslation.objects.create(
+            word=self.crisis, language="it", translation="crisi"
+        )
+        self.assertEqual(suggest_words("crisi", "it")[0]["distance"], 0)
+
+        self.crisis.word = "crisi"
+        self.crisis.save()
+        self.assertEqual(
+            [(s["text"], s["distance"]) for s in suggest_words("crisis", "es")],
+            [("crisi", 1)],
+        )
+
+        self.crisis.delete()
+        self.assertEqual(suggest_words("crisi"), [])
+
+        print("✅ Suggestions follow the vocabulary")
+
+    def test_suggest_endpoint(self):
+        """Suggestions are returned; invalid parameters are rejected"""
+        response = self.client.get(self.url, {"q": "Crísys", "language": "es"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {
+                        "text": "crisis",
+                        "word": "crisis",
+                        "language": "es",
+                        "distance": 1,
+                    }
+                ]
+            },
+        )
+
+        for params in (
+            {},
+            {"q": "crisi", "limit": "x"},
+            {"q": "crisi", "language": "en"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
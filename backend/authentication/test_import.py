@@ -0,0 +1,187 @@
+"""
+Tests for the bulk article import
+
+Test scenarios:
+1. JSON lines become articles with their bracketed vocabulary
+2. Existing words are reused, missing ones created in the article language
+3. Invalid lines are reported with their line number and skipped
+4. Derived data is filled as if the articles had been saved one by one
+5. The number of queries per batch does not grow with the batch size
+6. Known words that are not bracketed are linked by the annotator
+"""
+
+import io
+import json
+import tempfile
+from datetime import date
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from authentication.annotation import reset_automaton
+from authentication.articles import latest_article
+from authentication.importer import import_articles
+from authentication.models import (
+    ArchiveMonth,
+    Article,
+    ArticleWord,
+    PendingShardExport,
+    Word,
+)
+from authentication.search import search_articles
+
+
+def article_line(index, language="es", **fields):
+    data = {
+        "title": f"Artículo {index}",
+        "content": f"El [agua] es vida. Come [pan] número {index}.",
+        "language": language,
+        "level": "beginner",
+        "publication_date": f"2024-03-{index % 28 + 1:02d}",
+    }
+    data.update(fields)
+    return json.dumps(data, ensure_ascii=False)
+
+
+def run_import(lines, batch_size=100):
+    return list(import_articles(lines, batch_size=batch_size))[-1]
+
+
+class ArticleImportTestCase(TestCase):
+    """Test suite for import_articles"""
+
+    def setUp(self):
+        reset_automaton()
+        self.addCleanup(reset_automaton)
+
+    def test_import_articles_with_vocabulary(self):
+        """Articles, words and occurrences are created in bulk"""
+        stats = run_import([article_line(i) for i in range(5)], batch_size=2)
+
+        self.assertEqual(stats["articles"], 5)
+        self.assertEqual(stats["words"], 2)
+        self.assertEqual(stats["occurrences"], 10)
+        self.assertEqual(Article.objects.count(), 5)
+
+        article = Article.objects.get(title="Artículo 3")
+        self.assertEqual(article.title_key, "articulo 3")
+        self.assertEqual(article.sentence(1), "Come pan número 3.")
+        occurrences = ArticleWord.objects.filter(article=article).select_related("word")
+        self.assertEqual(
+            [(o.word.word, o.position_in_text, o.sentence_index) for o in occurrences],
+            [("agua", 3, 0), ("pan", 22, 1)],
+        )
+        self.assertTrue(all(o.is_key_vocabulary for o in occurrences))
+
+        print("✅ Articles imported with their vocabulary")
+
+    def test_existing_words_reused(self):
+        """Only missing words are created, in the language of the article"""
+        agua = Word.objects.create(word="agua", primary_language="es")
+
+        stats = run_import([article_line(1, language="it")])
+
+        self.assertEqual(stats["words"], 1)
+        self.assertEqual(Word.objects.get(word="pan").primary_language, "it")
+        self.assertEqual(Word.objects.get(word="pan").word_key, "pan")
+        self.assertEqual(ArticleWord.objects.filter(word=agua).count(), 1)
+
+    def test_known_words_annotated(self):
+        """Known words outside brackets are linked as non-key vocabulary"""
+        vida = Word.objects.create(word="vida", primary_language="es")
+
+        stats = run_import([article_line(i) for i in range(3)], batch_size=2)
+
+        self.assertEqual(stats["occurrences"], 6)
+        self.assertEqual(stats["annotated"], 3)
+        self.assertEqual(
+            list(
+                ArticleWord.objects.filter(word=vida).values_list(
+                    "position_in_text", "sentence_index", "is_key_vocabulary"
+                )
+            ),
+            [(11, 0, False)] * 3,
+        )
+
+    def test_invalid_lines_skipped(self):
+        """Invalid lines are reported and do not stop the import"""
+        lines = [
+            article_line(1),
+            "not json",
+            "",
+            article_line(2, language="xx"),
+            article_line(3, publication_date="2024-02-30"),
+            article_line(4, is_active="no"),
+            json.dumps({"title": "Sin contenido"}),
+            article_line(6, title=5),
+            article_line(7, content=5),
+            article_line(8, level=["beginner"]),
+            article_line(5),
+        ]
+        stats = run_import(lines)
+
+        self.assertEqual(stats["articles"], 2)
+        self.assertEqual(stats["lines"], 11)
+        self.assertEqual(
+            [number for number, _ in stats["errors"]], [2, 4, 5, 6, 7, 8, 9, 10]
+        )
+        self.assertIn("Unknown language", stats["errors"][1][1])
+        self.assertEqual(stats["errors"][5][1], "title must be a string")
+
+    def test_derived_data_maintained(self):
+        """Archive counts, latest article, search and shards follow the import"""
+        run_import(
+            [
+                article_line(1),
+                article_line(2, publication_date="2024-04-01"),
+                article_line(3, is_active=False),
+            ]
+        )
+
+        self.assertEqual(
+            {
+                (row.year, row.month): (row.article_count, row.active_count)
+                for row in ArchiveMonth.objects.all()
+            },
+            {(2024, 3): (2, 1), (2024, 4): (1, 1)},
+        )
+        self.assertEqual(latest_article("es")["title"], "Artículo 2")
+        self.assertEqual(len(search_articles("número")), 2)
+        self.assertEqual(
+            set(PendingShardExport.objects.values_list("shard_key", flat=True)),
+            {"articles/es/beginner", "words/es"},
+        )
+
+    def test_queries_per_batch_are_bounded(self):
+        """A batch costs the same number of queries whatever its size"""
+        run_import([article_line(0)])
+
+        def queries(count):
+            lines = [article_line(i, title=f"{count} {i}") for i in range(count)]
+            with CaptureQueriesContext(connection) as context:
+                run_import(lines, batch_size=count)
+            return len(context)
+
+        self.assertEqual(queries(1), queries(50))
+
+
+class ImportArticlesCommandTestCase(TestCase):
+    """Test suite for the import_articles management command"""
+
+    def test_command_reports_throughput(self):
+        """The command imports a file and reports counts and rate"""
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8") as f:
+            f.write("\n".join([article_line(1), "{", article_line(2)]) + "\n")
+            f.flush()
+            out = io.StringIO()
+            call_command("import_articles", f.name, batch_size=1, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("2 article(s), 4 occurrence(s)", output)
+        self.assertIn("articles/s", output)
+        self.assertIn("Ligne 2", output)
+        self.assertEqual(
+            Article.objects.filter(publication_date=date(2024, 3, 2)).count(), 1
+        )
@@ -0,0 +1,225 @@
+"""
+Tests for the inflected forms of vocabulary words
+
+Test scenarios:
+1. Suffix rules generate plurals, feminines and verb forms per language
+2. Forms are generated on save and rebuilt on rename; editor forms are kept
+3. A form resolves to its word in one query, exact spellings first
+4. Bracketed forms and imported forms are linked to their word
+5. Annotation finds the forms of known words
+6. The rebuild_word_forms command regenerates every form and reloads the
+   annotator without touching the words
+"""
+
+import io
+import json
+from datetime import date
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from authentication.annotation import (
+    VocabularyAutomaton,
+    annotate_articles,
+    reset_automaton,
+)
+from authentication.articles import sync_article_words
+from authentication.importer import import_articles
+from authentication.inflection import inflect, lookup_words
+from authentication.models import Article, ArticleWord, Word, WordForm
+
+
+def forms(word):
+    return set(word.forms.values_list("form", flat=True))
+
+
+class InflectTestCase(TestCase):
+    """Test suite for the suffix rules"""
+
+    def test_rules_per_language(self):
+        """Each language inflects nouns, adjectives and verbs its own way"""
+        self.assertEqual(
+            inflect("lanzamiento", "es"),
+            ["lanzamienta", "lanzamientas", "lanzamientos"],
+        )
+        self.assertEqual(inflect("nación", "es"), ["naciones"])
+        self.assertIn("hablaron", inflect("hablar", "es"))
+        self.assertEqual(inflect("amico", "it"), ["amica", "amiche", "amichi"])
+        self.assertIn("cantiamo", inflect("cantare", "it"))
+        self.assertEqual(inflect("animal", "pt"), ["animais"])
+        self.assertIn("chevaux", inflect("cheval", "fr"))
+        self.assertIn("parlons", inflect("parler", "fr"))
+        self.assertEqual(inflect("vaca", "ca"), ["vaques"])
+        self.assertEqual(inflect("cançó", "ca"), ["cançons"])
+
+        # Invariable words and stems too short to inflect
+        self.assertEqual(inflect("crisis", "es"), [])
+        self.assertEqual(inflect("ir", "es"), [])
+        self.assertEqual(inflect("agua", "xx"), [])
+
+        print("✅ Suffix rules inflect the five languages")
+
+
+class WordFormTestCase(TestCase):
+    """Test suite for the WordForm index"""
+
+    def test_forms_follow_the_word(self):
+        """Saving a word generates its forms; editor forms survive renames"""
+        word = Word.objects.create(word="gato", primary_language="es")
+        self.assertEqual(forms(word), {"gato", "gata", "gatos", "gatas"})
+        self.assertEqual(
+            WordForm.objects.get(word=word, form="gatos").form_key, "gatos"
+        )
+
+        WordForm.objects.create(word=word, form="michino")
+        word.word = "perro"
+        word.save()
+        self.assertEqual(forms(word), {"perro", "perra", "perros", "perras", "michino"})
+
+        word.primary_language = "it"
+        word.save()
+        self.assertEqual(forms(word), {"perro", "perri", "perra", "perre", "michino"})
+
+        print("✅ Forms are rebuilt with their word")
+
+    def test_editor_form_moves_watermark(self):
+        """An irregular form added by an editor touches its word"""
+        word = Word.objects.create(word="ir", primary_language="es")
+        before = word.updated_at
+
+        WordForm.objects.create(word=word, form="fue")
+
+        word.refresh_from_db()
+        self.assertGreater(word.updated_at, before)
+
+    def test_lookup_words(self):
+        """Forms resolve in one query, accents and case ignored"""
+        lanzamiento = Word.objects.create(word="lanzamiento", primary_language="es")
+        lanzamientos = Word.objects.create(word="lanzamientos", primary_language="es")
+        Word.objects.create(word="amico", primary_language="it")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(lookup_words("Lanzamientos"), [lanzamientos, lanzamiento])
+        self.assertEqual(lookup_words("lanzamienta", "es"), [lanzamiento])
+        self.assertEqual(lookup_words("amichi", "es"), [])
+        self.assertEqual([word.word for word in lookup_words("AMICHI")], ["amico"])
+
+
+class FormLinkingTestCase(TestCase):
+    """Test suite for forms in articles"""
+
+    def setUp(self):
+        reset_automaton()
+        self.addCleanup(reset_automaton)
+        self.lanzamiento = Word.objects.create(
+            word="lanzamiento", primary_language="es"
+        )
+
+    def test_bracketed_forms_linked_to_their_word(self):
+        """A bracketed form is key vocabulary of its word"""
+        article = Article.objects.create(
+            title="Cohetes",
+            content="Los [lanzamientos] y los [despegues].",
+            language="es",
+            publication_date=date(2024, 5, 1),
+        )
+
+        sync_article_words(article)
+
+        self.assertEqual(
+            [
+                (aw.word.word, aw.position_in_text)
+                for aw in ArticleWord.objects.filter(article=article)
+                .select_related("word")
+                .order_by("position_in_text")
+            ],
+            [("lanzamiento", 4), ("despegues", 23)],
+        )
+        self.assertFalse(Word.objects.filter(word="lanzamientos").exists())
+
+        print("✅ Bracketed forms link to their word")
+
+    def test_imported_forms_linked_to_their_word(self):
+        """The importer resolves forms and generates the forms of new words"""
+        line = json.dumps(
+            {
+                "title": "Cohetes",
+                "content": "Dos [lanzamientos] y un [cohete].",
+                "language": "es",
+                "publication_date": "2024-05-01",
+            }
+        )
+
+        stats = list(import_articles([line]))[-1]
+
+        self.assertEqual(stats["words"], 1)
+        self.assertEqual(
+            set(ArticleWord.objects.values_list("word__word", flat=True)),
+            {"lanzamiento", "cohete"},
+        )
+        self.assertIn("cohetes", forms(Word.objects.get(word="cohete")))
+
+    def test_annotation_finds_forms(self):
+        """Forms are annotated, the word spelled that way winning"""
+        automaton = VocabularyAutomaton()
+        automaton.add(1, "gato", "es", ["gatos", "gata"])
+        automaton.add(2, "gata", "es", ["gatas"])
+        self.assertEqual(
+            automaton.annotate("Los gatos y la gata.", "es"), [(4, 9, 1), (15, 19, 2)]
+        )
+        automaton.add(1, "gato", "es")
+        self.assertEqual(automaton.annotate("Los gatos.", "es"), [])
+
+        article = Article.objects.create(
+            title="Cohetes",
+            content="Los [lanzamientos] de hoy. Tres lanzamientos más.",
+            language="es",
+            publication_date=date(2024, 5, 1),
+        )
+        sync_article_words(article)
+
+        self.assertEqual(annotate_articles([article]), 1)
+        self.assertEqual(
+            list(
+                ArticleWord.objects.filter(article=article)
+                .order_by("position_in_text")
+                .values_list("word__word", "position_in_text", "is_key_vocabulary")
+            ),
+            [("lanzamiento", 4, True), ("lanzamiento", 30, False)],
+        )
+
+
+class RebuildWordFormsCommandTestCase(TestCase):
+    """Test suite for the rebuild_word_forms management command"""
+
+    def test_command_rebuilds_forms(self):
+        """Missing generated forms come back, editor forms stay"""
+        word = Word.objects.create(word="cheval", primary_language="fr")
+        WordForm.objects.create(word=word, form="canasson")
+        WordForm.objects.filter(word=word, is_generated=True).delete()
+
+        out = io.StringIO()
+        call_command("rebuild_word_forms", stdout=out)
+
+        self.assertIn("chevaux", forms(word))
+        self.assertIn("canasson", forms(word))
+        self.assertIn("forme(s) générée(s) pour 1 mot(s)", out.getvalue())
+
+    def test_command_reloads_annotator(self):
+        """Rebuilt forms reach a running annotator, word watermarks stay"""
+        reset_automaton()
+        word = Word.objects.create(word="cohete", primary_language="es")
+        WordForm.objects.filter(word=word, form="cohetes").delete()
+        article = Article.objects.create(
+            title="Cohetes",
+            content="Tres cohetes.",
+            language="es",
+            publication_date=date(2024, 5, 1),
+        )
+        self.assertEqual(annotate_articles([article]), 0)
+        updated_at = Word.objects.get(pk=word.pk).updated_at
+
+        call_command("rebuild_word_forms", stdout=io.StringIO())
+
+        self.assertEqual(Word.objects.get(pk=word.pk).updated_at, updated_at)
+        self.assertEqual(annotate_articles([article]), 1)
@@ -0,0 +1,335 @@
+"""
+Tests for article text processing
+
+Test scenarios:
+1. Sentence segmentation returns trimmed offset pairs
+2. Articles store their sentence offsets on save
+3. Word occurrences reference their sentence instead of copying the article
+4. Search keys fold accents, case and Catalan "l·l"
+5. Search key columns are filled on save, backfilled and queried by index,
+   in the admin search too
+6. The [word] markup is stripped in one pass with clean text coordinates
+7. Editing an article, in the admin or not, resyncs its vocabulary from the
+   markup
+"""
+
+import io
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from authentication.annotation import reset_automaton
+from authentication.models import Article, ArticleWord, Word, WordTranslation
+from authentication.text import (
+    fold,
+    parse_markup,
+    prefix_lookup,
+    sentence_index_at,
+    sentence_spans,
+)
+
+
+class SentenceSegmentationTestCase(TestCase):
+    """Test suite for sentence segmentation"""
+
+    def slices(self, text):
+        return [text[start:end] for start, end in sentence_spans(text)]
+
+    def test_sentences_split_on_punctuation_and_lines(self):
+        """Terminal punctuation followed by a space or a line break ends a sentence"""
+        text = "¿Qué pasa? Nada. «Todo va bien.» Sí…\n\nNuevo párrafo sin punto"
+
+        self.assertEqual(
+            self.slices(text),
+            [
+                "¿Qué pasa?",
+                "Nada.",
+                "«Todo va bien.»",
+                "Sí…",
+                "Nuevo párrafo sin punto",
+            ],
+        )
+        print("✅ Sentences split on punctuation and line breaks")
+
+    def test_inner_punctuation_does_not_split(self):
+        """Decimals and abbreviations glued to the next word stay in the sentence"""
+        self.assertEqual(
+            self.slices("Costó 3.5 euros, etc.Fin."), ["Costó 3.5 euros, etc.Fin."]
+        )
+        self.assertEqual(sentence_spans("   "), [])
+
+    def test_sentence_index_at(self):
+        """Positions map to the sentence containing them"""
+        spans = sentence_spans("Uno dos. Tres cuatro. Cinco.")
+
+        self.assertEqual(sentence_index_at(spans, 0), 0)
+        self.assertEqual(sentence_index_at(spans, 8), 0)
+        self.assertEqual(sentence_index_at(spans, 9), 1)
+        self.assertEqual(sentence_index_at(spans, 27), 2)
+        self.assertIsNone(sentence_index_at([], 3))
+
+
+class MarkupTestCase(TestCase):
+    """Test suite for parse_markup"""
+
+    def test_markup_stripped_with_clean_positions(self):
+        """Spans and sentences point into the text without brackets"""
+        markup = parse_markup("La [crisis] [humanitaria]. Otra [frase larga] aquí.")
+
+        self.assertEqual(markup.text, "La crisis humanitaria. Otra frase larga aquí.")
+        self.assertEqual(
+            [markup.text[span.start : span.end] for span in markup.spans],
+            ["crisis", "humanitaria", "frase larga"],
+        )
+        self.assertEqual(
+            [span.surface for span in markup.spans],
+            ["crisis", "humanitaria", "frase larga"],
+        )
+        self.assertEqual(markup.sentences, [[0, 22], [23, 45]])
+        self.assertEqual(markup.sentence_indexes, [0, 0, 1])
+
+        print("✅ Markup stripped in a single pass")
+
+    def test_malformed_brackets_kept(self):
+        """Only well-formed markup is stripped"""
+        content = "Lista [ a ] [] [uno [dos] y [tres\ncuatro] fin]."
+        markup = parse_markup(content)
+
+        self.assertEqual([span.surface for span in markup.spans], ["dos"])
+        self.assertEqual(markup.text, content.replace("[dos]", "dos"))
+        self.assertEqual(parse_markup("Sin marcas.").spans, [])
+
+
+class ArticleSentenceTestCase(TestCase):
+    """Test suite for sentence references of word occurrences"""
+
+    def setUp(self):
+        reset_automaton()
+        self.article = Article.objects.create(
+            title="Frases",
+            content="Primera frase con [agua]. Segunda frase.\nTercera con [agua] otra vez.",
+            language="es",
+            level="beginner",
+            publication_date=date.today(),
+        )
+        self.word = Word.objects.create(word="agua", primary_language="es")
+
+    def test_article_stores_offsets(self):
+        """Saving an article segments its content once"""
+        self.assertEqual(len(self.article.sentence_offsets), 3)
+        self.assertEqual(self.article.sentence(1), "Segunda frase.")
+        self.assertEqual(self.article.sentence(7), "")
+
+        self.article.content = "Una sola frase."
+        self.article.save(update_fields=["content"])
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.sentence_offsets, [[0, 15]])
+
+    def test_article_word_context_is_sliced(self):
+        """The context sentence is derived from the occurrence position"""
+        occurrences = [
+            ArticleWord.objects.create(
+                article=self.article, word=self.word, position_in_text=span.start
+            )
+            for span in self.article.markup.spans
+        ]
+
+        self.assertEqual([aw.sentence_index for aw in occurrences], [0, 2])
+        reloaded = ArticleWord.objects.select_related("article").get(
+            pk=occurrences[1].pk
+        )
+        self.assertEqual(reloaded.context_sentence, "Tercera con agua otra vez.")
+
+        print("✅ Word occurrences reference their sentence")
+
+    def test_content_edit_moves_occurrences(self):
+        """Saving new content outside the admin resyncs the occurrences"""
+        for span in self.article.markup.spans:
+            ArticleWord.objects.create(
+                article=self.article, word=self.word, position_in_text=span.start
+            )
+
+        self.article.content = "Nueva frase inicial. " + self.article.content
+        self.article.save()
+        occurrences = list(
+            ArticleWord.objects.filter(article=self.article)
+            .select_related("article")
+            .order_by("position_in_text")
+        )
+        self.assertEqual(
+            [(aw.position_in_text, aw.sentence_index) for aw in occurrences],
+            [(39, 1), (72, 3)],
+        )
+        self.assertEqual(occurrences[0].context_sentence, "Primera frase con agua.")
+
+        # Saving other fields keeps the occurrences
+        self.article.title = "Otras frases"
+        self.article.save()
+        self.assertEqual(
+            list(
+                ArticleWord.objects.filter(article=self.article)
+                .order_by("position_in_text")
+                .values_list("pk", flat=True)
+            ),
+            [aw.pk for aw in occurrences],
+        )
+
+
+class ArticleAdminVocabularyTestCase(TestCase):
+    """Test suite for the vocabulary sync of the article admin"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", password="pass")
+        self.client = Client()
+        self.client.login(username="admin", password="pass")
+        self.agua = Word.objects.create(word="agua", primary_language="es")
+
+    def post_article(self, url, content):
+        return self.client.post(
+            url,
+            {
+                "title": "Frases",
+                "content": content,
+                "language": "es",
+                "level": "beginner",
+                "publication_date": "2024-05-01",
+                "is_active": "on",
+            },
+        )
+
+    def occurrences(self, article):
+        return [
+            (aw.word.word, aw.position_in_text, aw.sentence_index)
+            for aw in ArticleWord.objects.filter(article=article)
+            .select_related("word")
+            .order_by("position_in_text")
+        ]
+
+    def test_vocabulary_follows_content(self):
+        """Creating and editing an article rebuilds its occurrences"""
+        response = self.post_article(
+            reverse("admin:authentication_article_add"), "El [agua]. Come [pan]."
+        )
+        self.assertEqual(response.status_code, 302)
+        article = Article.objects.get(title="Frases")
+        self.assertEqual(self.occurrences(article), [("agua", 3, 0), ("pan", 14, 1)])
+        self.assertEqual(Word.objects.get(word="pan").created_by, self.admin)
+
+        self.post_article(
+            reverse("admin:authentication_article_change", args=[article.id]),
+            "Solo [pan] y [agua].",
+        )
+        self.assertEqual(self.occurrences(article), [("pan", 5, 0), ("agua", 11, 0)])
+        self.assertEqual(Word.objects.filter(word="agua").count(), 1)
+
+        print("✅ Admin edits resync the article vocabulary")
+
+
+class SearchKeyTestCase(TestCase):
+    """Test suite for the folded search key columns"""
+
+    def test_fold(self):
+        """Accents, case, ligatures and Catalan middle dots are folded"""
+        self.assertEqual(fold("Aéreos"), "aereos")
+        self.assertEqual(fold("CONTROVÉRSIA"), "controversia")
+        self.assertEqual(fold("col·lecció"), "colleccio")
+        self.assertEqual(fold("coŀlecció"), "colleccio")
+        self.assertEqual(fold("l’àvia  d´Ana"), "l'avia d ana")
+        self.assertEqual(fold("ﬁesta ÇA"), "fiesta ca")
+
+        print("✅ Search keys fold accents and Catalan l·l")
+
+    def test_keys_filled_on_save(self):
+        """Saving a row computes its search key"""
+        word = Word.objects.create(word="Paral·lel", primary_language="ca")
+        translation = WordTranslation.objects.create(
+            word=word, language="pt", translation="Paralelo"
+        )
+        article = Article.objects.create(
+            title="Crisis Humanitária",
+            content="Texto.",
+            language="pt",
+            publication_date=date.today(),
+        )
+        self.assertEqual(word.word_key, "parallel")
+        self.assertEqual(translation.translation_key, "paralelo")
+        self.assertEqual(article.title_key, "crisis humanitaria")
+
+        article.title = "Ação"
+        article.save(update_fields=["title"])
+        article.refresh_from_db()
+        self.assertEqual(article.title_key, "acao")
+
+    def test_backfill_command(self):
+        """Rows written without save() get their keys back"""
+        Word.objects.create(word="avión", primary_language="es")
+        Word.objects.filter(word="avión").update(word="Camión")
+
+        call_command("backfill_search_keys", stdout=io.StringIO())
+        self.assertEqual(Word.objects.get().word_key, "camion")
+
+    def test_prefix_lookup_uses_index(self):
+        """Accent-insensitive prefix lookups are index range scans"""
+        for text in ("aéreo", "Aéreos", "aeropuerto"):
+            Word.objects.create(word=text, primary_language="es")
+
+        words = Word.objects.filter(**prefix_lookup("word_key", fold("AÉRE")))
+        self.assertEqual(
+            sorted(words.values_list("word", flat=True)), ["Aéreos", "aéreo"]
+        )
+        self.assertIn("word_word_key", words.explain())
+
+    def test_admin_search_uses_keys(self):
+        """The admin searches words and titles by the folded start of a word"""
+        User.objects.create_superuser("admin", password="pass")
+        client = Client()
+        client.login(username="admin", password="pass")
+        for text in ("aéreo", "Aéreos", "aeropuerto"):
+            Word.objects.create(word=text, primary_language="es")
+        for title in ("Crisis humanitária", "Una crisis"):
+            Article.objects.create(
+                title=title,
+                content="Texto.",
+                language="es",
+                publication_date=date.today(),
+            )
+
+        response = client.get(
+            reverse("admin:authentication_word_changelist"), {"q": "AÉRE"}
+        )
+        self.assertEqual(
+            sorted(word.word for word in response.context["cl"].queryset),
+            ["Aéreos", "aéreo"],
+        )
+
+        # Without FTS5, article titles are searched the same way
+        with mock.patch(
+            "authentication.admin.matching_article_ids", return_value=None
+        ):
+            response = client.get(
+                reverse("admin:authentication_article_changelist"),
+                {"q": "crisis HUMANITARIA"},
+            )
+            self.assertEqual(
+                [article.title for article in response.context["cl"].queryset],
+                ["Crisis humanitária"],
+            )
+            response = client.get(
+                reverse("admin:authentication_article_changelist"),
+                {"q": "humanitaria"},
+            )
+            self.assertEqual(
+                [article.title for article in response.context["cl"].queryset],
+                ["Crisis humanitária"],
+            )
+            response = client.get(
+                reverse("admin:authentication_article_changelist"), {"q": "CRISIS"}
+            )
+            self.assertCountEqual(
+                [article.title for article in response.context["cl"].queryset],
+                ["Crisis humanitária", "Una crisis"],
+            )
@@ -0,0 +1,235 @@
+"""
+Tests for the Romance tokenizer
+
+Test scenarios:
+1. Elisions, clitics and Catalan "l·l" are split per language with offsets
+2. Word frequencies only count words
+3. Glued clitics are indexed for full-text search and split in queries,
+   articles saved before their verb was known staying searchable
+4. Annotation matches words inside elided and clitic forms of known verbs
+5. The word_frequencies command lists frequent and unknown words
+"""
+
+import io
+from datetime import date
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from authentication.annotation import VocabularyAutomaton
+from authentication.models import Article, Word
+from authentication.search import fts_query, query_terms, search_articles
+from authentication.text import fold
+from authentication.tokenizer import (
+    clitic_hosts,
+    index_terms,
+    tokenize,
+    word_frequencies,
+)
+
+
+def split(text, language, is_host=None):
+    tokens = list(tokenize(text, language, is_host))
+    for token in tokens:
+        assert text[token.start : token.end] == token.text
+    return [(token.text, token.kind) for token in tokens]
+
+
+class TokenizeTestCase(TestCase):
+    """Test suite for tokenize"""
+
+    def test_elisions(self):
+        """French, Italian and Catalan elisions keep their apostrophe"""
+        self.assertEqual(
+            split("L'aide d’aujourd'hui", "fr"),
+            [
+                ("L'", "elision"),
+                ("aide", "word"),
+                ("d’", "elision"),
+                ("aujourd'hui", "word"),
+            ],
+        )
+        self.assertEqual(
+            [text for text, _ in split("Dell'Europa, c'è un po' d'acqua.", "it")],
+            ["Dell'", "Europa", "c'", "è", "un", "po", "d'", "acqua"],
+        )
+        self.assertEqual(
+            split("d'ajuda porta'l col·lecció", "ca"),
+            [
+                ("d'", "elision"),
+                ("ajuda", "word"),
+                ("porta", "word"),
+                ("'l", "clitic"),
+                ("col·lecció", "word"),
+            ],
+        )
+
+        print("✅ Elisions split with their offsets")
+
+    def test_clitics(self):
+        """Spanish attached and Portuguese, Catalan, French hyphenated clitics"""
+        self.assertEqual(
+            split("Dárselo, hablarle y mirándote", "es", {"hablar"}.__contains__),
+            [
+                ("Dár", "word"),
+                ("se", "clitic"),
+                ("lo", "clitic"),
+                ("hablar", "word"),
+                ("le", "clitic"),
+                ("y", "word"),
+                ("mirándo", "word"),
+                ("te", "clitic"),
+            ],
+        )
+        self.assertEqual(
+            [text for text, _ in split("perla, Carla, dímelo, tener", "es")],
+            ["perla", "Carla", "dímelo", "tener"],
+        )
+        # Infinitives are only split when known as verbs
+        self.assertEqual([text for text, _ in split("hablarle", "es")], ["hablarle"])
+        self.assertEqual(
+            [text for text, _ in split("cárteles, ponérselo", "es")],
+            ["cárteles", "ponérselo"],
+        )
+        self.assertEqual(
+            split("ponérselo", "es", lambda host: fold(host) == "poner"),
+            [("ponér", "word"), ("se", "clitic"), ("lo", "clitic")],
+        )
+        self.assertEqual(
+            split("dá-lo, bem-vindo", "pt"),
+            [("dá", "word"), ("lo", "clitic"), ("bem", "word"), ("vindo", "word")],
+        )
+        self.assertEqual(
+            [kind for _, kind in split("a-t-il donar-li", "fr")],
+            ["word", "clitic", "clitic", "word", "word"],
+        )
+        self.assertEqual(
+            [kind for _, kind in split("menjar-se-la", "ca")],
+            ["word", "clitic", "clitic"],
+        )
+        # Without a language, only non-word characters split
+        self.assertEqual(
+            [text for text, _ in split("l'aide dárselo", None)],
+            ["l", "aide", "dárselo"],
+        )
+
+    def test_words_ending_like_clitics(self):
+        """Words ending like an infinitive and a clitic are left whole"""
+        text = "muerte fuerte gobiernos modernos primeros claros duerme"
+        known = {"hablar", "comer"}.__contains__
+        self.assertEqual(
+            [token.text for token in tokenize(text, "es", known)], text.split()
+        )
+        self.assertEqual(
+            clitic_hosts(text + " hablarle", "es"),
+            {"muer", "fuer", "gobier", "moder", "primer", "clar", "duer", "hablar"},
+        )
+        self.assertEqual(
+            word_frequencies([text], "es", known), dict.fromkeys(text.split(), 1)
+        )
+        self.assertEqual(index_terms(text, "es", known), "")
+
+    def test_word_frequencies(self):
+        """Words are counted lowercased; elisions, clitics and numbers are not"""
+        self.assertEqual(
+            word_frequencies(["L'eau et l'Eau", "Dis-moi 3 fois"], "fr"),
+            {"eau": 2, "et": 1, "dis": 1, "fois": 1},
+        )
+
+
+class TokenizerSearchTestCase(TestCase):
+    """Test suite for the tokenizer in search and annotation"""
+
+    def test_glued_clitics_indexed(self):
+        """Search finds the infinitive of "dárselo" and splits queries alike"""
+        self.assertEqual(index_terms("Quiero dárselo ya.", "es"), "dár se lo")
+        self.assertEqual(index_terms("L'aide", "fr"), "")
+        self.assertEqual(
+            fts_query("Quiero dárselo", "es"),
+            '"Quiero" AND ("dár" "se" "lo"* OR "dárselo"*)',
+        )
+
+        article = Article.objects.create(
+            title="Regalo",
+            content="Quiero [dárselo] mañana.",
+            language="es",
+            publication_date=date(2024, 5, 1),
+        )
+        self.assertEqual(article.search_terms, "dár se lo")
+        self.assertEqual([r["id"] for r in search_articles("dar")], [article.id])
+        self.assertEqual(
+            [r["id"] for r in search_articles("dárselo", {"language": "es"})],
+            [article.id],
+        )
+
+        before = Article.objects.create(
+            title="Carta",
+            content="Quiero hablarle de la muerte de los gobiernos.",
+            language="es",
+            publication_date=date(2024, 5, 2),
+        )
+        self.assertEqual(before.search_terms, "")
+        # Known, but not as a verb
+        Word.objects.create(word="hablar", primary_language="es")
+        self.assertEqual(query_terms("hablarle", "es"), ["hablarle"])
+
+        Word.objects.filter(word="hablar").update(is_verb=True)
+        article = Article.objects.create(
+            title="Nota",
+            content="Hay que hablarle.",
+            language="es",
+            publication_date=date(2024, 5, 3),
+        )
+        self.assertEqual(article.search_terms, "hablar le")
+        self.assertEqual(
+            query_terms("hablarle gobiernos", "es"), ["hablar", "le", "gobiernos"]
+        )
+        # Articles indexed before the verb was known still match
+        self.assertCountEqual(
+            [r["id"] for r in search_articles("hablarle", {"language": "es"})],
+            [before.id, article.id],
+        )
+
+        print("✅ Glued clitics are searchable")
+
+    def test_annotation_boundaries(self):
+        """Known words are found inside elided and clitic forms only"""
+        automaton = VocabularyAutomaton()
+        automaton.add(1, "hablar", "es", is_verb=True)
+        automaton.add(2, "aide", "fr")
+        automaton.add(3, "habla", "es")
+
+        automaton.add(4, "primer", "es")
+        automaton.add(5, "nos", "es")
+
+        self.assertEqual(automaton.annotate("Quiero hablarle.", "es"), [(7, 13, 1)])
+        # "primer" is a known word, not a verb
+        self.assertEqual(automaton.annotate("Los primeros gobiernos", "es"), [])
+        automaton.add(1, "hablar", "es")
+        self.assertEqual(automaton.annotate("Quiero hablarle.", "es"), [])
+        self.assertEqual(automaton.annotate("Grâce à l'aide", "fr"), [(10, 14, 2)])
+
+
+class WordFrequenciesCommandTestCase(TestCase):
+    """Test suite for the word_frequencies management command"""
+
+    def test_command_lists_words(self):
+        """Most frequent words first, known words skipped with --unknown"""
+        for content in ("L'[eau] et l'eau.", "Dis-moi où est l'eau."):
+            Article.objects.create(
+                title="Eau",
+                content=content,
+                language="fr",
+                publication_date=date(2024, 5, 1),
+            )
+        Word.objects.create(word="Eau", primary_language="fr")
+
+        out = io.StringIO()
+        call_command("word_frequencies", "fr", limit=1, stdout=out)
+        self.assertIn("5 mot(s) distinct(s) en fr", out.getvalue())
+        self.assertIn("3  eau", out.getvalue())
+
+        out = io.StringIO()
+        call_command("word_frequencies", "fr", unknown=True, stdout=out)
+        self.assertNotIn("eau", out.getvalue())
+        self.assertIn("1  où", out.getvalue())
@@ -0,0 +1,206 @@
+"""
+Tests for the vocabulary read API
+
+Test scenarios:
+1. A term of any language resolves to its word with every translation
+2. Headwords and their forms resolve in their own language
+3. Lookups are one indexed query
+4. The translate endpoint validates its parameters
+5. Word pages are served from the LRU cache until the vocabulary changes
+6. The word cache is bounded and evicts the least recently used words
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from authentication.models import Word, WordDefinition, WordTranslation
+from authentication.words import WordCache, get_word, translate
+
+
+def create_word(word, language, translations, **definition):
+    word = Word.objects.create(word=word, primary_language=language)
+    for translation_language, translation in translations.items():
+        WordTranslation.objects.create(
+            word=word,
+            language=translation_language,
+            translation=translation,
+            part_of_speech="noun",
+        )
+    if definition:
+        WordDefinition.objects.create(word=word, **definition)
+    return word
+
+
+class TranslateTestCase(TestCase):
+    """Test suite for translate"""
+
+    def setUp(self):
+        create_word(
+            "crisis",
+            "es",
+            {"fr": "crise", "it": "crisi", "pt": "crise", "ca": "crisi"},
+            grammar_note="Sustantivo invariable",
+        )
+        create_word("casa", "es", {"fr": "maison", "it": "casa"})
+        create_word("maison", "fr", {"es": "casa"})
+
+    def test_any_language_to_word(self):
+        """A translation finds its word with all of its translations"""
+        [card] = translate("Crise", "fr")
+
+        self.assertEqual(card["word"], "crisis")
+        self.assertEqual(card["primary_language"], "es")
+        self.assertIsNone(card["translations"]["es"])
+        self.assertEqual(
+            card["translations"]["it"],
+            {"translation": "crisi", "pronunciation": "", "part_of_speech": "noun"},
+        )
+        self.assertEqual(card["definition"]["grammar_note"], "Sustantivo invariable")
+        # The Portuguese translation is spelled the same
+        self.assertEqual([c["word"] for c in translate("crise")], ["crisis"])
+
+        print("✅ Translations resolve to their word")
+
+    def test_headwords_and_forms(self):
+        """Headwords and their forms match in their language only"""
+        self.assertEqual(
+            [card["word"] for card in translate("casa", "es")], ["casa", "maison"]
+        )
+        self.assertEqual([card["word"] for card in translate("casa", "it")], ["casa"])
+        self.assertEqual(
+            [card["word"] for card in translate("maisons", "fr")], ["maison"]
+        )
+        self.assertEqual([card["word"] for card in translate("CASAS", "es")], ["casa"])
+        self.assertEqual(translate("casas", "fr"), [])
+        self.assertIsNone(translate("maison", "fr")[1]["definition"])
+
+    def test_one_indexed_query(self):
+        """The lookup is one query on the (language, translation_key) index"""
+        with self.assertNumQueries(1):
+            translate("crise", "fr")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "EXPLAIN QUERY PLAN SELECT word_id FROM authentication_wordtranslation"
+                " WHERE language = 'fr' AND translation_key = 'crise'"
+            )
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("translation_lookup_idx", plan)
+
+
+class TranslateApiTestCase(TestCase):
+    """Test suite for the translate endpoint"""
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse("api_translate_word")
+        create_word("crisis", "es", {"fr": "crise"})
+
+    def test_translate_endpoint(self):
+        """Results for a known term, none for an unknown one"""
+        response = self.client.get(self.url, {"q": "crise", "language": "fr"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [card["word"] for card in response.json()["results"]], ["crisis"]
+        )
+
+        response = self.client.get(self.url, {"q": "inconnu"})
+        self.assertEqual(response.json(), {"results": []})
+
+        print("✅ Translate endpoint resolves terms")
+
+    def test_invalid_parameters(self):
+        """Missing or long terms and unknown languages are rejected"""
+        for params in (
+            {},
+            {"q": "  "},
+            {"q": "x" * 201},
+            {"q": "crise", "language": "en"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class WordDetailTestCase(TestCase):
+    """Test suite for the cached word pages"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = Client()
+        self.word = create_word(
+            "lanzamiento",
+            "es",
+            {"fr": "lancement", "it": "lancio", "pt": "lançamento", "ca": "llançament"},
+            grammar_note="Sustantivo masculino",
+            etymology="De lanzar",
+        )
+
+    def test_word_page(self):
+        """All five translations with the definition, for forms too"""
+        response = self.client.get(reverse("api_word_detail", args=["Lanzamientos"]))
+        self.assertEqual(response.status_code, 200)
+        card = response.json()
+        self.assertEqual(card["word"], "lanzamiento")
+        self.assertEqual(list(card["translations"]), ["es", "it", "pt", "ca", "fr"])
+        self.assertEqual(card["translations"]["fr"]["translation"], "lancement")
+        self.assertEqual(card["definition"]["etymology"], "De lanzar")
+
+        response = self.client.get(reverse("api_word_detail", args=["inconnu"]))
+        self.assertEqual(response.status_code, 404)
+
+        print("✅ Word pages resolve forms")
+
+    def test_hot_words_skip_the_database(self):
+        """Hits and misses are cached until a vocabulary write"""
+        get_word("lanzamiento")
+        get_word("inconnu")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_word("LANZAMIENTO")["word"], "lanzamiento")
+            self.assertIsNone(get_word("inconnu"))
+
+        translation = self.word.translations.get(language="fr")
+        translation.translation = "lancer"
+        translation.save()
+        self.assertEqual(
+            get_word("lanzamiento")["translations"]["fr"]["translation"], "lancer"
+        )
+
+        self.word.definition.etymology = "Del latín"
+        self.word.definition.save()
+        self.assertEqual(
+            get_word("lanzamiento")["definition"]["etymology"], "Del latín"
+        )
+
+        Word.objects.create(word="inconnu", primary_language="fr")
+        self.assertEqual(get_word("inconnu")["primary_language"], "fr")
+
+        self.word.delete()
+        self.assertIsNone(get_word("lanzamiento"))
+
+        print("✅ Word cache follows vocabulary writes")
+
+
+class WordCacheTestCase(TestCase):
+    """Test suite for WordCache"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_least_recently_used_evicted(self):
+        """The cache keeps its most recently used entries"""
+        word_cache = WordCache(maxsize=2)
+        builds = []
+
+        def build(key):
+            builds.append(key)
+            return key.upper()
+
+        for key in ["a", "b", "a", "c", "a", "b"]:
+            self.assertEqual(word_cache.get(key, build), key.upper())
+
+        self.assertEqual(builds, ["a", "b", "c", "b"])
+        self.assertEqual(len(word_cache), 2)
@@ -0,0 +1,131 @@
+"""
+Text processing helpers for article content.
+
+Article contents mark their vocabulary up as "[word]". ``parse_markup``
+strips it; word positions and sentence offsets are stored in the
+coordinates of the clean text.
+
+``fold`` computes the accent- and case-insensitive search keys stored in the
+``*_key`` shadow columns, so that "aereos" finds "aéreos" with an indexed
+equality or prefix lookup instead of a scan.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+from collections import namedtuple
+
+# A sentence ends at terminal punctuation (with any closing quotes or
+# brackets) followed by whitespace, or at a line break.
+SENTENCE_BOUNDARY_RE = re.compile(r"""[.!?…]+[»"'”’)\]]*(?=\s)|\n""")
+
+# Catalan geminated l: "l·l" is written with a middle dot (or look-alikes)
+# that learners usually leave out. NFKD turns the "ŀ" ligature into "l·".
+GEMINATED_L_RE = re.compile("l[\u00b7\u0387\u2027\u2219\u22c5\u30fb]l")
+
+APOSTROPHES_RE = re.compile("[\u2018\u2019\u02bc`]")
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Vocabulary is marked up in article contents as "[word]": at most 100
+# characters on one line, without surrounding spaces
+MARKUP_RE = re.compile(r"\[([^\[\]\s](?:[^\[\]\n]{0,98}[^\[\]\s])?)\]")
+
+MarkupSpan = namedtuple("MarkupSpan", "start end surface")
+
+Markup = namedtuple("Markup", "text spans sentences sentence_indexes")
+
+
+def fold(text):
+    """
+    Search key of ``text``: NFKD-decomposed with diacritics removed,
+    casefolded, Catalan "l·l" written "ll", apostrophes unified and
+    whitespace collapsed.
+
+    >>> fold("  Col·lecció  AÉREA ")
+    'colleccio aerea'
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    folded = GEMINATED_L_RE.sub("ll", stripped.casefold())
+    folded = APOSTROPHES_RE.sub("'", folded)
+    return WHITESPACE_RE.sub(" ", folded).strip()
+
+
+def prefix_lookup(field, prefix):
+    """
+    Range lookups selecting the values of ``field`` starting with
+    ``prefix``. Unlike ``startswith`` (``LIKE``), a range can always be
+    answered from a B-tree index.
+    """
+    return {f"{field}__gte": prefix, f"{field}__lt": prefix + "\U0010ffff"}
+
+
+def parse_markup(content):
+    """
+    Strip the "[word]" vocabulary markup of ``content`` in a single scan.
+
+    Returns:
+        Markup: The clean ``text``, the ``spans`` of the marked words as
+        ``(start, end, surface)`` in clean text coordinates, the
+        ``sentences`` of the clean text (see ``sentence_spans``) and the
+        sentence index of each span in ``sentence_indexes``
+    """
+    pieces = []
+    spans = []
+    copied = 0
+    for match in MARKUP_RE.finditer(content):
+        pieces.append(content[copied : match.start()])
+        # Two brackets were dropped for each previous span
+        start = match.start() - 2 * len(spans)
+        surface = match.group(1)
+        spans.append(MarkupSpan(start, start + len(surface), surface))
+        pieces.append(surface)
+        copied = match.end()
+    pieces.append(content[copied:])
+
+    text = "".join(pieces)
+    sentences = sentence_spans(text)
+    return Markup(
+        text,
+        spans,
+        sentences,
+        [sentence_index_at(sentences, span.start) for span in spans],
+    )
+
+
+def sentence_spans(text):
+    """
+    Split ``text`` into sentences.
+
+    Returns:
+        list: ``[start, end]`` offset pairs of each sentence, surrounding
+        whitespace excluded, in text order
+    """
+    spans = []
+    start = 0
+    for match in SENTENCE_BOUNDARY_RE.finditer(text):
+        _append_span(spans, text, start, match.end())
+        start = match.end()
+    _append_span(spans, text, start, len(text))
+    return spans
+
+
+def _append_span(spans, text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append([start, end])
+
+
+def sentence_index_at(spans, position):
+    """
+    Index of the sentence containing ``position``, or None if ``spans`` is
+    empty. A position between two sentences belongs to the previous one.
+    """
+    index = bisect_right(spans, [position, float("inf")]) - 1
+    if index < 0:
+        return 0 if spans else None
+    return index
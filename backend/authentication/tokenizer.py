@@ -0,0 +1,223 @@
+"""
+Word tokenizer for the five article languages.
+
+Words glued together by Romance orthography are split into their parts:
+
+- French, Italian and Catalan elided articles and pronouns keep their
+  apostrophe ("l'" "aide", "dell'" "Europa", "d'" "ajuda"), except in the
+  few French words written with one ("aujourd'hui").
+- Catalan enclitics after an apostrophe ("porta" "'l") or a hyphen
+  ("donar" "li"), French inverted pronouns ("dis" "moi", "a" "t" "il") and
+  Portuguese hyphenated clitics ("dá" "lo") are tagged as clitics.
+- Spanish clitics attached to an infinitive or a gerund are split off
+  ("dár" "se" "lo", "mirándo" "te"). An infinitive ending looks like one
+  in too many other words ("muer" "te", "gobier" "nos", "cár" "te" "les"),
+  so apart from a few short verbs "hablarle" is only split when the caller
+  knows the verb "hablar" (see ``models.clitic_host_checker``).
+  Imperatives ("dímelo") are left whole: without a dictionary they cannot
+  be told apart from other words.
+
+Each language has one compiled pattern, so a text is tokenized in a single
+pass. Tokens keep their offsets in the text.
+"""
+
+import re
+from collections import Counter, namedtuple
+
+Token = namedtuple("Token", "start end text kind")
+
+WORD = "word"
+ELISION = "elision"
+CLITIC = "clitic"
+
+# Infinitive that may carry clitics, checked with ``is_host``
+_HOST = "host"
+
+_LETTER = r"[^\W\d_]"
+# Catalan "l·l" stays inside its word
+_WORD = r"[^\W_](?:[^\W_]|·(?=[^\W_]))*"
+_END = r"(?![\w·])"
+_APOSTROPHE = "['’]"
+
+_WORD_RE = re.compile(_WORD)
+
+_ELISION = (ELISION, "", rf"{_LETTER}{{1,7}}{_APOSTROPHE}", rf"(?={_LETTER})")
+
+_GENERIC_WORD = (WORD, "", _WORD, "")
+
+_FRENCH_APOSTROPHE_WORDS = (
+    WORD,
+    "",
+    rf"(?:aujourd{_APOSTROPHE}hui|quelqu{_APOSTROPHE}une?s?"
+    rf"|presqu{_APOSTROPHE}îles?|prud{_APOSTROPHE}hom\w*)",
+    _END,
+)
+
+_FRENCH_HYPHEN_CLITICS = (
+    CLITIC,
+    rf"(?<={_LETTER}-)",
+    r"(?:moi|toi|lui|leur|nous|vous|elles?|ils?|on|je|tu|ce|les?|la|en|y|t)",
+    _END,
+)
+
+_CATALAN_APOSTROPHE_CLITICS = rf"{_APOSTROPHE}(?:ls|ns|l|m|n|s|t)"
+
+_CATALAN_HYPHEN_CLITICS = (
+    CLITIC,
+    rf"(?<={_LETTER}-)",
+    r"(?:me|te|se|nos|vos|los|les|lo|la|li|hi|ho|en|ne)",
+    _END,
+)
+
+_PORTUGUESE_HYPHEN_CLITICS = (
+    CLITIC,
+    rf"(?<={_LETTER}-)",
+    r"(?:lhes|lhos|lhas|lhe|lho|lha|nos|vos|los|las|nas|mos|mas|tos|tas"
+    r"|me|te|se|lo|la|no|na|mo|ma|to|ta|os|as|o|a)",
+    _END,
+)
+
+_SPANISH_CLITIC = "(?:les|los|las|nos|me|te|se|le|lo|la|os)"
+
+# Short verbs and gerunds carrying clitics; an accent marks two clitics
+# ("dárselo") or a gerund with one ("mirándote")
+_SPANISH_CLITIC_HOST = (
+    rf"(?:d[aá]r|v[eé]r|s[eé]r|[ií]r|{_LETTER}+?(?:ándo|iéndo|yéndo))"
+)
+
+# Other infinitives are only hosts when known as verbs: "hablar" in
+# "hablarle", not "muer" in "muerte" or "cár" in "cárteles"; the stem is
+# long enough not to consider "perla" or "Carla"
+_SPANISH_INFINITIVE_HOST = rf"{_LETTER}{{2,}}?(?:ar|er|ir|ár|ér|ír)"
+
+_SPANISH_HOST_END = rf"(?={_SPANISH_CLITIC}{{1,3}}{_END})"
+
+ALTERNATIVES = {
+    "es": [
+        (
+            CLITIC,
+            rf"(?<={_LETTER})",
+            _SPANISH_CLITIC,
+            rf"(?={_SPANISH_CLITIC}{{0,2}}{_END})",
+        ),
+        (WORD, "", _SPANISH_CLITIC_HOST, _SPANISH_HOST_END),
+        (_HOST, "", _SPANISH_INFINITIVE_HOST, _SPANISH_HOST_END),
+        _GENERIC_WORD,
+    ],
+    "pt": [_PORTUGUESE_HYPHEN_CLITICS, _GENERIC_WORD],
+    "fr": [_FRENCH_APOSTROPHE_WORDS, _ELISION, _FRENCH_HYPHEN_CLITICS, _GENERIC_WORD],
+    "it": [_ELISION, _GENERIC_WORD],
+    "ca": [
+        (WORD, "", _WORD, rf"(?={_CATALAN_APOSTROPHE_CLITICS}{_END})"),
+        (CLITIC, rf"(?<={_LETTER})", _CATALAN_APOSTROPHE_CLITICS, _END),
+        _ELISION,
+        _CATALAN_HYPHEN_CLITICS,
+        _GENERIC_WORD,
+    ],
+    None: [_GENERIC_WORD],
+}
+
+
+def _compile(alternatives):
+    return re.compile(
+        "|".join(
+            f"{before}(?P<{kind}{index}>{body}){after}"
+            for index, (kind, before, body, after) in enumerate(alternatives)
+        ),
+        re.IGNORECASE,
+    )
+
+
+PATTERNS = {
+    language: _compile(alternatives) for language, alternatives in ALTERNATIVES.items()
+}
+
+
+def tokenize(text, language=None, is_host=None):
+    """
+    Yield the ``Token`` of each word, elision and clitic of ``text``, in
+    order. Unknown languages (and None) only split on non-word characters.
+
+    ``is_host(host)`` tells whether what looks like a Spanish infinitive
+    followed by clitics ("hablar" in "hablarle", "ponér" in "ponérselo")
+    is a verb; without it such words are left whole.
+    """
+    pattern = PATTERNS.get(language, PATTERNS[None])
+    position = 0
+    while match := pattern.search(text, position):
+        group = match.lastgroup
+        kind = group.rstrip("0123456789")
+        start, end = match.span(group)
+        if kind == _HOST:
+            if is_host is None or not is_host(text[start:end]):
+                end = _WORD_RE.match(text, start).end()
+            kind = WORD
+        yield Token(start, end, text[start:end], kind)
+        position = end
+
+
+def clitic_hosts(text, language):
+    """
+    The infinitives ``tokenize`` asks ``is_host`` about in ``text``:
+    "hablar" in "hablarle", but also "muer" in "muerte"
+    """
+    hosts = set()
+
+    def collect(host):
+        hosts.add(host)
+        return False
+
+    for _ in tokenize(text, language, collect):
+        pass
+    return hosts
+
+
+def word_frequencies(texts, language=None, is_host=None):
+    """
+    Occurrences of each lowercased word of ``texts``. Elisions, clitics and
+    numbers are not counted.
+    """
+    counts = Counter()
+    for text in texts:
+        counts.update(
+            token.text.lower()
+            for token in tokenize(text, language, is_host)
+            if token.kind == WORD and not token.text.isdigit()
+        )
+    return counts
+
+
+def word_parts(text, language=None, is_host=None):
+    """
+    The tokens of ``text`` grouped by the words a tokenizer splitting on
+    non-word characters sees: ``[dár, se, lo]`` for "dárselo", ``[aide]``
+    for the "aide" of "l'aide".
+    """
+    words = []
+    previous = None
+    for token in tokenize(text, language, is_host):
+        if (
+            previous is not None
+            and previous.end == token.start
+            and text[token.start - 1].isalnum()
+            and text[token.start].isalnum()
+        ):
+            words[-1].append(token)
+        else:
+            words.append([token])
+        previous = token
+    return words
+
+
+def index_terms(text, language, is_host=None):
+    """
+    The parts of the words of ``text`` that a tokenizer splitting on
+    non-word characters cannot see ("dár se lo" for "dárselo"), separated
+    by spaces.
+    """
+    return " ".join(
+        token.text
+        for parts in word_parts(text, language, is_host)
+        if len(parts) > 1
+        for token in parts
+    )
@@ -15,6 +15,24 @@ urlpatterns = [
     path('api/profile/', views.api_user_profile, name='api_user_profile'),
     path('api/submit-quiz/', views.api_submit_quiz_result, name='api_submit_quiz'),
     path('api/stats/', views.api_user_stats, name='api_user_stats'),
+
+    # Article read API
+    path('api/articles/', views.api_articles, name='api_articles'),
+    path('api/articles/archive/', views.api_archive_facets, name='api_archive_facets'),
+    path('api/articles/latest/', views.api_latest_article, name='api_latest_article'),
+    path('api/articles/search/', views.api_search_articles, name='api_search_articles'),
+    path('api/articles/<int:article_id>/', views.api_article_detail, name='api_article_detail'),
+    path('api/articles/<int:article_id>/bundle/', views.api_article_bundle, name='api_article_bundle'),
+
+    # Vocabulary read API
+    path('api/words/translate/', views.api_translate_word, name='api_translate_word'),
+    path('api/words/complete/', views.api_complete_words, name='api_complete_words'),
+    path('api/words/suggest/', views.api_suggest_words, name='api_suggest_words'),
+    path('api/words/<str:word>/', views.api_word_detail, name='api_word_detail'),
+
+    # Frontend synchronisation
+    path('api/sync/delta/', views.api_sync_delta, name='api_sync_delta'),
+    path('sync/<path:path>', views.serve_sync_export, name='serve_sync_export'),
 ]
 
 
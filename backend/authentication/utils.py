@@ -2,7 +2,14 @@ from datetime import date, timedelta
 
 from django.contrib.auth.models import User
 
-from .models import UserActivity, UserProfile
+from .models import UserActivity, UserProfile, search_key
+
+# (model name, source field, search key field) of every folded shadow column
+SEARCH_KEYS = [
+    ("Article", "title", "title_key"),
+    ("Word", "word", "word_key"),
+    ("WordTranslation", "translation", "translation_key"),
+]
 
 
 def update_user_streak(user: User, activity_date: date = None) -> dict:
@@ -108,3 +115,35 @@ def get_user_streak_info(user: User) -> dict:
         "last_activity_date": profile.last_activity_date,
         "total_points": profile.total_points,
     }
+
+
+def backfill_search_keys(model, source: str, key: str, batch_size: int = 1000) -> int:
+    """
+    Recompute the ``key`` shadow column of every ``model`` row from ``source``.
+
+    Rows written without ``save()`` (bulk operations, raw SQL) have stale
+    keys. Only rows whose key changed are written back, in batches.
+
+    Args:
+        model: Model class (historical models from migrations work too)
+        source: Name of the field the key is computed from
+        key: Name of the search key field
+        batch_size: Rows read and written per batch
+
+    Returns:
+        int: Number of rows updated
+    """
+    stale = []
+    updated = 0
+    rows = model.objects.only("pk", source, key).order_by("pk")
+    for row in rows.iterator(chunk_size=batch_size):
+        value = search_key(getattr(row, source))
+        if getattr(row, key) != value:
+            setattr(row, key, value)
+            stale.append(row)
+        if len(stale) >= batch_size:
+            model.objects.bulk_update(stale, [key])
+            updated += len(stale)
+            stale = []
+    model.objects.bulk_update(stale, [key])
+    return updated + len(stale)
@@ -1,13 +1,21 @@
+import hashlib
 import json
+import os
 from datetime import date, datetime
+from functools import lru_cache
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.core.exceptions import SuspiciousFileOperation
 from django.db.models import Sum
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from rest_framework import status
@@ -15,8 +23,37 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from .archive import archive_facets
+from .articles import (
+    ArticleQueryError,
+    get_article_bundle,
+    get_article_detail,
+    get_article_page,
+    latest_article,
+    parse_article_filters,
+    parse_page_size,
+)
+from .completion import complete_words
+from .export import (
+    COMPRESSION_SUFFIXES,
+    LANGUAGES,
+    StreamedDict,
+    delta_payload,
+    iter_json,
+    parse_sync_token,
+)
+from .fuzzy import suggest_words
 from .models import Article, UserActivity, UserProfile, UserQuizResult
+from .search import MAX_LIMIT, search_articles
 from .utils import update_user_streak
+from .words import (
+    MAX_TERM_LENGTH,
+    WordQueryError,
+    get_word,
+    parse_limit,
+    parse_term,
+    translate,
+)
 
 
 # Template-based views for authentication
@@ -92,6 +129,8 @@ def home_view(request):
             "user": request.user,
             "profile": profile,
             "is_authenticated": True,
+            "latest_article": latest_article(profile.preferred_language)
+            or latest_article(),
         }
     else:
         # Guest users can still access articles but without profile data
@@ -99,6 +138,7 @@ def home_view(request):
             "user": None,
             "profile": None,
             "is_authenticated": False,
+            "latest_article": latest_article(),
         }
 
     return render(request, "home.html", context)
@@ -358,3 +398,248 @@ def api_user_stats(request):
             ],
         }
     )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_articles(request):
+    """List articles newest first, one cursor-paginated page at a time"""
+    try:
+        filters = parse_article_filters(
+            request.GET, include_inactive=request.user.is_staff
+        )
+        page = get_article_page(
+            filters,
+            cursor=request.GET.get("cursor"),
+            page_size=parse_page_size(request.GET.get("page_size")),
+            sort=request.GET.get("sort", "newest"),
+        )
+    except ArticleQueryError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(page)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_search_articles(request):
+    """Full-text search over active articles, best matches first"""
+    try:
+        filters = parse_article_filters(request.GET)
+        limit = min(parse_page_size(request.GET.get("limit")), MAX_LIMIT)
+    except ArticleQueryError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    filters.pop("is_active")
+    results = search_articles(request.GET.get("q", ""), filters, limit)
+    return Response({"results": results})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_archive_facets(request):
+    """Article counts by language, level and publication month"""
+    try:
+        filters = parse_article_filters(
+            request.GET, include_inactive=request.user.is_staff
+        )
+    except ArticleQueryError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(archive_facets(filters))
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_latest_article(request):
+    """Newest active article, in ``language`` if given"""
+    language = request.GET.get("language")
+    if language and language not in LANGUAGES:
+        return Response(
+            {"error": f"Unknown language: {language}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    summary = latest_article(language)
+    if summary is None:
+        return Response(
+            {"error": "No published article"}, status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(summary)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_article_detail(request, article_id):
+    """One active article with its sentence offsets and keywords"""
+    detail = get_article_detail(article_id)
+    if detail is None:
+        return Response(
+            {"error": "Article not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(detail)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_article_bundle(request, article_id):
+    """Article, vocabulary and quiz (without answers) in one response"""
+    bundle = get_article_bundle(article_id)
+    if bundle is None:
+        return Response(
+            {"error": "Article not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(bundle)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_translate_word(request):
+    """Words that a term of any language translates, with all their translations"""
+    try:
+        term, language = parse_term(request.GET)
+    except WordQueryError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({"results": translate(term, language)})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_complete_words(request):
+    """Words and translations starting with a prefix, most frequent first"""
+    try:
+        prefix, language = parse_term(request.GET)
+        limit = parse_limit(request.GET.get("limit"))
+    except WordQueryError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({"results": complete_words(prefix, language, limit)})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_suggest_words(request):
+    """Words and translations spelled close to a term, closest first"""
+    try:
+        term, language = parse_term(request.GET)
+        limit = parse_limit(request.GET.get("limit"))
+    except WordQueryError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({"results": suggest_words(term, language, limit)})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_word_detail(request, word):
+    """A word, or the word it is a form of, with all its translations"""
+    card = get_word(word) if len(word) <= MAX_TERM_LENGTH else None
+    if card is None:
+        return Response({"error": "Word not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(card)
+
+
+@require_http_methods(["GET"])
+def api_sync_delta(request):
+    """Stream the articles and words changed since the sync token in ``since``"""
+    token = request.GET.get("since")
+    if not token:
+        return JsonResponse({"error": "Sync token required"}, status=400)
+
+    try:
+        since = parse_sync_token(token)
+    except ValueError:
+        return JsonResponse({"error": "Invalid sync token"}, status=400)
+
+    payload = StreamedDict(delta_payload(since, {}))
+    return StreamingHttpResponse(iter_json(payload), content_type="application/json")
+
+
+SYNC_CONTENT_TYPES = {
+    ".json": "application/json; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+}
+
+# Each export rewrites its files: old versions fall out of the digest cache
+SYNC_DIGEST_CACHE_SIZE = 256
+
+
+def _accepted_encodings(header):
+    """Content codings accepted by an Accept-Encoding header (q=0 excluded)"""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+@lru_cache(maxsize=SYNC_DIGEST_CACHE_SIZE)
+def _sync_file_digest(path, mtime_ns, size):
+    """Digest of a sync file, cached per version (modification time and size)"""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(64 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()[:32]
+
+
+@require_http_methods(["GET", "HEAD"])
+def serve_sync_export(request, path):
+    """
+    Serve an exported sync file, precompressed when the client allows it.
+
+    Brotli then gzip variants written by the export are preferred over the
+    plain file. Responses carry a strong ETag (one per encoding) and the
+    Last-Modified date of the export, so revalidating an unchanged file
+    costs a 304 without a body.
+    """
+    content_type = SYNC_CONTENT_TYPES.get(os.path.splitext(path)[1])
+    try:
+        full_path = safe_join(settings.SYNC_EXPORT_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Sync file not found")
+    if content_type is None or not os.path.isfile(full_path):
+        raise Http404("Sync file not found")
+
+    stat = os.stat(full_path)
+    accepted = _accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    encoding, served_path = None, full_path
+    for coding in ("br", "gzip"):
+        variant_path = full_path + COMPRESSION_SUFFIXES[coding]
+        if (coding in accepted or "*" in accepted) and os.path.isfile(variant_path):
+            # A variant older than the file belongs to a previous export
+            if os.stat(variant_path).st_mtime_ns >= stat.st_mtime_ns:
+                encoding, served_path = coding, variant_path
+                break
+
+    digest = _sync_file_digest(full_path, stat.st_mtime_ns, stat.st_size)
+    etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = FileResponse(
+            open(served_path, "rb"),
+            content_type=content_type,
+            filename=os.path.basename(full_path),
+        )
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    # Shards are requested with their hash as ?v=, so that URL never changes
+    response.headers["Cache-Control"] = (
+        "public, max-age=31536000, immutable" if "v" in request.GET else "no-cache"
+    )
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -0,0 +1,117 @@
+"""
+Compact columnar layout for exported vocabularies.
+
+The JSON vocabulary maps each word to an object repeating the same nine
+keys. The columnar layout stores every field as a column of integers:
+text fields point into a shared string table (each distinct string is
+stored once) and enumerated fields point into small value tables::
+
+    {
+        "format": "columnar",
+        "version": 1,
+        "count": 2,
+        "strings": ["agua", "sol", "water", "eau", "", ...],
+        "enums": {"difficulty_level": [...], "primary_language": ["es"]},
+        "columns": {"es": [4, 4], "fr": [3, 7], ..., "difficulty_level": [0, 1]}
+    }
+
+The first ``count`` strings are the words themselves, so the word column is
+implicit. ``vocab-decoder.js`` at the root of the repository is the
+reference decoder for the frontend.
+"""
+
+import json
+
+VOCABULARY_FORMAT = "columnar"
+
+VOCABULARY_VERSION = 1
+
+TEXT_COLUMNS = ("es", "it", "pt", "ca", "fr", "grammar", "usage_example")
+
+ENUM_COLUMNS = ("difficulty_level", "primary_language")
+
+
+class StringTable:
+    """Interns strings, returning the index of their single stored copy"""
+
+    def __init__(self):
+        self.strings = []
+        self.indexes = {}
+
+    def add(self, value):
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def encode_vocabulary(entries):
+    """
+    Build the columnar payload of ``(word, entry)`` pairs.
+
+    ``entries`` are frontend vocabulary entries, as yielded by
+    ``iter_frontend_words``. Only integer columns and distinct strings are
+    kept in memory, never the entry dicts.
+    """
+    words = []
+    texts = StringTable()
+    enums = {column: StringTable() for column in ENUM_COLUMNS}
+    columns = {column: [] for column in TEXT_COLUMNS + ENUM_COLUMNS}
+
+    for word, entry in entries:
+        words.append(word)
+        for column in TEXT_COLUMNS:
+            columns[column].append(texts.add(entry[column]))
+        for column in ENUM_COLUMNS:
+            columns[column].append(enums[column].add(entry[column]))
+
+    # Words come first in the string table: shift the other strings after them
+    for column in TEXT_COLUMNS:
+        columns[column] = [index + len(words) for index in columns[column]]
+
+    return {
+        "format": VOCABULARY_FORMAT,
+        "version": VOCABULARY_VERSION,
+        "count": len(words),
+        "strings": words + texts.strings,
+        "enums": {column: table.strings for column, table in enums.items()},
+        "columns": columns,
+    }
+
+
+def dumps_vocabulary(payload):
+    """Serialize a columnar payload without any optional whitespace"""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def iter_vocabulary(payload):
+    """
+    Yield the ``(word, entry)`` pairs of a columnar payload.
+
+    Raises:
+        ValueError: If the payload is not a supported columnar vocabulary
+    """
+    if (
+        payload.get("format") != VOCABULARY_FORMAT
+        or payload.get("version") != VOCABULARY_VERSION
+    ):
+        raise ValueError(
+            f"Unsupported vocabulary format: {payload.get('format')!r} "
+            f"version {payload.get('version')!r}"
+        )
+
+    strings = payload["strings"]
+    enums = payload["enums"]
+    columns = payload["columns"]
+    for i in range(payload["count"]):
+        entry = {column: strings[columns[column][i]] for column in TEXT_COLUMNS}
+        for column in ENUM_COLUMNS:
+            entry[column] = enums[column][columns[column][i]]
+        yield strings[i], entry
+
+
+def load_vocabulary(path):
+    """Read a columnar vocabulary file into a ``{word: entry}`` dict"""
+    with open(path, encoding="utf-8") as f:
+        return dict(iter_vocabulary(json.load(f)))
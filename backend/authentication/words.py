@@ -0,0 +1,214 @@
+"""
+Read API helpers for the vocabulary.
+
+A term in any of the five languages is resolved to the words it translates:
+"crise" (fr) finds the Spanish headword "crisis" through its French
+translation, and "crisis" (es) finds it through the headword itself or one
+of its forms (see ``inflection``). Translations are looked up on the
+``(language, translation_key)`` index, and each matching word comes back
+with all of its translations and its definition in the same query.
+
+Word pages are served from a bounded LRU cache in each process, holding
+per word a dense vector of its translations in the order of ``LANGUAGES``:
+hot words are read without any query.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+from itertools import groupby
+from operator import itemgetter
+
+from django.db.models import Q
+
+from .cache import WORDS, generation
+from .completion import DEFAULT_LIMIT, MAX_LIMIT
+from .export import LANGUAGES
+from .models import Word, WordForm, WordTranslation, search_key
+
+MAX_TERM_LENGTH = 200
+
+# Entries kept by the word cache of each process
+WORD_CACHE_SIZE = 10_000
+
+
+class WordQueryError(ValueError):
+    """Invalid word lookup parameters, reported to the client as a 400"""
+
+
+def parse_term(params):
+    """
+    The ``q`` term and optional ``language`` of a lookup request.
+
+    Raises:
+        WordQueryError: If the term is missing or too long, or the language
+            is unknown
+    """
+    term = params.get("q", "").strip()
+    if not term:
+        raise WordQueryError("Missing term (q)")
+    if len(term) > MAX_TERM_LENGTH:
+        raise WordQueryError(f"Term longer than {MAX_TERM_LENGTH} characters")
+    language = params.get("language") or None
+    if language is not None and language not in LANGUAGES:
+        raise WordQueryError(f"Unknown language: {language}")
+    return term, language
+
+
+def parse_limit(value):
+    """Number of suggestions asked for, capped to ``MAX_LIMIT``"""
+    if value in (None, ""):
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise WordQueryError("limit must be an integer")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+TRANSLATION_FIELDS = ("translation", "pronunciation", "part_of_speech")
+
+DEFINITION_FIELDS = ("grammar_note", "usage_example", "difficulty_level", "etymology")
+
+WORD_ENTRY_FIELDS = (
+    "id",
+    "word",
+    "primary_language",
+    *(f"definition__{field}" for field in DEFINITION_FIELDS),
+    "translations__language",
+    *(f"translations__{field}" for field in TRANSLATION_FIELDS),
+)
+
+# A word with its translations as a dense vector: one
+# ``(translation, pronunciation, part_of_speech)`` slot per language of
+# ``LANGUAGES``, None when missing
+WordEntry = namedtuple("WordEntry", "id word primary_language translations definition")
+
+_SLOTS = {language: index for index, language in enumerate(LANGUAGES)}
+
+
+def word_entries(words):
+    """
+    Entries of ``words`` (a queryset) in one query: translations and the
+    definition are left-joined, one row per translation.
+    """
+    rows = words.order_by("word", "translations__language").values_list(
+        *WORD_ENTRY_FIELDS
+    )
+    entries = []
+    for _, group in groupby(rows, key=itemgetter(0)):
+        group = list(group)
+        word_id, word, primary_language, *definition = group[0][:7]
+        translations = [None] * len(LANGUAGES)
+        for row in group:
+            if row[7] in _SLOTS:
+                translations[_SLOTS[row[7]]] = row[8:]
+        entries.append(
+            WordEntry(
+                word_id,
+                word,
+                primary_language,
+                tuple(translations),
+                # grammar_note is required: None means no definition
+                tuple(definition) if definition[0] is not None else None,
+            )
+        )
+    return entries
+
+
+def serialize_entry(entry):
+    """Word card of an entry, with a translation (or None) per language"""
+    return {
+        "word": entry.word,
+        "primary_language": entry.primary_language,
+        "translations": {
+            language: (
+                dict(zip(TRANSLATION_FIELDS, translation)) if translation else None
+            )
+            for language, translation in zip(LANGUAGES, entry.translations)
+        },
+        "definition": (
+            dict(zip(DEFINITION_FIELDS, entry.definition)) if entry.definition else None
+        ),
+    }
+
+
+def translate(term, language=None):
+    """
+    Cards of the words that ``term`` is a translation, a spelling or a form
+    of, in ``language`` or in any language, in one query. Accents and case
+    are ignored.
+    """
+    key = search_key(term)
+    translations = WordTranslation.objects.filter(translation_key=key)
+    forms = WordForm.objects.filter(form_key=key)
+    headwords = Q(pk__in=forms.values("word_id"))
+    if language:
+        translations = translations.filter(language=language)
+        headwords &= Q(primary_language=language)
+    words = Word.objects.filter(Q(pk__in=translations.values("word_id")) | headwords)
+    return [serialize_entry(entry) for entry in word_entries(words)]
+
+
+class WordCache:
+    """
+    Bounded LRU cache of word entries, private to the process.
+
+    The cache holds the generation of the ``WORDS`` namespace it was filled
+    under. Vocabulary writes bump that generation (see ``signals``), and the
+    next lookup of every worker finds it moved and empties its cache, so a
+    hit costs a generation read from the shared cache and no query.
+    """
+
+    def __init__(self, maxsize=WORD_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, build):
+        """Cached ``build(key)``; None results are cached too"""
+        current = generation(WORDS)
+        with self._lock:
+            if current != self._generation:
+                self._entries.clear()
+                self._generation = current
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = build(key)
+        with self._lock:
+            # Not if a write moved the generation during the build
+            if current == self._generation:
+                self._entries[key] = value
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_word_cache = WordCache()
+
+
+def find_word(key):
+    """
+    Entry of the word spelled, or else inflected, as the search key ``key``,
+    or None, in one query
+    """
+    forms = WordForm.objects.filter(form_key=key).values("word_id")
+    entries = word_entries(Word.objects.filter(pk__in=forms))
+    if not entries:
+        return None
+    return min(entries, key=lambda entry: (search_key(entry.word) != key, entry.id))
+
+
+def get_word(text):
+    """Card of the word ``text`` is a spelling or a form of, or None"""
+    entry = _word_cache.get(search_key(text), find_word)
+    return serialize_entry(entry) if entry is not None else None
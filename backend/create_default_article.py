@@ -205,31 +205,23 @@ Los defensores de esta estrategia sostienen que, ante la imposibilidad de acceso
             "controversia",
         ]
 
-        for word_text in words_in_brackets:
-            if word_text in vocabulary_words:
-                word = vocabulary_words[word_text]
-
-                # Trouver toutes les positions du mot dans le contenu
-                import re
-
-                pattern = f"\\[{re.escape(word_text)}\\]"
-                matches = list(re.finditer(pattern, article_content))
-
-                for i, match in enumerate(matches):
-                    article_word, created = ArticleWord.objects.get_or_create(
-                        article=article,
-                        word=word,
-                        position_in_text=match.start(),
-                        defaults={
-                            "context_sentence": article_content,
-                            "is_key_vocabulary": True,
-                        },
-                    )
+        markup = article.markup
+        for span, sentence_index in zip(markup.spans, markup.sentence_indexes):
+            if span.surface in words_in_brackets and span.surface in vocabulary_words:
+                article_word, created = ArticleWord.objects.get_or_create(
+                    article=article,
+                    word=vocabulary_words[span.surface],
+                    position_in_text=span.start,
+                    defaults={
+                        "sentence_index": sentence_index,
+                        "is_key_vocabulary": True,
+                    },
+                )
 
-                    if created:
-                        print(
-                            f"   ✅ Association créée: {article.title} -> {word_text} (pos: {match.start()})"
-                        )
+                if created:
+                    print(
+                        f"   ✅ Association créée: {article.title} -> {span.surface} (pos: {span.start})"
+                    )
 
     else:
         print(f"ℹ️  Article par défaut existe déjà: {article.title}")
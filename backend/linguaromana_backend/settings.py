@@ -150,3 +150,17 @@ STATICFILES_DIRS = [
 
 # Custom templates directory
 TEMPLATES[0]['DIRS'] = [BASE_DIR / 'templates']
+
+# Frontend sync exports (shards, manifest, precompressed variants) served under /sync/
+SYNC_EXPORT_ROOT = BASE_DIR.parent / 'sync'
+
+# Cache of the article read API (pages, details, bundles). Locmem is private
+# to each process: with several workers, use a shared backend such as
+# 'django.core.cache.backends.filebased.FileBasedCache' with a LOCATION so
+# that invalidations reach every worker.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
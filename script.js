@@ -1910,7 +1910,14 @@ class ArchiveManager {
 
     loadLatestArticle() {
         const articles = this.getAllArticles();
-        const latest = articles.sort((a, b) => new Date(b.date) - new Date(a.date))[0];
+        // Article chosen by the backend when the page is served by Django,
+        // otherwise the newest one in a single pass (no sort needed)
+        const pointer = document.getElementById('latest-article');
+        const featured = pointer ? JSON.parse(pointer.textContent) : null;
+        // Exported ids are strings, the pointer id is a number
+        const latest = (featured && articles.find(article => String(article.id) === String(featured.id))) ||
+            articles.reduce((newest, article) =>
+                !newest || new Date(article.date) > new Date(newest.date) ? article : newest, null);
         
         if (latest) {
             this.loadArticleIntoMain(latest);
@@ -0,0 +1,52 @@
+// Décodeur de référence du format de vocabulaire compact (colonnes + table de chaînes)
+// Voir backend/authentication/vocabulary_format.py pour la description du format
+
+(function() {
+    'use strict';
+
+    const FORMAT = 'columnar';
+    const VERSION = 1;
+    const TEXT_COLUMNS = ['es', 'it', 'pt', 'ca', 'fr', 'grammar', 'usage_example'];
+    const ENUM_COLUMNS = ['difficulty_level', 'primary_language'];
+
+    function checkPayload(payload) {
+        if (payload.format !== FORMAT || payload.version !== VERSION) {
+            throw new Error(`Format de vocabulaire non supporté: ${payload.format} v${payload.version}`);
+        }
+    }
+
+    // Reconstruire l'entrée d'un mot à partir de son rang dans les colonnes
+    function entryAt(payload, index) {
+        const entry = {};
+        TEXT_COLUMNS.forEach(column => {
+            entry[column] = payload.strings[payload.columns[column][index]];
+        });
+        ENUM_COLUMNS.forEach(column => {
+            entry[column] = payload.enums[column][payload.columns[column][index]];
+        });
+        return entry;
+    }
+
+    // Convertir un vocabulaire compact en objet { mot: entrée } (format de linguaromana_custom_words)
+    function decode(payload) {
+        checkPayload(payload);
+        const words = {};
+        for (let i = 0; i < payload.count; i++) {
+            words[payload.strings[i]] = entryAt(payload, i);
+        }
+        return words;
+    }
+
+    // Chercher un seul mot sans matérialiser tout le vocabulaire
+    function lookup(payload, word) {
+        checkPayload(payload);
+        for (let i = 0; i < payload.count; i++) {
+            if (payload.strings[i] === word) {
+                return entryAt(payload, i);
+            }
+        }
+        return null;
+    }
+
+    window.LinguaRomanaVocab = { FORMAT, decode, lookup };
+})();